@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Step throughput benchmarks for the FIBE fishery model
+
+Each case runs FisheryModel with a given fleet, grid size and duration in
+a fresh worker process and records the setup time, the step throughput,
+the peak resident memory and the time per step phase (see profiler.py).
+Results are appended to a JSON history; a comparison mode checks them
+against a stored baseline and exits with status 1 on a regression.
+
+The suites vary one factor at a time around a base case:
+
+    quick   Small cases for checking a change (a few minutes)
+    full    Fleets of 10 to 10,000 fishers per type, grids of 50x56 to
+            1000x1000 cells, runs of 1 to 50 years
+
+Larger grids scale the region boundaries and hotspot coordinates of the
+default landscape (same layout and number of hotspots).
+
+Usage:
+    python benchmarks/run_benchmarks.py --suite quick
+    python benchmarks/run_benchmarks.py --suite quick --save-baseline
+    python benchmarks/run_benchmarks.py --suite quick --compare
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path to import code module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from code.model import FisheryModel
+from code.params import FibeParams
+from code.profiler import StepProfiler
+
+try:
+    import resource
+except ImportError:  # Windows: no peak memory
+    resource = None
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+HISTORY_FILE = os.path.join(RESULTS_DIR, "history.json")
+BASELINE_FILE = os.path.join(RESULTS_DIR, "baseline.json")
+
+# Metrics checked against the baseline, and whether higher is better
+COMPARED_METRICS = {
+    "steps_per_second": True,
+    "peak_rss_mb": False,
+}
+
+DEFAULT_TOLERANCE = 0.10
+
+
+def case(fleet, width=50, height=56, years=1):
+    """
+    Benchmark case.
+
+    Args:
+        fleet: Fishers per type, or a tuple (archipelago, coastal, trawler)
+        width, height: Grid dimensions
+        years: Simulated years
+
+    Returns:
+        dict: Case description (with its name)
+    """
+    if isinstance(fleet, int):
+        fleet = (fleet, fleet, fleet)
+    num_archipelago, num_coastal, num_trawler = fleet
+    return {
+        "name": f"a{num_archipelago}_c{num_coastal}_t{num_trawler}_{width}x{height}_{years}y",
+        "num_archipelago": num_archipelago,
+        "num_coastal": num_coastal,
+        "num_trawler": num_trawler,
+        "width": width,
+        "height": height,
+        "years": years,
+    }
+
+
+def _one_factor(fleets, grids, durations, base_fleet, base_grid, base_years):
+    """Cases varying the fleet, the grid and the duration around a base case"""
+    cases = [case(fleet, *base_grid, base_years) for fleet in fleets]
+    cases += [case(base_fleet, *grid, base_years) for grid in grids]
+    cases += [case(base_fleet, *base_grid, years) for years in durations]
+    unique = {}
+    for c in cases:
+        unique.setdefault(c["name"], c)
+    return list(unique.values())
+
+
+SUITES = {
+    "quick": _one_factor(
+        fleets=[10, 40],
+        grids=[(200, 224)],
+        durations=[5],
+        base_fleet=10, base_grid=(50, 56), base_years=1,
+    ),
+    "full": _one_factor(
+        fleets=[10, 100, 1000, 10000],
+        grids=[(50, 56), (100, 112), (250, 280), (500, 560), (1000, 1000)],
+        durations=[1, 5, 10, 25, 50],
+        base_fleet=10, base_grid=(50, 56), base_years=1,
+    ),
+}
+
+
+def scaled_params(width, height):
+    """
+    Default parameters on a larger (or smaller) grid.
+
+    Region boundaries and hotspot coordinates of the default landscape are
+    scaled to the new dimensions.
+
+    Args:
+        width, height: Grid dimensions
+
+    Returns:
+        FibeParams
+    """
+    params = FibeParams.from_config()
+    if (width, height) == (params.GRID_WIDTH, params.GRID_HEIGHT):
+        return params
+    sx = width / params.GRID_WIDTH
+    sy = height / params.GRID_HEIGHT
+
+    def bounds(region):
+        (x0, x1), (y0, y1) = region
+        return [[round(x0 * sx), round(x1 * sx)], [round(y0 * sy), round(y1 * sy)]]
+
+    def spots(hotspots):
+        return [[min(round(x * sx), width - 1), min(round(y * sy), height - 1)] for x, y in hotspots]
+
+    return params.replace(
+        GRID_WIDTH=width,
+        GRID_HEIGHT=height,
+        REGION_A=bounds(params.REGION_A),
+        REGION_B=bounds(params.REGION_B),
+        REGION_C=bounds(params.REGION_C),
+        REGION_D=bounds(params.REGION_D),
+        LAND=bounds(params.LAND),
+        HOTSPOTS_A=spots(params.HOTSPOTS_A),
+        HOTSPOTS_B=spots(params.HOTSPOTS_B),
+        HOTSPOTS_C=spots(params.HOTSPOTS_C),
+        HOTSPOTS_D=spots(params.HOTSPOTS_D),
+    )
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process in MB (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / 1024**2
+    return peak / 1024
+
+
+def measure(bench_case, seed=1):
+    """
+    Run a benchmark case in this process.
+
+    Args:
+        bench_case: Case from case()
+        seed: Model seed
+
+    Returns:
+        dict: Case name, timings, throughput, memory and phase times
+    """
+    steps = bench_case["years"] * 365
+    num_agents = bench_case["num_archipelago"] + bench_case["num_coastal"] + bench_case["num_trawler"]
+    params = scaled_params(bench_case["width"], bench_case["height"])
+
+    start = time.perf_counter()
+    model = FisheryModel(
+        end_of_sim=steps,
+        num_archipelago=bench_case["num_archipelago"],
+        num_coastal=bench_case["num_coastal"],
+        num_trawler=bench_case["num_trawler"],
+        verbose=False,
+        seed=seed,
+        params=params,
+    )
+    setup_time = time.perf_counter() - start
+    rss_after_setup = _peak_rss_mb()
+
+    profiler = StepProfiler()
+    model.attach_profiler(profiler)
+    start = time.perf_counter()
+    model.run_model()
+    run_time = time.perf_counter() - start
+    peak_rss = _peak_rss_mb()
+
+    summary = profiler.summary()
+    return {
+        "name": bench_case["name"],
+        "case": bench_case,
+        "status": "ok",
+        "steps": steps,
+        "agents": num_agents,
+        "setup_time_s": setup_time,
+        "run_time_s": run_time,
+        "steps_per_second": steps / run_time,
+        "agent_steps_per_second": steps * num_agents / run_time,
+        "peak_rss_mb": peak_rss,
+        "rss_growth_per_step_kb": (
+            (peak_rss - rss_after_setup) * 1024 / steps if peak_rss is not None else None
+        ),
+        "phases": dict(zip(summary["phase"], summary["wall_time_s"])),
+    }
+
+
+def _worker(bench_case, seed, results):
+    try:
+        results.put(measure(bench_case, seed))
+    except Exception as e:
+        results.put({"name": bench_case["name"], "case": bench_case, "status": f"error: {e}"})
+
+
+def run_case(bench_case, seed=1, repeats=1, timeout=None):
+    """
+    Run a benchmark case in fresh worker processes (one per repeat, so the
+    peak memory is the case's own).
+
+    Args:
+        bench_case: Case from case()
+        seed: Model seed
+        repeats: Number of runs; the fastest one is kept
+        timeout: Seconds per run before the case is abandoned (None = no limit)
+
+    Returns:
+        dict: Result of measure(), or a result with a "timeout" or
+            "error: ..." status
+    """
+    context = multiprocessing.get_context("spawn")
+    best = None
+    for _ in range(repeats):
+        results = context.Queue()
+        process = context.Process(target=_worker, args=(bench_case, seed, results))
+        process.start()
+        try:
+            result = results.get(timeout=timeout)
+        except queue.Empty:
+            result = {"name": bench_case["name"], "case": bench_case, "status": "timeout"}
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+        if result["status"] != "ok":
+            return result
+        if best is None or result["run_time_s"] < best["run_time_s"]:
+            best = result
+    return best
+
+
+def run_suite(cases, seed=1, repeats=1, timeout=None, verbose=True):
+    """
+    Run benchmark cases one after the other.
+
+    Returns:
+        dict: Benchmark record (environment, settings and results)
+    """
+    results = []
+    for i, bench_case in enumerate(cases, start=1):
+        result = run_case(bench_case, seed=seed, repeats=repeats, timeout=timeout)
+        results.append(result)
+        if verbose:
+            if result["status"] == "ok":
+                print(f"[{i}/{len(cases)}] {result['name']:<32} "
+                      f"{result['steps_per_second']:>9.1f} steps/s  "
+                      f"{result['agent_steps_per_second']:>11.0f} agent-steps/s  "
+                      f"peak {_format_mb(result['peak_rss_mb'])}")
+            else:
+                print(f"[{i}/{len(cases)}] {result['name']:<32} {result['status']}")
+
+    return {
+        "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+        "commit": _git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "settings": {"seed": seed, "repeats": repeats, "timeout": timeout},
+        "results": results,
+    }
+
+
+def compare(record, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare benchmark results with a baseline.
+
+    A case regresses when a metric of COMPARED_METRICS is worse than the
+    baseline by more than the tolerance, or when it no longer completes.
+    Cases missing from either record are skipped.
+
+    Args:
+        record: Benchmark record (from run_suite)
+        baseline: Baseline benchmark record
+        tolerance: Allowed relative change (0.10 = 10%)
+
+    Returns:
+        list: (case name, metric, baseline value, new value, relative change)
+            of the regressions
+    """
+    reference = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in record["results"]:
+        base = reference.get(result["name"])
+        if base is None or base["status"] != "ok":
+            continue
+        if result["status"] != "ok":
+            regressions.append((result["name"], "status", "ok", result["status"], None))
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append((result["name"], metric, old, new, change))
+    return regressions
+
+
+def load_history(path=HISTORY_FILE):
+    """Benchmark records of the history file (oldest first)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def append_history(record, path=HISTORY_FILE):
+    """Append a benchmark record to the history file"""
+    history = load_history(path)
+    history.append(record)
+    _save_json(history, path)
+
+
+def _save_json(data, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _format_mb(value):
+    return "n/a" if value is None else f"{value:,.0f} MB"
+
+
+def main():
+    """
+    Command-line interface.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark FIBE step throughput across fleet size, grid size and run length',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--suite',
+        choices=sorted(SUITES),
+        default='quick',
+        help='Benchmark cases to run'
+    )
+
+    parser.add_argument(
+        '--case',
+        action='append',
+        default=None,
+        help='Only run the cases with these names (repeatable)'
+    )
+
+    parser.add_argument(
+        '--repeats',
+        type=int,
+        default=1,
+        help='Runs per case (the fastest is kept)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=1,
+        help='Model seed'
+    )
+
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help='Seconds per run before a case is abandoned'
+    )
+
+    parser.add_argument(
+        '--history',
+        type=str,
+        default=HISTORY_FILE,
+        help='JSON history the results are appended to'
+    )
+
+    parser.add_argument(
+        '--baseline',
+        type=str,
+        default=BASELINE_FILE,
+        help='Baseline results file'
+    )
+
+    parser.add_argument(
+        '--save-baseline',
+        action='store_true',
+        help='Store these results as the new baseline'
+    )
+
+    parser.add_argument(
+        '--compare',
+        action='store_true',
+        help='Compare with the baseline and exit with status 1 on a regression'
+    )
+
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help='Allowed relative change of throughput and peak memory'
+    )
+
+    args = parser.parse_args()
+
+    cases = SUITES[args.suite]
+    if args.case:
+        cases = [c for c in cases if c["name"] in args.case]
+        if not cases:
+            print(f"ERROR: No case named {', '.join(args.case)} in suite '{args.suite}'", file=sys.stderr)
+            sys.exit(1)
+
+    record = run_suite(cases, seed=args.seed, repeats=args.repeats, timeout=args.timeout)
+    record["suite"] = args.suite
+    append_history(record, args.history)
+    print(f"Results appended to {args.history}")
+
+    if args.save_baseline:
+        _save_json(record, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"ERROR: No baseline at {args.baseline} (run with --save-baseline first)", file=sys.stderr)
+            sys.exit(1)
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(record, baseline, tolerance=args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against baseline {baseline.get('commit')}:")
+            for name, metric, old, new, change in regressions:
+                if change is None:
+                    print(f"  {name}: {new}")
+                else:
+                    print(f"  {name}: {metric} {old:,.2f} -> {new:,.2f} ({change:+.1%})")
+            sys.exit(1)
+        print(f"\nNo regression against baseline {baseline.get('commit')} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 from mesa import Agent
-from . import config
-import random
+import numpy as np
 import statistics
 
+from .memory import SpotMemory, TripMemory
+
 
 class FisherAgent(Agent):
     
@@ -13,8 +14,11 @@ class FisherAgent(Agent):
         
         # Basic attributes
         self.wealth = 0
-        self.capital = config.INITIAL_CAPITAL
-        self.age = random.randint(config.MIN_AGE, config.MAX_AGE)
+        self.capital = model.params.INITIAL_CAPITAL
+        self.age = model.rng_streams.agent_init.randint(model.params.MIN_AGE, model.params.MAX_AGE)
+        
+        # Random stream for decisions (shared or per agent, see rng.py)
+        self.decision_rng = model.rng_streams.agent_stream(unique_id)
         self.days_at_sea = 0
         self.total_catch = 0
         self.total_profit = 0
@@ -54,54 +58,98 @@ class FisherAgent(Agent):
         # Type-specific attribute
         self._set_type_attributes()
         
-        # Memory system
-        self.memory_size = config.DEFAULT_MEMORY_SIZE
-        self.memory = []
+        # Memory system (ring buffer with running sums over the perception windows)
+        self.memory_size = model.params.DEFAULT_MEMORY_SIZE
+        self.memory = TripMemory(self.memory_size, windows=self.memory_windows(model.params))
         
-        # Spatial memory
-        self.good_spots_memory = {} # {(x,y): {'visits': n, 'avg_catch': x, 'last_visit': tick}}
-        self.good_spots_threshold = config.GOOD_SPOT_EFFICIENCY_THRESHOLD
+        # Spatial memory: {(x,y): {'visits': n, 'avg_catch': x, 'last_visit': tick}},
+        # ranked by avg_catch per region
+        self.good_spots_memory = SpotMemory(model.get_patch_region)
+        self.good_spots_threshold = model.params.GOOD_SPOT_EFFICIENCY_THRESHOLD
         
         # Decision-making attributes
         self.will_fish = False
         self.region_preference = None
         self.spot_selection_strategy = "knowledge"      
+        self.decision_pending = True # False once decided for the day by a batch
         
         # Threshold
-        self.satisfaction_home_threshold = config.SATISFACTION_HOME_THRESHOLD
-        self.satisfaction_growth_threshold = config.SATISFACTION_GROWTH_THRESHOLD
-        self.scarce_perception_threshold = config.SCARCE_PERCEPTION_THRESHOLD
+        self.satisfaction_home_threshold = model.params.SATISFACTION_HOME_THRESHOLD
+        self.satisfaction_growth_threshold = model.params.SATISFACTION_GROWTH_THRESHOLD
+        self.scarce_perception_threshold = model.params.SCARCE_PERCEPTION_THRESHOLD
         
         # Trawler specific
         self.fish_onboard = 0
-        self.storing_capacity = config.TRAWLER_STORAGE_CAPACITY if fisher_type == "trawler" else 0
+        self.storing_capacity = model.params.TRAWLER_STORAGE_CAPACITY if fisher_type == "trawler" else 0
         self.jumped = False # Changed region while at sea  
         
+        model.fleet_index.add(self)
+        
+    def remove(self):
+        """Remove the fisher from the model"""
+        self.model.fleet_index.discard(self)
+        self.model.scheduler.discard(self)
+        super().remove()
+        
     def _set_type_attributes(self):
         """Set attributes specific to fisher type"""
         if self.fisher_type == "archipelago":
-            self.cost_existence = self.model.LOW_COST_EXISTENCE
-            self.cost_activity = self.model.LOW_COST_ACTIVITY
-            self.catchability = self.model.CATCHABILITY_ARCHEPELAGO
-            self.accessible_regions = ["A"]
+            self.cost_existence = self.model.params.ARCHIPELAGO_COST_EXISTENCE
+            self.cost_activity = self.model.params.ARCHIPELAGO_COST_ACTIVITY
+            self.catchability = self.model.params.ARCHIPELAGO_CATCHABILITY
+            self.accessible_regions = list(self.model.params.ARCHIPELAGO_ACCESSIBLE_REGIONS)
             self.lifestyle_preference = "high"
-            self.max_good_spots = 5
+            self.max_good_spots = self.model.params.ARCHIPELAGO_MAX_GOOD_SPOTS
             
         elif self.fisher_type == "coastal":
-            self.cost_existence = self.model.MEDIUM_COST_EXISTENCE
-            self.cost_activity = self.model.MEDIUM_COST_ACTIVITY
-            self.catchability = self.model.CATCHABILITY_COASTAL
-            self.accessible_regions = ["A", "B"]
+            self.cost_existence = self.model.params.COASTAL_COST_EXISTENCE
+            self.cost_activity = self.model.params.COASTAL_COST_ACTIVITY
+            self.catchability = self.model.params.COASTAL_CATCHABILITY
+            self.accessible_regions = list(self.model.params.COASTAL_ACCESSIBLE_REGIONS)
             self.lifestyle_preference = "medium"
-            self.max_good_spots = 3
+            self.max_good_spots = self.model.params.COASTAL_MAX_GOOD_SPOTS
             
         elif self.fisher_type == "trawler":
-            self.cost_existence = self.model.HIGH_COST_EXISTENCE
-            self.cost_activity = self.model.HIGH_COST_ACTIVITY
-            self.catchability = self.model.CATCHABILITY_TRAWLER
-            self.accessible_regions = ["A", "B", "C", "D"]
+            self.cost_existence = self.model.params.TRAWLER_COST_EXISTENCE
+            self.cost_activity = self.model.params.TRAWLER_COST_ACTIVITY
+            self.catchability = self.model.params.TRAWLER_CATCHABILITY
+            self.accessible_regions = list(self.model.params.TRAWLER_ACCESSIBLE_REGIONS)
             self.lifestyle_preference = "low"
-            self.max_good_spots = 2
+            self.max_good_spots = self.model.params.TRAWLER_MAX_GOOD_SPOTS
+            
+    def apply_parameters(self):
+        """
+        Re-read the parameters copied when the fisher was created (type
+        costs, catchability and regions, memory size and windows, decision
+        thresholds, storage capacity) after they changed during a run, e.g.
+        in a scenario branch.
+        """
+        params = self.model.params
+        self._set_type_attributes()
+        
+        self.memory_size = params.DEFAULT_MEMORY_SIZE
+        trips = list(self.memory)[-self.memory_size:] if self.memory_size > 0 else []
+        self.memory = TripMemory(self.memory_size, windows=self.memory_windows(params))
+        for trip in trips:
+            self.memory.append_record(trip)
+        
+        self.good_spots_threshold = params.GOOD_SPOT_EFFICIENCY_THRESHOLD
+        self.satisfaction_home_threshold = params.SATISFACTION_HOME_THRESHOLD
+        self.satisfaction_growth_threshold = params.SATISFACTION_GROWTH_THRESHOLD
+        self.scarce_perception_threshold = params.SCARCE_PERCEPTION_THRESHOLD
+        if self.fisher_type == "trawler":
+            self.storing_capacity = params.TRAWLER_STORAGE_CAPACITY
+            
+    @staticmethod
+    def memory_windows(params):
+        """Trip windows read every day (kept as running sums by the memory)"""
+        return (
+            params.MEMORY_RECENT_WINDOW,
+            params.MEMORY_OLDER_WINDOW,
+            params.MEMORY_WEEKLY_WINDOW,
+            params.MEMORY_BIWEEKLY_WINDOW,
+            params.SCARCITY_MIN_MEMORY,
+        )
             
     def update_memory(self, trip_info):
         """
@@ -109,20 +157,19 @@ class FisherAgent(Agent):
         
         Args:
             trip_info (dict): Dictionary containing:
-                - 'location': (x,y) tupple
                 - 'catch': amount caught
                 - 'cost': total cost of trip
                 - 'profit': net profit
-                - 'days': days spent fishing
-                - 'tick': model tick when trip occurred                              
+                - 'region': region fished (None when staying home)
+                - 'tick': model tick when trip occurred
+                - 'went_fishing': False for days at home (default True)
         """
+        # Keep only the last N trip
+        if self.memory.capacity != self.memory_size:
+            self.memory.resize(self.memory_size)
         
         # Add new trip to memory
-        self.memory.append(trip_info)
-        
-        # Keep only the last N trip
-        if len(self.memory) > self.memory_size:
-            self.memory.pop(0)
+        self.memory.append_record(trip_info)
     
     def update_memory_good_spots(self, location, catch, expected_catch):
         """
@@ -139,27 +186,10 @@ class FisherAgent(Agent):
         else:
             catch_efficiency = 0
             
-        # Update or create spot memory
-        if location in self.good_spots_memory:
-            spot = self.good_spots_memory[location]
-            total_visits = spot['visits']
-            spot['avg_catch'] = (spot['avg_catch'] * total_visits + catch) / (total_visits + 1)
-            spot['visits'] += 1
-            spot['last_visit'] = self.model.current_step
-            spot['efficiency'] = catch_efficiency
-        else:
-            self.good_spots_memory[location] = {
-                'avg_catch': catch,
-                'visits': 1,
-                'last_visit': self.model.current_step,
-                'efficiency': catch_efficiency
-            }
-        
-        # Mark as "good" if efficiency exceeds threshold
-        if catch_efficiency >= self.good_spots_threshold:
-            self.good_spots_memory[location]['is_good'] = True
-        else:
-            self.good_spots_memory[location]['is_good'] = False
+        # Update or create spot memory (marked "good" if efficiency exceeds threshold)
+        self.good_spots_memory.visit(
+            location, catch, catch_efficiency, self.model.current_step, self.good_spots_threshold
+        )
             
     def get_good_spots(self, region=None, min_visits=1):
         """
@@ -172,23 +202,7 @@ class FisherAgent(Agent):
         Returns:
             list: List of (location, memory_info) tuples sorted by avg_catch
         """
-        good_spots = []
-        
-        for location, memory in self.good_spots_memory.items():
-            if memory['visits'] < min_visits:
-                continue
-            if not memory.get('is_good', False):
-                continue
-            if region:
-                patch = self.model.get_patch_info(location[0], location[1])
-                if patch and patch['region'] != region:
-                    continue
-                
-            good_spots.append((location, memory))
-            
-        good_spots.sort(key=lambda x: x[1]['avg_catch'], reverse=True)
-        
-        return good_spots
+        return self.good_spots_memory.good_spots(region, min_visits)
     
     def get_memory_statistics(self):
         """
@@ -273,16 +287,7 @@ class FisherAgent(Agent):
         Args:
             max_age_ticks (int): Maximum age in ticks before forgetting
         """
-        current_tick = self.model.current_step
-        location_to_remove = []
-        
-        for location, memory in self.good_spots_memory.items():
-            age = current_tick - memory['last_visit']
-            if age > max_age_ticks:
-                location_to_remove.append(location)
-        
-        for location in location_to_remove:
-            del self.good_spots_memory[location]
+        self.good_spots_memory.forget_before(self.model.current_step - max_age_ticks)
     
     def move_to(self, x, y):
         """
@@ -299,6 +304,7 @@ class FisherAgent(Agent):
         # Place at new position
         self.model.grid.place_agent(self, (x, y))
         self.current_location = (x, y)
+        self.model.fleet_index.update(self)
         
     def calculate_travel_cost(self, from_pos, to_pos):
         """
@@ -320,7 +326,7 @@ class FisherAgent(Agent):
         dy = to_pos[1] - from_pos[1]
         distance = (dx**2 + dy**2)**0.5
         
-        return distance * config.TRAVEL_COST_PER_UNIT
+        return distance * self.model.params.TRAVEL_COST_PER_UNIT
     
     def go_fish(self, location):
         """
@@ -405,7 +411,7 @@ class FisherAgent(Agent):
         
         if good_spots:
             # Choose randomly among good spots
-            spot, memory = random.choice(good_spots)
+            spot, memory = self.decision_rng.choice(good_spots)
             return spot
         else:
             # Exploration
@@ -423,18 +429,18 @@ class FisherAgent(Agent):
         """
         # Get hotspots for this region
         if region == "A":
-            hotspots = self.model.HOTSPOTS_A
+            hotspots = self.model.params.HOTSPOTS_A
         elif region == "B":
-            hotspots = self.model.HOTSPOTS_B
+            hotspots = self.model.params.HOTSPOTS_B
         elif region == "C":
-            hotspots = self.model.HOTSPOTS_C
+            hotspots = self.model.params.HOTSPOTS_C
         elif region == "D":
-            hotspots = self.model.HOTSPOTS_D
+            hotspots = self.model.params.HOTSPOTS_D
         else:
             return None
         
         if hotspots:
-            spot = random.choice(hotspots)
+            spot = self.decision_rng.choice(hotspots)
             return tuple(spot)
         
         return None
@@ -482,6 +488,7 @@ class FisherAgent(Agent):
                 # Update state
                 self.at_home = False
                 self.gone_fishing = True
+                self.model.fleet_index.update(self)
                 
                 # Return home
                 self.return_home()
@@ -514,9 +521,12 @@ class FisherAgent(Agent):
             'bankrupt': self.b
         }
     
-    def stay_home(self):
+    def stay_home(self, tick=None):
         """
         Agent stays home, pays only existence costs.
+        
+        Args:
+            tick: Model step of the day at home (None = current step)
         """
         # Pay existence costs
         existence_cost = self.cost_existence
@@ -531,6 +541,7 @@ class FisherAgent(Agent):
         self.gone_fishing = False
         self.at_sea = False
         self.will_fish = False
+        self.model.fleet_index.update(self)
         
         trip_info = {
             'location': None,
@@ -538,7 +549,7 @@ class FisherAgent(Agent):
             'cost': existence_cost,
             'profit': -existence_cost,
             'days': 1,
-            'tick': self.model.current_step,
+            'tick': self.model.current_step if tick is None else tick,
             'region': None,
             'went_fishing': False
         }
@@ -564,6 +575,7 @@ class FisherAgent(Agent):
         if hasattr(self, 'pos') and self.pos:
             self.model.grid.remove_agent(self)
             self.pos = None
+        self.model.fleet_index.update(self)
             
         self.accumulated_catch = 0
         self.trip_cost = 0
@@ -580,7 +592,7 @@ class FisherAgent(Agent):
         Returns:
             dict: Breakdown of profit calculation
         """
-        price_per_unit = self.model.FISH_PRICE
+        price_per_unit = self.model.params.FISH_PRICE
         
         revenue = catch * price_per_unit
         profit = revenue - costs
@@ -631,13 +643,13 @@ class FisherAgent(Agent):
         if self.capital <  bankruptcy_threshold:
             self.bankrupt = True
             self.lay_low = True
-            self.lay_low_counter = config.BANKRUPTCY_LAYLOW_DAYS
+            self.lay_low_counter = self.model.params.BANKRUPTCY_LAYLOW_DAYS
             #print(f"Agent {self.unique_id} ({self.fisher_type}) is bankrupt!")
         elif self.capital < 0:
             if not self.lay_low:
-                if random.random() < config.NEGATIVE_CAPITAL_LAYLOW_PROBABILITY:
+                if self.decision_rng.random() < self.model.params.NEGATIVE_CAPITAL_LAYLOW_PROBABILITY:
                     self.lay_low = True
-                    self.lay_low_counter = config.NEGATIVE_CAPITAL_LAYLOW_DAYS
+                    self.lay_low_counter = self.model.params.NEGATIVE_CAPITAL_LAYLOW_DAYS
     
     def can_afford_trip(self, cost):
         """
@@ -649,7 +661,7 @@ class FisherAgent(Agent):
         Returns:
             bool: True if agent can afford
         """
-        safety_buffer = config.get_safety_buffer(self.cost_existence)
+        safety_buffer = self.model.params.safety_buffer(self.cost_existence)
         
         return self.capital + safety_buffer >= cost
     
@@ -684,17 +696,18 @@ class FisherAgent(Agent):
         Fish only when necessary to meet basic needs
         """
         
+        params = self.model.params
+        
         # Calculate catches from last week
-        recent_memory = list(self.memory)[-config.MEMORY_WEEKLY_WINDOW:] if len(self.memory) >= config.MEMORY_WEEKLY_WINDOW else list(self.memory)
-        catches_last_week = sum(trip['catch'] for trip in recent_memory)
+        catches_last_week = self.memory.catch_sum(params.MEMORY_WEEKLY_WINDOW)
         
         # Convert to revenue
-        revenue_last_week = catches_last_week * self.model.FISH_PRICE
+        revenue_last_week = catches_last_week * params.FISH_PRICE
         # Calculate weekly needs
         weekly_needs = self.cost_existence * 7
         
         # Check if fish is perceived as scarce
-        if len(self.memory) >= config.SCARCITY_MIN_MEMORY:
+        if len(self.memory) >= params.SCARCITY_MIN_MEMORY:
             fish_is_scarce = self.growth_perception < (self.scarce_perception_threshold * 2)
         else:
             fish_is_scarce = False
@@ -717,18 +730,67 @@ class FisherAgent(Agent):
         # Set region (archipelago only access A)
         if self.will_fish:
             self.region_preference = "A"
+    
+    @staticmethod
+    def satisfice_lifestyle_batch(agents):
+        """
+        satisfice_lifestyle for many archipelago fishers at once, evaluated
+        over column arrays. Results are the same as calling it on each one;
+        their step() then skips the decision.
+        
+        Args:
+            agents: Archipelago fishers of one model
+        """
+        if not agents:
+            return
+        model = agents[0].model
+        params = model.params
+        weekly = params.MEMORY_WEEKLY_WINDOW
+        
+        lay_low = np.array([a.lay_low for a in agents], dtype=bool)
+        
+        # Fishers laying low count down
+        for i in np.flatnonzero(lay_low).tolist():
+            agent = agents[i]
+            agent.lay_low_counter -= 1
+            if agent.lay_low_counter <= 0:
+                agent.lay_low = False
+        
+        # Needs: last week's revenue against weekly costs, or a negative capital
+        revenue_last_week = np.array([a.memory.catch_sum(weekly) for a in agents]) * params.FISH_PRICE
+        weekly_needs = np.array([a.cost_existence for a in agents]) * 7
+        capital = np.array([a.capital for a in agents])
+        desperate = capital < 0
+        needs_money = (revenue_last_week < weekly_needs) | desperate
+        
+        # Scarcity perception
+        memory_filled = np.array([len(a.memory) for a in agents]) >= params.SCARCITY_MIN_MEMORY
+        growth_perception = np.array([a.growth_perception for a in agents])
+        scarce_threshold = np.array([a.scarce_perception_threshold for a in agents]) * 2
+        fish_is_scarce = memory_filled & (growth_perception < scarce_threshold)
+        
+        can_fish = (not model.bad_weather) & (~fish_is_scarce | desperate)
+        will_fish = needs_money & can_fish & ~lay_low
+        
+        for agent, fishing in zip(agents, will_fish.tolist()):
+            agent.will_fish = fishing
+            if fishing:
+                agent.region_preference = "A"
+            agent.decision_pending = False
             
     def update_growth_perception(self):
         """
         Update perception of fish growth based on recent catches
         """
-        if len(self.memory) >= config.MEMORY_OLDER_WINDOW:
+        params = self.model.params
+        if len(self.memory) >= params.MEMORY_OLDER_WINDOW:
             # Compare recent catches (last 5) vs older catches (5 before that)
-            recent_catches = [trip['catch'] for trip in list(self.memory)[-config.MEMORY_RECENT_WINDOW:]]
-            avg_recent = sum(recent_catches) / len(recent_catches)
+            memory = self.memory
+            recent, older = params.MEMORY_RECENT_WINDOW, params.MEMORY_OLDER_WINDOW
+            avg_recent = memory.catch_sum(recent) / memory.count(recent)
             
-            older_catches = [trip['catch'] for trip in list(self.memory)[-config.MEMORY_OLDER_WINDOW: -config.MEMORY_RECENT_WINDOW]]
-            avg_older = sum(older_catches) / len(older_catches) if older_catches else avg_recent
+            older_count = memory.count(older, skip=recent)
+            avg_older = memory.catch_sum(older, skip=recent) / older_count if older_count else avg_recent
             
             if avg_older > 0:
                 self.growth_perception = (avg_recent - avg_older) / avg_older
@@ -748,11 +810,10 @@ class FisherAgent(Agent):
         # Calculate expected catches per region
         expected_catches = {}
         for region in self.accessible_regions:
-            region_memory = [trip for trip in self.memory if trip.get('region') == region]
-            if region_memory:
-                # Weight recent trips more heavily
-                recent = region_memory[-30:] if len(region_memory) >= 30 else region_memory
-                expected_catches[region] = statistics.mean(trip['catch'] for trip in recent)
+            # Weight recent trips more heavily
+            expected_catch = self.memory.region_catch_mean(region, self.model.params.MEMORY_MONTHLY_WINDOW)
+            if expected_catch is not None:
+                expected_catches[region] = expected_catch
             else:
                 # Conservative estimate if no memory for this region
                 expected_catches[region] = self.catchability * 0.8
@@ -766,7 +827,7 @@ class FisherAgent(Agent):
         # Calculate expected profits
         expected_profits = {}
         for region in self.accessible_regions:
-            expected_revenue = expected_catches[region] * self.model.FISH_PRICE
+            expected_revenue = expected_catches[region] * self.model.params.FISH_PRICE
             expected_profits[region] = expected_revenue - expected_costs[region]
         
         # Determine best region
@@ -779,10 +840,11 @@ class FisherAgent(Agent):
         
         # Calculate satisfactions
         # Home satisfaction: how much time spent at home recently
-        recent_trips = list(self.memory)[-14:] if len(self.memory) >= 14 else list(self.memory)
-        if recent_trips:
-            went_fishing_count = sum(1 for trip in recent_trips if trip.get('profit', 0) != 0)
-            satisfaction_home = 1.0 - (went_fishing_count / len(recent_trips))
+        biweekly = self.model.params.MEMORY_BIWEEKLY_WINDOW
+        recent_count = self.memory.count(biweekly)
+        if recent_count:
+            went_fishing_count = self.memory.profit_count(biweekly)
+            satisfaction_home = 1.0 - (went_fishing_count / recent_count)
         else:
             satisfaction_home = 0.5
         
@@ -834,7 +896,7 @@ class FisherAgent(Agent):
         
         # Calculate profit if staying
         expected_catch_stay = self._estimate_catch(current_region)
-        revenue_stay = expected_catch_stay * self.model.FISH_PRICE
+        revenue_stay = expected_catch_stay * self.model.params.FISH_PRICE
         profit_stay = revenue_stay - self.cost_activity
         
         # Calculate profit if switching region
@@ -845,7 +907,7 @@ class FisherAgent(Agent):
         for region in other_regions:
             expected_catch = self._estimate_catch(region)
             travel_cost = self.get_travel_cost_between_regions(current_region, region)
-            revenue = expected_catch * self.model.FISH_PRICE
+            revenue = expected_catch * self.model.params.FISH_PRICE
             profit = revenue - self.cost_activity - travel_cost
             if profit > best_switch_profit:
                 best_switch_profit = profit
@@ -853,7 +915,7 @@ class FisherAgent(Agent):
         
         # Calculate profit if returning home
         days_at_sea = self.days_at_sea_current_trip
-        avg_daily_profit = (self.fish_onboard * self.model.FISH_PRICE) / days_at_sea if days_at_sea > 0 else 0
+        avg_daily_profit = (self.fish_onboard * self.model.params.FISH_PRICE) / days_at_sea if days_at_sea > 0 else 0
         profit_return = avg_daily_profit - self.cost_existence
         
         # Make decision
@@ -878,7 +940,7 @@ class FisherAgent(Agent):
             expected_catch = self._estimate_catch(region)
             travel_cost = self.get_travel_cost(region)
             total_cost = self.cost_existence + self.cost_activity + travel_cost
-            expected_revenue = expected_catch * self.model.FISH_PRICE
+            expected_revenue = expected_catch * self.model.params.FISH_PRICE
             expected_profits[region] = expected_revenue - total_cost
         
         # Find best region
@@ -887,7 +949,7 @@ class FisherAgent(Agent):
             max_profit = expected_profits[best_region]
             
             # Decide to go if profit exceeds threshold
-            profit_threshold = self.cost_existence * config.TRAWLER_PROFIT_THRESHOLD_DAYS  # Must be worth at least 3 days of existence
+            profit_threshold = self.cost_existence * self.model.params.TRAWLER_PROFIT_THRESHOLD_DAYS  # Must be worth at least 3 days of existence
             
             if max_profit > profit_threshold or self.capital < 0:
                 self.will_fish = True
@@ -902,18 +964,17 @@ class FisherAgent(Agent):
             
     def _estimate_catch(self, region):
         """Estimate expected catch in a region based on memory"""
-        region_memory = [trip for trip in self.memory if trip.get('region') == region]
-        if region_memory:
-            # Weight recent trips more
-            recent = region_memory[-10:]
-            return statistics.mean(trip['catch'] for trip in recent)
+        # Weight recent trips more
+        expected_catch = self.memory.region_catch_mean(region, 10)
+        if expected_catch is not None:
+            return expected_catch
         else:
             return self.catchability * 0.6
         
     def land_fish(self):
         """Land fish when returning home (trawler only)"""
         if self.fisher_type == "trawler" and self.fish_onboard > 0:
-            revenue = self.fish_onboard * self.model.FISH_PRICE
+            revenue = self.fish_onboard * self.model.params.FISH_PRICE
             self.capital += revenue
             self.wealth += revenue
             self.total_revenue += revenue
@@ -953,25 +1014,18 @@ class FisherAgent(Agent):
         good_spots = self.get_good_spots(region)
         
         if good_spots:
-            spot, memory = random.choice(list(good_spots))
+            spot, memory = self.decision_rng.choice(list(good_spots))
             return spot
         else:
             return self.explore_random_spot(region)
         
     def get_fishSpot_expertise(self, region):
         """Follow the most successful fisher (expertise-based)"""
-        # Find agents currently fishing in this region
-        fishing_agents = [a for a in self.model.agents 
-                        if a != self 
-                        and hasattr(a, 'gone_fishing') 
-                        and a.gone_fishing 
-                        and hasattr(a, 'current_region')
-                        and a.current_region == region]
-        
-        if fishing_agents:
-            # Find agent with highest total catch
-            expert = max(fishing_agents, key=lambda a: a.total_catch)
-            if hasattr(expert, 'pos') and expert.pos:
+        # Agent with highest total catch among those fishing in this region
+        expert = self.model.fleet_index.best_fisher(region, exclude=self)
+        
+        if expert is not None:
+            if expert.pos:
                 return expert.pos
         
         # Fallback to knowledge
@@ -990,24 +1044,7 @@ class FisherAgent(Agent):
         
     def fishspot_with_most_fishers(self, region):
         """Find the spot with the most fishers in a region"""
-        # Count agents per position
-        agent_counts = {}
-        for agent in self.model.agents:
-            if (agent != self 
-                and hasattr(agent, 'gone_fishing') 
-                and agent.gone_fishing
-                and hasattr(agent, 'current_region')
-                and agent.current_region == region 
-                and hasattr(agent, 'pos')
-                and agent.pos):
-                
-                pos = agent.pos
-                agent_counts[pos] = agent_counts.get(pos, 0) + 1
-        
-        if agent_counts:
-            return max(agent_counts, key=agent_counts.get)
-        else:
-            return None
+        return self.model.fleet_index.most_occupied_cell(region, exclude=self)
         
     def get_fishSpot_uphill_climbing(self, region):
         """
@@ -1035,14 +1072,14 @@ class FisherAgent(Agent):
     def get_travel_cost(self, region):
         """Calculate travel cost to a region"""
         if region == "A":
-            return self.model.LOW_COST_TRAVEL
+            return self.model.params.LOW_COST_TRAVEL
         elif region == "B":
             if self.fisher_type == "trawler":
-                return self.model.MEDIUM_COST_TRAVEL_BIGVESSEL
+                return self.model.params.MEDIUM_COST_TRAVEL_BIGVESSEL
             else:
-                return self.model.MEDIUM_COST_TRAVEL
+                return self.model.params.MEDIUM_COST_TRAVEL
         elif region in ["C", "D"]:
-            return self.model.HIGH_COST_TRAVEL
+            return self.model.params.HIGH_COST_TRAVEL
         else:
             return 0
         
@@ -1083,17 +1120,7 @@ class FisherAgent(Agent):
         if not pos:
             return []
         
-        neighbors = []
-        for agent in self.model.agents:
-            if agent == self:
-                continue
-            
-            if hasattr(agent, 'pos') and agent.pos:
-                distance = self.calculate_distance(pos, agent.pos)
-                if distance <= radius:
-                    neighbors.append(agent)
-                    
-        return neighbors
+        return self.model.fleet_index.neighbors_in_radius(pos, radius, exclude=self)
     
     def print_status(self):
         """
@@ -1107,7 +1134,7 @@ class FisherAgent(Agent):
         print(f"    Region: {self.current_region}")
         
         if len(self.memory) > 0:
-            recent = list(self.memory)[-1]
+            recent = self.memory[-1]
             print(f"    Last trip: catch={recent['catch']:.0f}, profit={recent['profit']:.2f}")
             
     
@@ -1117,22 +1144,23 @@ class FisherAgent(Agent):
         """ 
         Update agent's satisfaction levels based on recentexperience
         """
-        if len(self.memory) < 7:
+        params = self.model.params
+        memory = self.memory
+        weekly, biweekly = params.MEMORY_WEEKLY_WINDOW, params.MEMORY_BIWEEKLY_WINDOW
+        if len(memory) < weekly:
             self.satisfaction_home = 0.5
             self.satisfaction_growth = 0.5
             return
         
-        recent_trips = list(self.memory)[-14:]
+        recent_count = memory.count(biweekly)
         
-        days_at_home = sum(1 for trip in recent_trips if not trip.get('went_fishing', True))
-        self.satisfaction_home = days_at_home / len(recent_trips)
+        days_at_home = recent_count - memory.fishing_count(biweekly)
+        self.satisfaction_home = days_at_home / recent_count
         
-        if len(recent_trips) >= 14:
-            first_half = recent_trips[:7]
-            second_half = recent_trips[7:]
-            
-            avg_profit_first = statistics.mean(t['profit'] for t in first_half)
-            avg_profit_second = statistics.mean(t['profit'] for t in second_half)
+        if recent_count >= biweekly:
+            # First and second half of the last two weeks
+            avg_profit_first = memory.profit_mean(biweekly, skip=weekly)
+            avg_profit_second = memory.profit_mean(weekly)
             
             if avg_profit_first != 0:
                 profit_growth = (avg_profit_second - avg_profit_first) / abs(avg_profit_first)
@@ -1140,7 +1168,7 @@ class FisherAgent(Agent):
             else:
                 self.satisfaction_growth = 0.5
         else:
-            avg_profit = statistics.mean(t['profit'] for t in recent_trips)
+            avg_profit = memory.profit_mean(biweekly)
             if avg_profit > 0:
                 self.satisfaction_growth = min(1.0, avg_profit / (self.cost_existence * 2))
             else:
@@ -1151,25 +1179,23 @@ class FisherAgent(Agent):
         Update agent's perception of fish scarcity
         Based on catch trends and memory
         """
-        if len(self.memory) < config.SCARCITY_MIN_MEMORY:
+        params = self.model.params
+        if len(self.memory) < params.SCARCITY_MIN_MEMORY:
             self.perceive_scarcity = False
             return
         
-        recent = list(self.memory)[-config.SCARCITY_MIN_MEMORY:]
-        recent_catches = [t['catch'] for t in recent if t.get('went_fishing', True)]
+        avg_recent_catch = self.memory.fishing_catch_mean(params.SCARCITY_MIN_MEMORY)
         
-        if not recent_catches:
+        if avg_recent_catch is None:
             self.perceive_scarcity = False
             return
         
-        avg_recent_catch = statistics.mean(recent_catches)
-        
         expected_catch = self.catchability
         
         if expected_catch > 0:
             catch_ratio = avg_recent_catch / expected_catch
             
-            self.perceive_scarcity = catch_ratio < config.SCARCITY_CATCH_RATIO_THRESHOLD
+            self.perceive_scarcity = catch_ratio < params.SCARCITY_CATCH_RATIO_THRESHOLD
         else:
             self.perceive_scarcity = False
             
@@ -1249,9 +1275,68 @@ class FisherAgent(Agent):
             
     def step(self):
         """Execute one step of the agent"""
-        self.make_decision()
+        if self.model.params.SPATIAL_MEMORY_FORGETTING:
+            self.forget_old_spots(self.model.params.SPATIAL_MEMORY_MAX_AGE)
+        if self.decision_pending:
+            self.make_decision()
+        self.decision_pending = True
         self.execute_decision()      
         self.update_growth_perception()
         self.update_satisfaction()
         self.update_perception_scarcity()
-        self.check_bankruptcy()
\ No newline at end of file
+        self.check_bankruptcy()
+    
+    def can_lay_low(self):
+        """
+        Whether the next day is spent laying low: at home counting down
+        (archipelago fishers only leave lay-low when lay_low_counter runs
+        out), or doing nothing once bankrupt. Such a day draws no random
+        number and changes nothing but the fisher's own state.
+        """
+        if not self.lay_low or self.at_sea:
+            return False
+        return self.bankrupt or self.fisher_type != "archipelago" or self.lay_low_counter > 1
+    
+    def lay_low_wake_up(self, tick):
+        """
+        First day after tick the fisher leaves lay-low (None = never, unless
+        its capital changes), as long as it does not go bankrupt meanwhile.
+        """
+        if self.bankrupt or self.fisher_type != "archipelago":
+            return None
+        return tick + self.lay_low_counter
+    
+    def catch_up(self, first, last, settled=False):
+        """
+        Apply days spent laying low (see can_lay_low) as step() would have.
+        
+        Only the decision and perceptions of the last day are computed: the
+        earlier ones would have been overwritten.
+        
+        Args:
+            first, last: First and last model step to apply
+            settled: The fisher already spent a whole day bankrupt, so only
+                its spatial memory can still change
+        """
+        params = self.model.params
+        if not settled:
+            for tick in range(first, last):
+                if self.bankrupt:
+                    # Nothing changes any more until the last day
+                    break
+                if self.fisher_type == "archipelago":
+                    self.lay_low_counter -= 1
+                self.stay_home(tick)
+            
+            self.make_decision()
+            if self.bankrupt:
+                self.lay_low = True
+                self.will_fish = False
+            else:
+                self.stay_home(last)
+            self.update_growth_perception()
+            self.update_satisfaction()
+            self.update_perception_scarcity()
+            self.check_bankruptcy()
+        if params.SPATIAL_MEMORY_FORGETTING:
+            self.good_spots_memory.forget_before(last - params.SPATIAL_MEMORY_MAX_AGE)
\ No newline at end of file
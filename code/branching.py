@@ -0,0 +1,199 @@
+"""
+Warm-start scenario branching for the FIBE fishery model.
+
+Scenario batteries usually share the same first years: a burn-in with the
+base parameters, until fishers have filled their memories and stocks have
+left their K/2 start. The burn-in is simulated once and checkpointed (see
+checkpoint.py); every scenario then loads the checkpoint in a worker
+process, applies its overrides and runs to the end of the simulation.
+
+Overrides use the parameter names of the sweep engine (see
+sweep.parameter_target):
+
+    - "FISH_PRICE", "GROWTH_RATE", "BAD_WEATHER_PROBABILITY" or any other
+      model parameter (replaced in the model's FibeParams) or config
+      constant (set for the duration of the branch)
+    - "model.<attribute>" or any FisheryModel attribute
+    - "num_archipelago", "num_coastal", "num_trawler" (fleet mix, see
+      FisheryModel.set_fleet_size) and "end_of_sim"
+
+Fisher fields copied from the parameters when an agent is created (costs,
+catchability, memory size, thresholds) are updated on the loaded fishers
+(see FisherAgent.apply_parameters). Parameters only used to draw the
+initial fishers (INITIAL_CAPITAL, MIN_AGE, MAX_AGE) cannot be overridden.
+Branches continue the burn-in random streams, so scenarios are compared
+under the same weather and decision draws (common random numbers).
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
+
+from .model import FisheryModel
+from .params import PARAMETER_NAMES
+from .sweep import override_config, parameter_target
+
+# Parameters only read when the initial fishers are created
+INITIAL_FLEET_PARAMETERS = ("INITIAL_CAPITAL", "MIN_AGE", "MAX_AGE")
+
+# Constructor arguments giving the fleet mix
+FLEET_ARGUMENTS = {
+    "num_archipelago": "archipelago",
+    "num_coastal": "coastal",
+    "num_trawler": "trawler",
+}
+
+
+def run_burn_in(model_params, burn_in_years, path, model_overrides=None):
+    """
+    Simulate the shared burn-in and checkpoint it.
+
+    Args:
+        model_params: FisheryModel constructor arguments (end_of_sim is the
+            length of the full runs)
+        burn_in_years: Years simulated before branching
+        path: Checkpoint file to write
+        model_overrides: Model attributes set before the burn-in (e.g. from
+            ConfigLoader.get_parameter_overrides)
+
+    Returns:
+        FisheryModel: Model at the end of the burn-in
+    """
+    model = FisheryModel(**model_params)
+    for attribute, value in (model_overrides or {}).items():
+        setattr(model, attribute, value)
+
+    burn_in_days = burn_in_years * model.YEAR
+    if not 0 < burn_in_days < model.end_of_sim:
+        raise ValueError(f"Burn-in ({burn_in_days} days) must be shorter than the run ({model.end_of_sim} days)")
+    model.run_model(steps=burn_in_days)
+    model.save_checkpoint(path)
+    return model
+
+
+def apply_overrides(model, overrides):
+    """
+    Apply scenario overrides to a model loaded from the burn-in.
+
+    Args:
+        model: FisheryModel
+        overrides: Dict mapping parameter names to values
+
+    Returns:
+        Dict of config constants to hold while the branch runs
+
+    Raises:
+        ValueError: If an override is invalid or only affects the initial
+            fishers (INITIAL_FLEET_PARAMETERS)
+    """
+    params = model.params
+    constants = {}
+    for name, value in overrides.items():
+        kind, attribute = parameter_target(name)
+        if kind == "argument":
+            if attribute == "end_of_sim":
+                if value <= model.current_step:
+                    raise ValueError(f"end_of_sim ({value}) must be after the burn-in ({model.current_step})")
+                model.end_of_sim = value
+            else:
+                model.set_fleet_size(FLEET_ARGUMENTS[attribute], value)
+        elif kind == "config":
+            if attribute in PARAMETER_NAMES:
+                model.params = model.params.replace(**{attribute: value})
+            else:
+                constants[attribute] = value
+        else:
+            if not hasattr(model, attribute):
+                raise ValueError(f"FisheryModel has no attribute '{attribute}'")
+            setattr(model, attribute, value)
+    
+    if model.params != params:
+        for name in INITIAL_FLEET_PARAMETERS:
+            if getattr(model.params, name) != getattr(params, name):
+                raise ValueError(f"{name} only applies to the initial fishers and cannot change in a branch")
+        # Fishers keep copies of some parameters
+        for agent in model.agents:
+            agent.apply_parameters()
+    return constants
+
+
+def run_branch(checkpoint_path, overrides=None):
+    """
+    Run one scenario from the burn-in checkpoint to the end of the run.
+
+    Args:
+        checkpoint_path: Burn-in checkpoint
+        overrides: Scenario overrides (see apply_overrides)
+
+    Returns:
+        FisheryModel: Completed model
+    """
+    model = FisheryModel.load_checkpoint(checkpoint_path, verbose=False)
+    constants = apply_overrides(model, overrides or {})
+    with override_config(constants):
+        model.run_model()
+    return model
+
+
+def _run_scenario(checkpoint_path, name, overrides, output_dir):
+    """Run one scenario in a worker process"""
+    model = run_branch(checkpoint_path, overrides)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        model.export_data(filename_prefix=name, directory=output_dir)
+    return {"scenario": name, "overrides": overrides, "yearly_data": model.yearly_data}
+
+
+def run_scenarios(checkpoint_path, scenarios, workers=None, output_dir=None, verbose=True):
+    """
+    Run scenario branches from a burn-in checkpoint over a process pool.
+
+    Args:
+        checkpoint_path: Burn-in checkpoint (see run_burn_in)
+        scenarios: Dict mapping scenario names to override dicts
+        workers: Worker processes (default: one per CPU; 1 runs in-process)
+        output_dir: Export every branch's data to <output_dir>/<name>/
+            (None = keep only the yearly summaries)
+        verbose: Print progress
+
+    Returns:
+        pd.DataFrame: Yearly summaries of every branch, with a scenario
+            column (burn-in years included)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(scenarios)))
+
+    def scenario_dir(name):
+        return None if output_dir is None else os.path.join(output_dir, name)
+
+    results = {}
+    if workers == 1:
+        for name, overrides in scenarios.items():
+            results[name] = _run_scenario(checkpoint_path, name, overrides, scenario_dir(name))
+            if verbose:
+                print(f"  [scenario] {name} finished ({len(results)}/{len(scenarios)})")
+    else:
+        # Spawned workers, as in run_repetitions
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            pending = {
+                pool.submit(_run_scenario, checkpoint_path, name, overrides, scenario_dir(name))
+                for name, overrides in scenarios.items()
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results[result["scenario"]] = result
+                    if verbose:
+                        print(f"  [scenario] {result['scenario']} finished ({len(results)}/{len(scenarios)})")
+
+    frames = []
+    for name in scenarios:
+        df = pd.DataFrame(results[name]["yearly_data"])
+        df.insert(0, "scenario", name)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,356 @@
+"""
+Content-addressed result cache for FIBE simulation runs.
+
+A seeded run is fully determined by its constructor arguments, the model
+attributes set after construction, the config module constants, the seed
+and the code that simulates it. The cache key is a hash of all of these
+plus the requested outputs; a hit returns the stored yearly summaries and
+collector dataframes without simulating.
+
+Layout (inside the cache directory):
+
+    <key>/entry.json        Key contents, yearly summaries, table files
+    <key>/model.npz         Model-level dataframe (if requested)
+    <key>/agent.npz         Agent-level dataframe (if requested)
+
+Dataframes are stored column by column as typed arrays (see
+checkpoint.write_archive), so a hit returns the collector outputs with
+their dtypes and exact values.
+
+Entries are written to a temporary directory and renamed into place, so
+worker processes can share a cache. The total size is kept under a disk
+budget by evicting the least recently used entries (entry.json is touched
+on every hit).
+"""
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+
+import mesa
+import numpy as np
+import pandas as pd
+
+from . import config
+from .checkpoint import decode_values, encode_values, read_archive, write_archive
+from .export import export_tables, _write_json
+
+# Requested outputs of a run: yearly summaries, model and agent dataframes
+OUTPUTS = ("yearly", "model", "agent")
+
+# Config constants that do not change simulation results
+_SETTINGS = (
+    "CHECKPOINT_INTERVAL_YEARS",
+    "CHECKPOINT_DIR",
+    "CHECKPOINT_KEEP",
+    "CACHE_DIR",
+    "CACHE_MAX_BYTES",
+    "STOCK_CHECK_INTERVAL",
+    "STOCK_CHECK_TOLERANCE",
+    "LANDSCAPE_CACHE_DIR",
+    "BATCH_ARCHIPELAGO_DECISIONS",
+)
+
+# FisheryModel arguments that do not change simulation results
+_ARGUMENT_SETTINGS = ("verbose", "seed", "stock_check_interval")
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """
+    Version of the simulation code: a hash of the model package sources
+    and of the Mesa and NumPy versions.
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    package = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package)):
+        if name.endswith(".py"):
+            digest.update(name.encode())
+            with open(os.path.join(package, name), 'rb') as f:
+                digest.update(f.read())
+    digest.update(f"mesa {mesa.__version__} numpy {np.__version__}".encode())
+    return digest.hexdigest()[:16]
+
+
+def config_constants(config_overrides=None):
+    """
+    Config module constants that affect simulation results.
+
+    Args:
+        config_overrides: Constants set for the run (see sweep.override_config)
+
+    Returns:
+        Dict mapping constant names to values
+    """
+    constants = {name: value for name, value in vars(config).items() if name.isupper()}
+    constants.update(config_overrides or {})
+    return {name: value for name, value in constants.items() if name not in _SETTINGS}
+
+
+def run_key(model_params, seed, model_overrides=None, config_overrides=None, outputs=("yearly",)):
+    """
+    Cache key of a run.
+
+    Args:
+        model_params: FisheryModel constructor arguments (verbose, seed
+            and stock_check_interval are ignored)
+        seed: Model seed
+        model_overrides: Model attributes set after construction
+        config_overrides: Config constants set for the run
+        outputs: Requested outputs (subset of OUTPUTS)
+
+    Returns:
+        str: Hex digest, or None if the run has no seed (not reproducible)
+    """
+    if seed is None:
+        return None
+    unknown = set(outputs) - set(OUTPUTS)
+    if unknown:
+        raise ValueError(f"Unknown outputs {sorted(unknown)} (expected a subset of {OUTPUTS})")
+
+    content = {
+        "arguments": {name: value for name, value in model_params.items() if name not in _ARGUMENT_SETTINGS},
+        "model_overrides": dict(model_overrides or {}),
+        "constants": config_constants(config_overrides),
+        "seed": int(seed),
+        "code_version": code_version(),
+        "outputs": sorted(outputs),
+    }
+    encoded = json.dumps(content, sort_keys=True, default=repr)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CachedRun:
+    """
+    Outputs of a run served from the cache.
+
+    Attributes:
+        yearly_data: List of yearly summary dicts (as FisheryModel.yearly_data)
+        model_vars: Model-level dataframe (None if not requested)
+        agent_vars: Agent-level dataframe (None if not requested)
+    """
+
+    def __init__(self, yearly_data, model_vars=None, agent_vars=None, verbose=False):
+        self.yearly_data = yearly_data
+        self.model_vars = model_vars
+        self.agent_vars = agent_vars
+        self.verbose = verbose
+
+    def export_data(self, filename_prefix='fibe_output', directory='./results/'):
+        """
+        Export the cached data to the same CSV files as FisheryModel.export_data.
+
+        Returns:
+            str: Timestamp of the output directory
+        """
+        if self.model_vars is None or self.agent_vars is None:
+            raise ValueError("Cached run has no collector outputs to export")
+        return export_tables(self.model_vars, self.agent_vars, self.yearly_data,
+                             filename_prefix=filename_prefix, directory=directory,
+                             verbose=self.verbose)
+
+
+class ResultCache:
+    """
+    Least-recently-used cache of run results under a disk budget.
+
+    Usage:
+        cache = ResultCache()
+        key = cache.key(model_params, seed, outputs=("yearly",))
+        result = cache.get(key)
+        if result is None:
+            model = ... run ...
+            cache.put_model(key, model, outputs=("yearly",))
+    """
+
+    ENTRY = "entry.json"
+
+    def __init__(self, directory=None, max_bytes=None):
+        """
+        Args:
+            directory: Cache directory (default: config.CACHE_DIR)
+            max_bytes: Disk budget in bytes (default: config.CACHE_MAX_BYTES)
+        """
+        self.directory = directory or config.CACHE_DIR
+        self.max_bytes = config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, model_params, seed, model_overrides=None, config_overrides=None, outputs=("yearly",)):
+        """Cache key of a run (see run_key)"""
+        return run_key(model_params, seed, model_overrides, config_overrides, outputs)
+
+    def get(self, key):
+        """
+        Look up a run.
+
+        Args:
+            key: Cache key (None is always a miss)
+
+        Returns:
+            CachedRun, or None on a miss
+        """
+        if key is None:
+            return None
+        path = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(path, self.ENTRY), 'r') as f:
+                entry = json.load(f)
+            tables = {
+                table: _decode_frame(read_archive(os.path.join(path, filename)))
+                for table, filename in entry["tables"].items()
+            }
+            # Mark as recently used
+            os.utime(os.path.join(path, self.ENTRY))
+        except (OSError, ValueError, KeyError):
+            # Missing, or evicted by another process while reading
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return CachedRun(entry["yearly_data"], tables.get("model"), tables.get("agent"))
+
+    def put(self, key, yearly_data, model_vars=None, agent_vars=None):
+        """
+        Store a run, then evict old entries if the cache is over budget.
+
+        Args:
+            key: Cache key (None stores nothing)
+            yearly_data: List of yearly summary dicts
+            model_vars: Model-level dataframe (optional)
+            agent_vars: Agent-level dataframe (optional)
+        """
+        if key is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, key)
+        tmp_path = os.path.join(self.directory, f".{key}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        tables = {}
+        for table, df in (("model", model_vars), ("agent", agent_vars)):
+            if df is not None:
+                tables[table] = f"{table}.npz"
+                write_archive(os.path.join(tmp_path, tables[table]), _encode_frame(df))
+        _write_json({
+            "tables": tables,
+            "yearly_data": yearly_data,
+        }, os.path.join(tmp_path, self.ENTRY))
+
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another process stored the same run first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        self.evict()
+
+    def put_model(self, key, model, outputs=("yearly",)):
+        """
+        Store the requested outputs of a finished model.
+
+        Args:
+            key: Cache key
+            model: Completed FisheryModel
+            outputs: Requested outputs (subset of OUTPUTS)
+        """
+        collector = model.datacollector
+        self.put(
+            key,
+            model.yearly_data,
+            collector.get_model_vars_dataframe() if "model" in outputs else None,
+            collector.get_agent_vars_dataframe() if "agent" in outputs else None,
+        )
+
+    def entries(self):
+        """
+        Complete entries of the cache.
+
+        Returns:
+            list: (last use time, size in bytes, path), oldest first
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                last_used = os.path.getmtime(os.path.join(path, self.ENTRY))
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+            except OSError:
+                # Temporary directory, or removed meanwhile
+                continue
+            entries.append((last_used, size, path))
+        entries.sort()
+        return entries
+
+    def size(self):
+        """Total size of the cached entries in bytes"""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits its budget.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Remove every entry"""
+        for _, _, path in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _encode_frame(df):
+    """Dataframe as typed arrays: index levels and columns with their dtypes"""
+    index = df.index
+    return {
+        "index": [_encode_column(index.get_level_values(level)) for level in range(index.nlevels)],
+        "index_names": list(index.names),
+        "range_index": isinstance(index, pd.RangeIndex),
+        "columns": list(df.columns),
+        "data": [_encode_column(df[column]) for column in df.columns],
+    }
+
+
+def _encode_column(values):
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        return {"dtype": dtype.str, "array": values.to_numpy()}
+    # Strings, objects and extension types: values with their Python types
+    return {"dtype": str(dtype), "values": encode_values(values.tolist())}
+
+
+def _decode_column(encoded):
+    if "array" in encoded:
+        return encoded["array"]
+    return pd.array(decode_values(encoded["values"]), dtype=encoded["dtype"])
+
+
+def _decode_frame(state):
+    if state["range_index"]:
+        index = pd.RangeIndex(len(state["index"][0]["array"]), name=state["index_names"][0])
+    elif len(state["index"]) == 1:
+        index = pd.Index(_decode_column(state["index"][0]), name=state["index_names"][0])
+    else:
+        index = pd.MultiIndex.from_arrays(
+            [_decode_column(level) for level in state["index"]], names=state["index_names"]
+        )
+    data = {column: _decode_column(encoded) for column, encoded in zip(state["columns"], state["data"])}
+    return pd.DataFrame(data, index=index, columns=state["columns"])
@@ -0,0 +1,451 @@
+"""
+Checkpoint and resume of a FisheryModel.
+
+A checkpoint is a single compressed NumPy archive (.npz): the bulk state
+(patch stocks, agent fields, agent memories, collector buffers, random
+generator states) is stored as typed arrays, and a small JSON document
+(itself stored as a byte array) describes how to put them back. Nothing is
+pickled, so a checkpoint can be loaded with allow_pickle=False and does not
+depend on the Mesa object graph.
+
+Loading rebuilds a fresh model from the stored constructor arguments (the
+landscape and agents are recreated as usual), then overwrites its dynamic
+state, so the resumed run continues exactly where the saved one stopped.
+
+The model parameters (FibeParams) are stored with the checkpoint; other
+config module settings are not, so a run must be resumed with the same
+settings it was started with.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .export import _atomic_write
+from .params import FibeParams
+from .rng import get_random_state, set_random_state
+
+CHECKPOINT_VERSION = 2
+
+# Agent attributes that are not stored as plain fields
+_AGENT_SKIP = {"model", "pos", "decision_rng", "memory", "good_spots_memory"}
+
+# Marker for a missing attribute or dict key
+_MISSING = object()
+
+# Kinds of an encoded value (see encode_values)
+KIND_MISSING, KIND_NONE, KIND_BOOL, KIND_INT, KIND_FLOAT, KIND_STR, KIND_PAIR, KIND_OTHER = range(8)
+
+_INT64 = np.iinfo(np.int64)
+
+
+# ----- Value encoding -----
+
+def encode_values(values):
+    """
+    Encode a sequence of simple values as typed arrays.
+
+    Every value keeps its Python type on decoding: None, bool, int, float,
+    str and (x, y) integer pairs go to typed arrays, anything else (lists,
+    dicts, other tuples) to a tagged JSON list.
+
+    Args:
+        values: Sequence of values (the _MISSING marker is allowed)
+
+    Returns:
+        dict: "kind" (int8), "number" (float64), "integer" (int64, n x 2),
+            "strings" and "others"
+    """
+    n = len(values)
+    kind = np.zeros(n, dtype=np.int8)
+    number = np.zeros(n, dtype=np.float64)
+    integer = np.zeros((n, 2), dtype=np.int64)
+    strings = {}
+    others = []
+
+    for i, value in enumerate(values):
+        value_type = type(value)
+        if value is _MISSING:
+            kind[i] = KIND_MISSING
+        elif value is None:
+            kind[i] = KIND_NONE
+        elif value_type is bool or value_type is np.bool_:
+            kind[i] = KIND_BOOL
+            integer[i, 0] = value
+        elif (value_type is int or isinstance(value, np.integer)) and _INT64.min <= value <= _INT64.max:
+            kind[i] = KIND_INT
+            integer[i, 0] = value
+        elif value_type is float or isinstance(value, np.floating):
+            kind[i] = KIND_FLOAT
+            number[i] = value
+        elif value_type is str:
+            kind[i] = KIND_STR
+            integer[i, 0] = strings.setdefault(value, len(strings))
+        elif value_type is tuple and len(value) == 2 and all(type(c) is int for c in value) \
+                and all(_INT64.min <= c <= _INT64.max for c in value):
+            kind[i] = KIND_PAIR
+            integer[i] = value
+        else:
+            kind[i] = KIND_OTHER
+            integer[i, 0] = len(others)
+            others.append(_to_json(value))
+
+    return {"kind": kind, "number": number, "integer": integer,
+            "strings": list(strings), "others": others}
+
+
+def decode_values(encoded, missing=_MISSING):
+    """
+    Decode the output of encode_values.
+
+    Args:
+        encoded: Encoded values
+        missing: Value returned for missing entries
+
+    Returns:
+        list
+    """
+    kind = encoded["kind"].tolist()
+    number = encoded["number"].tolist()
+    integer = encoded["integer"].tolist()
+    strings = encoded["strings"]
+    others = encoded["others"]
+
+    values = []
+    for i, k in enumerate(kind):
+        if k == KIND_FLOAT:
+            values.append(number[i])
+        elif k == KIND_INT:
+            values.append(integer[i][0])
+        elif k == KIND_BOOL:
+            values.append(bool(integer[i][0]))
+        elif k == KIND_NONE:
+            values.append(None)
+        elif k == KIND_STR:
+            values.append(strings[integer[i][0]])
+        elif k == KIND_PAIR:
+            values.append(tuple(integer[i]))
+        elif k == KIND_OTHER:
+            values.append(_from_json(others[integer[i][0]]))
+        else:
+            values.append(missing)
+    return values
+
+
+def encode_records(groups):
+    """
+    Encode lists of dicts (e.g. every agent's memory) column by column.
+
+    Args:
+        groups: List of lists of dicts with string keys
+
+    Returns:
+        dict: Group lengths, key order and one encoded column per key
+    """
+    records = [record for group in groups for record in group]
+    keys = list(dict.fromkeys(key for record in records for key in record))
+    return {
+        "lengths": np.array([len(group) for group in groups], dtype=np.int64),
+        "keys": keys,
+        "columns": [encode_values([record.get(key, _MISSING) for record in records]) for key in keys],
+    }
+
+
+def decode_records(encoded):
+    """Decode the output of encode_records (list of lists of dicts)"""
+    keys = encoded["keys"]
+    columns = [decode_values(column) for column in encoded["columns"]]
+    records = [
+        {key: value for key, value in zip(keys, row) if value is not _MISSING}
+        for row in zip(*columns)
+    ] if keys else [{} for _ in range(int(encoded["lengths"].sum()))]
+
+    groups = []
+    start = 0
+    for length in encoded["lengths"].tolist():
+        groups.append(records[start:start + length])
+        start += length
+    return groups
+
+
+def _to_json(value):
+    """Tagged JSON form of a value (keeps tuples and non-string dict keys)"""
+    if isinstance(value, tuple):
+        return {"__tuple__": [_to_json(v) for v in value]}
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, dict):
+        return {"__dict__": [[_to_json(k), _to_json(v)] for k, v in value.items()]}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot checkpoint a value of type {type(value).__name__}")
+
+
+def _from_json(value):
+    if isinstance(value, list):
+        return [_from_json(v) for v in value]
+    if isinstance(value, dict):
+        if "__tuple__" in value:
+            return tuple(_from_json(v) for v in value["__tuple__"])
+        return {_from_json(k): _from_json(v) for k, v in value["__dict__"]}
+    return value
+
+
+# ----- Archive -----
+
+def _split_arrays(state, arrays):
+    """Move the NumPy arrays of a nested state into arrays (JSON placeholders)"""
+    if isinstance(state, np.ndarray):
+        name = f"a{len(arrays)}"
+        arrays[name] = state
+        return {"__array__": name}
+    if isinstance(state, dict):
+        return {key: _split_arrays(value, arrays) for key, value in state.items()}
+    if isinstance(state, (list, tuple)):
+        return [_split_arrays(value, arrays) for value in state]
+    return state
+
+
+def _join_arrays(state, archive):
+    if isinstance(state, dict):
+        if "__array__" in state:
+            return archive[state["__array__"]]
+        return {key: _join_arrays(value, archive) for key, value in state.items()}
+    if isinstance(state, list):
+        return [_join_arrays(value, archive) for value in state]
+    return state
+
+
+def write_archive(path, state):
+    """
+    Write a nested state (JSON values and NumPy arrays) to an .npz file.
+
+    The file is written atomically (temporary file, then rename).
+    """
+    arrays = {}
+    document = _split_arrays(state, arrays)
+    arrays["__state__"] = np.frombuffer(json.dumps(document).encode("utf-8"), dtype=np.uint8)
+
+    def write(tmp_path):
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    _atomic_write(path, write)
+
+
+def read_archive(path):
+    """Read a state written by write_archive"""
+    with np.load(path, allow_pickle=False) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    document = json.loads(arrays.pop("__state__").tobytes().decode("utf-8"))
+    return _join_arrays(document, arrays)
+
+
+# ----- Model state -----
+
+def save_model(model, path):
+    """
+    Write a checkpoint of a model.
+
+    Args:
+        model: FisheryModel instance
+        path: Checkpoint file (.npz)
+    """
+    if model.sink is not None:
+        # The parts listed in the checkpoint must be on disk
+        model.sink.drain()
+    # Fishers laying low must be up to date
+    model.scheduler.sync()
+
+    agents = list(model.agents)
+    fields = list(dict.fromkeys(
+        name for agent in agents for name in vars(agent) if name not in _AGENT_SKIP
+    ))
+    good_spots = [list(agent.good_spots_memory.items()) for agent in agents]
+
+    state = {
+        "version": CHECKPOINT_VERSION,
+        "init": {
+            "end_of_sim": model.end_of_sim,
+            "num_archipelago": model.num_archipelago,
+            "num_coastal": model.num_coastal,
+            "num_trawler": model.num_trawler,
+            "verbose": model.verbose,
+            "stock_check_interval": model.stock_check_interval,
+            "model_collection": model.model_collection_interval,
+            "agent_collection": model.agent_collection_interval,
+            "seed": model.seed,
+            "per_agent_streams": model.rng_streams.per_agent,
+        },
+        "params": model.params.to_dict(),
+        "parameters": _model_parameters(model),
+        "clock": {
+            "current_step": model.current_step,
+            "running": model.running,
+            "bad_weather": model.bad_weather,
+            "steps": model.steps,
+            "time": getattr(model, "time", None),
+        },
+        "patches": model.patches.get_state(),
+        "rng": {
+            "streams": model.rng_streams.get_state(),
+            "mesa_random": get_random_state(model.random),
+            "mesa_rng": model.rng.bit_generator.state,
+            "agents": (
+                [get_random_state(agent.decision_rng) for agent in agents]
+                if model.rng_streams.per_agent else None
+            ),
+        },
+        "agents": {
+            "unique_id": [agent.unique_id for agent in agents],
+            "next_agent_id": model.next_agent_id,
+            "fields": {name: encode_values([getattr(agent, name, _MISSING) for agent in agents])
+                       for name in fields},
+            "pos": encode_values([agent.pos for agent in agents]),
+            "memory": encode_records([list(agent.memory) for agent in agents]),
+            "good_spots": {
+                "locations": encode_values([location for spots in good_spots for location, _ in spots]),
+                "info": encode_records([[info for _, info in spots] for spots in good_spots]),
+            },
+        },
+        "yearly_data": encode_records([model.yearly_data]),
+        "last_year_catches": (
+            encode_values(list(model.last_year_catches.items()))
+            if hasattr(model, "last_year_catches") else None
+        ),
+        "collector": model.datacollector.get_state(),
+        "sink": model.sink.get_state() if model.sink is not None else None,
+    }
+    write_archive(path, state)
+
+
+def load_model(model_class, path, verbose=None):
+    """
+    Rebuild a model from a checkpoint.
+
+    Args:
+        model_class: FisheryModel (or a subclass)
+        path: Checkpoint file written by save_model
+        verbose: Override the stored verbose flag
+
+    Returns:
+        FisheryModel: Model ready to continue the run
+    """
+    state = read_archive(path)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {state.get('version')} in {path}")
+
+    init = dict(state["init"])
+    if verbose is not None:
+        init["verbose"] = verbose
+    model = model_class(**init, params=FibeParams.from_dict(state["params"]))
+
+    for name, value in state["parameters"].items():
+        setattr(model, name, value)
+
+    clock = state["clock"]
+    model.current_step = clock["current_step"]
+    model.running = clock["running"]
+    model.bad_weather = clock["bad_weather"]
+    _restore_mesa_clock(model, clock["steps"], clock["time"])
+
+    model.patches.set_state(state["patches"])
+
+    # Agents first: recreating fishers draws from the agent_init stream
+    rng = state["rng"]
+    _restore_agents(model, state["agents"], rng["agents"])
+
+    model.rng_streams.set_state(rng["streams"])
+    set_random_state(model.random, rng["mesa_random"])
+    model.rng.bit_generator.state = rng["mesa_rng"]
+
+    model.yearly_data = decode_records(state["yearly_data"])[0]
+    if state["last_year_catches"] is not None:
+        model.last_year_catches = dict(decode_values(state["last_year_catches"]))
+
+    model.datacollector.set_state(state["collector"])
+
+    if state["sink"] is not None:
+        from .export import StreamingSink
+        model.attach_sink(StreamingSink.from_state(state["sink"]))
+    return model
+
+
+def _model_parameters(model):
+    """Scalar model attributes derived from the parameters (regional capacities, MSY)"""
+    return {
+        name: value for name, value in vars(model).items()
+        if name.isupper() and type(value) in (int, float, bool, str)
+    }
+
+
+def _restore_agents(model, state, rng_states):
+    agents = list(model.agents)
+    if [agent.unique_id for agent in agents] != state["unique_id"]:
+        # The fleet changed during the run (set_fleet_size): recreate the
+        # stored fishers, in the stored order
+        from .agent import FisherAgent
+        for agent in agents:
+            agent.remove()
+        fisher_types = decode_values(state["fields"]["fisher_type"])
+        agents = [
+            FisherAgent(unique_id, model, fisher_type)
+            for unique_id, fisher_type in zip(state["unique_id"], fisher_types)
+        ]
+    model.next_agent_id = state["next_agent_id"]
+
+    for name, encoded in state["fields"].items():
+        for agent, value in zip(agents, decode_values(encoded)):
+            if value is not _MISSING:
+                setattr(agent, name, value)
+
+    for agent, pos in zip(agents, decode_values(state["pos"])):
+        if pos is not None:
+            model.grid.place_agent(agent, pos)
+    model.fleet_index.rebuild(agents)
+
+    for agent, memory in zip(agents, decode_records(state["memory"])):
+        agent.memory.resize(agent.memory_size)
+        agent.memory.clear()
+        for record in memory:
+            agent.memory.append_record(record)
+
+    locations = decode_values(state["good_spots"]["locations"])
+    start = 0
+    for agent, infos in zip(agents, decode_records(state["good_spots"]["info"])):
+        agent.good_spots_memory.clear()
+        for location, info in zip(locations[start:start + len(infos)], infos):
+            agent.good_spots_memory[location] = info
+        start += len(infos)
+
+    if rng_states is not None:
+        for agent, rng_state in zip(agents, rng_states):
+            set_random_state(agent.decision_rng, rng_state)
+
+
+def _restore_mesa_clock(model, steps, time):
+    """Set Mesa's step counter and clock"""
+    model.steps = steps
+    schedule = getattr(model, "_default_schedule", None)
+    if schedule is None:
+        if time is not None:
+            model.time = time
+        return
+
+    # Mesa >= 3.5 drives step() with an event generator whose next event
+    # is at time 1.0 in a fresh model: re-anchor it after the stored time
+    from mesa.time import EventGenerator, Priority, Schedule
+    schedule.stop()
+    model.time = time
+    model._default_schedule = EventGenerator(
+        model,
+        model._do_step,
+        Schedule(interval=1.0, start=time + 1.0),
+        priority=Priority.HIGH,
+    ).start()
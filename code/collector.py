@@ -0,0 +1,814 @@
+"""
+Data collection for the FIBE fishery model.
+
+All model-level metrics are derived from a single pass over the agent set:
+every agent scalar the reporters need is gathered once into plain lists, and
+the counts, sums, means, medians and Gini coefficients are computed from
+those lists. The stock columns are read from the PatchField totals, which
+are re-based on a patch-order recount before each collection. The result is
+exactly what the original one-lambda-per-column reporters produced (same
+columns, same order, same floating-point values).
+
+Agent-level reporter values are stored column by column in typed NumPy
+buffers (AgentHistoryRecorder) instead of one Python tuple per agent and
+step, and the agent dataframe is built from those buffers on demand.
+
+Model-level and agent-level data can be collected on separate cadences
+(daily, weekly, monthly, yearly or every N days). Flow metrics such as
+total_catch_daily and catch_region_* are summed over each interval rather
+than sampled on its last day.
+"""
+
+from copy import deepcopy
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from mesa.datacollection import DataCollector
+
+from . import config
+from .checkpoint import encode_values, decode_values
+from .patches import FISHING_REGIONS
+
+# Model dataframe columns, in reporting order
+MODEL_REPORTER_COLUMNS = (
+    # Fish stocks
+    "stock_A", "stock_B", "stock_C", "stock_D", "total_stock",
+    "stock_below_MSY_A", "stock_below_MSY_B", "stock_below_MSY_C", "stock_below_MSY_D",
+
+    # Agent counts
+    "num_agents", "num_archipelago", "num_coastal", "num_trawler",
+    "num_fishing", "num_at_home", "num_bankrupt",
+
+    # Catches
+    "total_catch_daily", "total_catch_cumulative", "total_catch", "avg_catch_per_agent",
+    "catch_region_A", "catch_region_B", "catch_region_C", "catch_region_D",
+
+    # Economic metrics
+    "total_capital", "avg_capital", "median_capital", "min_capital", "max_capital",
+    "total_profit", "avg_profit", "total_revenue", "total_costs",
+
+    # Inequality
+    "gini_capital", "gini_wealth", "gini_catch",
+
+    # Activity
+    "avg_days_at_sea", "total_trips", "avg_success_rate",
+
+    # Memory and perception
+    "avg_growth_perception", "num_perceive_scarcity", "avg_memory_size",
+
+    # Weather and time
+    "bad_weather", "current_step", "current_year", "current_day_of_year",
+)
+
+# Daily flows, summed over the collection interval
+FLOW_COLUMNS = (
+    "total_catch_daily",
+    "catch_region_A", "catch_region_B", "catch_region_C", "catch_region_D",
+)
+
+# Named collection cadences, in days
+COLLECTION_CADENCES = {
+    "daily": 1,
+    "weekly": config.WEEK,
+    "monthly": config.MONTH,
+    "yearly": config.YEAR,
+}
+
+
+def cadence_interval(cadence):
+    """
+    Convert a collection cadence to an interval in days.
+
+    Args:
+        cadence: "daily", "weekly", "monthly", "yearly" or a number of days
+
+    Returns:
+        int: Interval in days
+
+    Raises:
+        ValueError: If the cadence is unknown or not a positive number of days
+    """
+    if isinstance(cadence, str):
+        if cadence not in COLLECTION_CADENCES:
+            raise ValueError(
+                f"Unknown collection cadence '{cadence}' "
+                f"(expected one of {list(COLLECTION_CADENCES)} or a number of days)"
+            )
+        return COLLECTION_CADENCES[cadence]
+
+    interval = int(cadence)
+    if interval != cadence or interval < 1:
+        raise ValueError(f"Collection interval must be a positive number of days, got {cadence!r}")
+    return interval
+
+
+def _mean(values):
+    """Same as FisheryModel._safe_mean"""
+    if not values:
+        return 0
+    return sum(values) / len(values)
+
+
+def _median_sorted(sorted_values):
+    """Same as FisheryModel._safe_median, on already sorted values"""
+    n = len(sorted_values)
+    if n == 0:
+        return 0
+    if n % 2 == 0:
+        return (sorted_values[n//2 - 1] + sorted_values[n//2]) / 2
+    return sorted_values[n//2]
+
+
+def _gini_sorted(sorted_values):
+    """
+    Same as FisheryModel.calculate_gini, on already sorted values.
+
+    Clamping negative values to zero preserves the order, so a list sorted
+    once can be shared between the median and the Gini coefficient.
+    """
+    if not sorted_values:
+        return 0
+
+    sorted_values = [max(0, v) for v in sorted_values]
+    total = sum(sorted_values)
+    if total == 0:
+        return 0
+
+    n = len(sorted_values)
+    cumsum = 0
+    for i, value in enumerate(sorted_values):
+        cumsum += (i + 1) * value
+
+    return (2 * cumsum) / (n * total) - (n + 1) / n
+
+
+def compute_model_metrics(model):
+    """
+    Compute every model-level metric in a single pass over the agents.
+
+    Args:
+        model: FisheryModel instance
+
+    Returns:
+        dict: {column: value} for every entry of MODEL_REPORTER_COLUMNS
+    """
+    num_by_type = {"archipelago": 0, "coastal": 0, "trawler": 0}
+    num_fishing = 0
+    num_at_home = 0
+    num_bankrupt = 0
+    num_perceive_scarcity = 0
+
+    accumulated_catch = []
+    catch_by_region = {region: [] for region in FISHING_REGIONS}
+    total_catch = []
+    capital = []
+    wealth = []
+    total_profit = []
+    total_revenue = []
+    total_cost = []
+    days_at_sea = []
+    trips = []
+    success_rate = []
+    growth_perception = []
+    memory_size = []
+
+    for a in model.agents:
+        if a.fisher_type in num_by_type:
+            num_by_type[a.fisher_type] += 1
+        if a.gone_fishing:
+            num_fishing += 1
+        if a.at_home:
+            num_at_home += 1
+        if a.bankrupt:
+            num_bankrupt += 1
+        if getattr(a, 'perceive_scarcity', False):
+            num_perceive_scarcity += 1
+
+        accumulated_catch.append(a.accumulated_catch)
+        if a.current_region in catch_by_region:
+            catch_by_region[a.current_region].append(a.accumulated_catch)
+        total_catch.append(a.total_catch)
+        capital.append(a.capital)
+        wealth.append(a.wealth)
+        total_profit.append(a.total_profit)
+        total_revenue.append(a.total_revenue)
+        total_cost.append(a.total_cost)
+        days_at_sea.append(a.days_at_sea)
+
+        num_trips = a.profitable_trip + a.unprofitable_trip
+        trips.append(num_trips)
+        success_rate.append(a.profitable_trip / num_trips if num_trips > 0 else 0)
+
+        growth_perception.append(a.growth_perception)
+        memory_size.append(len(a.memory))
+
+    n = len(capital)
+    sorted_capital = sorted(capital)
+
+    metrics = {}
+
+    # Fish stocks
+    for region in FISHING_REGIONS:
+        metrics[f"stock_{region}"] = model.get_region_stock(region)
+    metrics["total_stock"] = model.get_total_stock()
+    for region in FISHING_REGIONS:
+        msy = getattr(model, f"MSY_STOCK_{region}")
+        metrics[f"stock_below_MSY_{region}"] = 1 if metrics[f"stock_{region}"] < msy else 0
+
+    # Agent counts
+    metrics["num_agents"] = n
+    metrics["num_archipelago"] = num_by_type["archipelago"]
+    metrics["num_coastal"] = num_by_type["coastal"]
+    metrics["num_trawler"] = num_by_type["trawler"]
+    metrics["num_fishing"] = num_fishing
+    metrics["num_at_home"] = num_at_home
+    metrics["num_bankrupt"] = num_bankrupt
+
+    # Catches
+    metrics["total_catch_daily"] = sum(accumulated_catch)
+    metrics["total_catch_cumulative"] = sum(total_catch)
+    metrics["total_catch"] = metrics["total_catch_cumulative"]
+    metrics["avg_catch_per_agent"] = _mean(total_catch)
+    for region in FISHING_REGIONS:
+        metrics[f"catch_region_{region}"] = sum(catch_by_region[region])
+
+    # Economic metrics
+    metrics["total_capital"] = sum(capital)
+    metrics["avg_capital"] = _mean(capital)
+    metrics["median_capital"] = _median_sorted(sorted_capital)
+    metrics["min_capital"] = min(capital) if n > 0 else 0
+    metrics["max_capital"] = max(capital) if n > 0 else 0
+    metrics["total_profit"] = sum(total_profit)
+    metrics["avg_profit"] = _mean(total_profit)
+    metrics["total_revenue"] = sum(total_revenue)
+    metrics["total_costs"] = sum(total_cost)
+
+    # Inequality
+    metrics["gini_capital"] = _gini_sorted(sorted_capital)
+    metrics["gini_wealth"] = _gini_sorted(sorted(wealth))
+    metrics["gini_catch"] = _gini_sorted(sorted(total_catch))
+
+    # Activity
+    metrics["avg_days_at_sea"] = _mean(days_at_sea)
+    metrics["total_trips"] = sum(trips)
+    metrics["avg_success_rate"] = _mean(success_rate)
+
+    # Memory and perception
+    metrics["avg_growth_perception"] = _mean(growth_perception)
+    metrics["num_perceive_scarcity"] = num_perceive_scarcity
+    metrics["avg_memory_size"] = _mean(memory_size)
+
+    # Weather and time
+    metrics["bad_weather"] = 1 if model.bad_weather else 0
+    metrics["current_step"] = model.current_step
+    metrics["current_year"] = model.current_step // model.YEAR
+    metrics["current_day_of_year"] = model.current_step % model.YEAR
+
+    return metrics
+
+
+def compute_flow_metrics(model):
+    """
+    Compute the daily flow metrics only (see FLOW_COLUMNS).
+
+    Used on days where the model-level data is not collected, so flows can
+    be summed over the collection interval.
+
+    Args:
+        model: FisheryModel instance
+
+    Returns:
+        dict: {column: value} for every entry of FLOW_COLUMNS
+    """
+    accumulated_catch = []
+    catch_by_region = {region: [] for region in FISHING_REGIONS}
+    for a in model.agents:
+        accumulated_catch.append(a.accumulated_catch)
+        if a.current_region in catch_by_region:
+            catch_by_region[a.current_region].append(a.accumulated_catch)
+
+    flows = {"total_catch_daily": sum(accumulated_catch)}
+    for region in FISHING_REGIONS:
+        flows[f"catch_region_{region}"] = sum(catch_by_region[region])
+    return flows
+
+
+# Immutable values that can be stored without a deepcopy (as in Mesa)
+_IMMUTABLE_TYPES = (str, int, bool, float, tuple)
+
+# Scalar types stored in typed buffers
+_BOOL_TYPES = {bool, np.bool_}
+_NUMERIC_TYPES = _BOOL_TYPES | {int, float, np.int64, np.float64}
+
+# Category codes are int16
+_MAX_CATEGORIES = np.iinfo(np.int16).max
+
+
+class _HistoryColumn:
+    """
+    One agent field of an AgentHistoryRecorder, as a (steps x agents) buffer.
+
+    The storage kind is inferred from the first recorded values and widened
+    if later values need it:
+
+    - "bool": bool array
+    - "int": int64 array, upcast to "float" on the first non-integer value
+    - "float": float64 array
+    - "category": int16 codes into a list of categories (str or None)
+    - "object": object array (fallback for anything else)
+    """
+
+    def __init__(self, name, shape):
+        self.name = name
+        self.kind = None
+        self.buffer = None
+        self.categories = []
+        self._category_codes = {}
+        self._shape = shape
+
+    def resize(self, shape):
+        """Grow the buffer, keeping the recorded values"""
+        self._shape = shape
+        if self.buffer is None:
+            return
+        old = self.buffer
+        self.buffer = np.empty(shape, dtype=old.dtype)
+        self.buffer[:old.shape[0], :old.shape[1]] = old
+
+    def write(self, row, slots, values):
+        """Store one step of values at the given agent slots"""
+        if not values:
+            return
+        if self.kind is None:
+            self._init_kind(values)
+
+        if self.kind == "category":
+            codes = self._encode(values)
+            if codes is not None:
+                self.buffer[row, slots] = codes
+                return
+            self._promote_to_object()
+        elif self.kind != "object":
+            arr, kind = _scalar_array(values)
+            if kind == self.kind or (self.kind == "float" and kind == "int"):
+                self.buffer[row, slots] = arr
+                return
+            if self.kind == "int" and kind == "float":
+                self.kind = "float"
+                self.buffer = self.buffer.astype(np.float64)
+                self.buffer[row, slots] = arr
+                return
+            self._promote_to_object()
+
+        column = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            column[i] = value if isinstance(value, _IMMUTABLE_TYPES) else deepcopy(value)
+        self.buffer[row, slots] = column
+
+    def gather(self, rows, slots, as_categorical=False):
+        """Values at (rows[i], slots[i]), as a 1-D array"""
+        if self.buffer is None:
+            return np.empty(len(rows), dtype=object)
+        values = self.buffer[rows, slots]
+        if self.kind == "category":
+            if as_categorical:
+                # None becomes a missing value (code -1)
+                labels = [c for c in self.categories if c is not None]
+                remap = np.array([-1 if c is None else labels.index(c) for c in self.categories])
+                return pd.Categorical.from_codes(remap[values], labels)
+            categories = np.empty(len(self.categories), dtype=object)
+            categories[:] = self.categories
+            return categories[values]
+        return values
+
+    def get_state(self, num_rows, num_agents):
+        """Kind, categories and recorded block of the buffer (for checkpoints)"""
+        state = {"kind": self.kind, "categories": list(self.categories), "buffer": None}
+        if self.buffer is not None:
+            block = self.buffer[:num_rows, :num_agents]
+            if self.kind == "object":
+                state["buffer"] = encode_values(block.ravel().tolist())
+            else:
+                state["buffer"] = block.copy()
+        return state
+
+    def set_state(self, state, num_rows, num_agents):
+        """Restore the state returned by get_state"""
+        self.kind = state["kind"]
+        self.categories = list(state["categories"])
+        self._category_codes = {category: code for code, category in enumerate(self.categories)}
+        if state["buffer"] is None:
+            self.buffer = None
+            return
+        dtype = {"bool": bool, "int": np.int64, "float": np.float64,
+                 "category": np.int16, "object": object}[self.kind]
+        self.buffer = np.empty(self._shape, dtype=dtype)
+        if self.kind == "object":
+            block = np.empty(num_rows * num_agents, dtype=object)
+            block[:] = decode_values(state["buffer"], missing=None)
+            self.buffer[:num_rows, :num_agents] = block.reshape(num_rows, num_agents)
+        else:
+            self.buffer[:num_rows, :num_agents] = state["buffer"]
+
+    def _init_kind(self, values):
+        if all(type(v) is str or v is None for v in values):
+            self.kind = "category"
+            dtype = np.int16
+        else:
+            self.kind = _scalar_array(values)[1] or "object"
+            dtype = {"bool": bool, "int": np.int64, "float": np.float64, "object": object}[self.kind]
+        self.buffer = np.empty(self._shape, dtype=dtype)
+
+    def _encode(self, values):
+        """Category codes of the values (None if a value is not a category)"""
+        lookup = self._category_codes
+        codes = []
+        for value in values:
+            code = lookup.get(value) if (type(value) is str or value is None) else -1
+            if code is None:
+                if len(self.categories) >= _MAX_CATEGORIES:
+                    return None
+                code = len(self.categories)
+                self.categories.append(value)
+                lookup[value] = code
+            elif code < 0:
+                return None
+            codes.append(code)
+        return codes
+
+    def _promote_to_object(self):
+        if self.kind == "category":
+            categories = np.empty(len(self.categories), dtype=object)
+            categories[:] = self.categories
+            self.buffer = categories[self.buffer]
+        else:
+            self.buffer = self.buffer.astype(object)
+        self.kind = "object"
+
+
+def _scalar_array(values):
+    """
+    Array of Python scalars and its storage kind ("bool", "int" or "float").
+
+    Returns (None, None) for values that need an object column (non-scalars,
+    bools mixed with numbers, integers too large for int64).
+    """
+    types = set(map(type, values))
+    booleans = types & _BOOL_TYPES
+    if not types <= _NUMERIC_TYPES or (booleans and booleans != types):
+        return None, None
+    arr = np.asarray(values)
+    if arr.dtype == bool:
+        return arr, "bool"
+    if arr.dtype.kind == "i":
+        return arr, "int"
+    if arr.dtype.kind == "f":
+        return arr, "float"
+    return None, None
+
+
+class AgentHistoryRecorder:
+    """
+    Columnar store of agent reporter values.
+
+    Every field is a typed (steps x agents) NumPy buffer, preallocated from
+    the expected run length and population and grown by doubling when
+    needed. Agents get a column slot the first time they are seen, and each
+    step records the slot order so the dataframe rows come out in the same
+    (step, agent) order as Mesa's DataCollector. String fields are stored as
+    small integer category codes.
+    """
+
+    def __init__(self, field_names, expected_steps=0, expected_agents=0):
+        """
+        Args:
+            field_names: Reporter names, in column order
+            expected_steps: Number of steps to preallocate
+            expected_agents: Number of agents to preallocate
+        """
+        self._shape = (max(1, expected_steps), max(1, expected_agents))
+        self.columns = {name: _HistoryColumn(name, self._shape) for name in field_names}
+        self.steps = []
+        self.agent_ids = []
+        self._slots = {}
+        self._order = np.full(self._shape, -1, dtype=np.int32)
+        self._counts = np.zeros(self._shape[0], dtype=np.int32)
+
+    def __len__(self):
+        """Number of recorded (step, agent) rows"""
+        return int(self._counts[:len(self.steps)].sum())
+
+    def record(self, step, agents, reporters):
+        """
+        Record one step.
+
+        Args:
+            step: Step label (the Step index level)
+            agents: Agents to record, in row order
+            reporters: {field name: function(agent)}
+        """
+        agents = list(agents)
+        slots = []
+        for agent in agents:
+            slot = self._slots.get(agent.unique_id)
+            if slot is None:
+                slot = len(self.agent_ids)
+                self._slots[agent.unique_id] = slot
+                self.agent_ids.append(agent.unique_id)
+            slots.append(slot)
+
+        row = len(self.steps)
+        self._reserve(row + 1, len(self.agent_ids))
+        self.steps.append(step)
+        self._counts[row] = len(slots)
+        self._order[row, :len(slots)] = slots
+
+        for name, reporter in reporters.items():
+            self.columns[name].write(row, slots, [reporter(agent) for agent in agents])
+
+    def _reserve(self, num_steps, num_agents):
+        steps, agents = self._shape
+        if num_steps <= steps and num_agents <= agents:
+            return
+        while steps < num_steps:
+            steps *= 2
+        while agents < num_agents:
+            agents *= 2
+        self._shape = (steps, agents)
+
+        order = np.full(self._shape, -1, dtype=np.int32)
+        order[:self._order.shape[0], :self._order.shape[1]] = self._order
+        self._order = order
+        counts = np.zeros(steps, dtype=np.int32)
+        counts[:len(self._counts)] = self._counts
+        self._counts = counts
+        for column in self.columns.values():
+            column.resize(self._shape)
+
+    def to_dataframe(self, as_categorical=False, start=0):
+        """
+        Build the agent dataframe (same layout as Mesa's
+        get_agent_vars_dataframe: (Step, AgentID) index, one column per field).
+
+        Args:
+            as_categorical: Return string fields as pandas Categoricals
+            start: First recorded step to include (to export only new steps)
+
+        Returns:
+            pd.DataFrame
+        """
+        num_rows = len(self.steps) - start
+        counts = self._counts[start:start + num_rows]
+        filled = np.arange(self._shape[1]) < counts[:, None]
+        slots = self._order[start:start + num_rows][filled]
+        rows = np.repeat(np.arange(start, start + num_rows), counts)
+
+        index = pd.MultiIndex.from_arrays(
+            [
+                np.repeat(np.asarray(self.steps[start:]), counts),
+                np.asarray(self.agent_ids)[slots] if len(slots) else np.empty(0, dtype=np.int64),
+            ],
+            names=["Step", "AgentID"],
+        )
+        data = {
+            name: column.gather(rows, slots, as_categorical)
+            for name, column in self.columns.items()
+        }
+        return pd.DataFrame(data, index=index)
+
+    def clear(self):
+        """
+        Drop the recorded steps, keeping the buffers and agent slots for
+        reuse (e.g. once the rows have been written to disk).
+        """
+        self.steps = []
+        self._counts[:] = 0
+
+    def get_state(self):
+        """Recorded steps and buffers (for checkpoints)"""
+        num_rows = len(self.steps)
+        num_agents = len(self.agent_ids)
+        return {
+            "steps": encode_values(self.steps),
+            "agent_ids": encode_values(self.agent_ids),
+            "order": self._order[:num_rows, :num_agents].copy(),
+            "counts": self._counts[:num_rows].copy(),
+            "columns": {
+                name: column.get_state(num_rows, num_agents)
+                for name, column in self.columns.items()
+            },
+        }
+
+    def set_state(self, state):
+        """Restore the state returned by get_state"""
+        num_rows, num_agents = state["order"].shape
+        self.steps = decode_values(state["steps"])
+        self.agent_ids = decode_values(state["agent_ids"])
+        self._slots = {agent_id: slot for slot, agent_id in enumerate(self.agent_ids)}
+        self._shape = (max(self._shape[0], num_rows), max(self._shape[1], num_agents))
+
+        self._order = np.full(self._shape, -1, dtype=np.int32)
+        self._order[:num_rows, :num_agents] = state["order"]
+        self._counts = np.zeros(self._shape[0], dtype=np.int32)
+        self._counts[:num_rows] = state["counts"]
+        for name, column_state in state["columns"].items():
+            column = self.columns[name]
+            column._shape = self._shape
+            column.set_state(column_state, num_rows, num_agents)
+
+    def memory_usage(self):
+        """Bytes held by the buffers"""
+        total = self._order.nbytes + self._counts.nbytes
+        for column in self.columns.values():
+            if column.buffer is not None:
+                total += column.buffer.nbytes
+        return total
+
+
+class FisheryDataCollector(DataCollector):
+    """
+    DataCollector with a fused model-metrics pass, columnar agent history
+    and separate collection cadences.
+
+    Each model reporter is a partial reading its column from a snapshot
+    computed once per collect() by compute_model_metrics, so the Mesa
+    collection loop, the model_vars layout and the model dataframe are
+    unchanged. Agent reporter values go to an AgentHistoryRecorder, and
+    get_agent_vars_dataframe() builds the same dataframe as Mesa from it.
+
+    The model calls collect_scheduled() every day; model-level and
+    agent-level data are then collected every model_interval and
+    agent_interval days respectively, and on the last day of the run.
+    """
+
+    def __init__(self, agent_reporters=None, expected_steps=0, expected_agents=0,
+                 model_interval=1, agent_interval=1):
+        """
+        Args:
+            agent_reporters: {name: attribute name or function(agent)}
+            expected_steps: Number of simulated days (to preallocate the history)
+            expected_agents: Number of agents to preallocate for
+            model_interval: Days between model-level collections
+            agent_interval: Days between agent-level collections
+        """
+        model_reporters = {
+            name: partial(self._read_metric, name) for name in MODEL_REPORTER_COLUMNS
+        }
+        self._metrics = None
+        self._pending_flows = None
+        self._skip_agents = False
+        self._model_rows_taken = 0
+        self._agent_rows_taken = 0
+        self.model_interval = model_interval
+        self.agent_interval = agent_interval
+        super().__init__(model_reporters=model_reporters, agent_reporters=agent_reporters)
+        self.agent_history = AgentHistoryRecorder(
+            list(self.agent_reporters), -(-expected_steps // agent_interval), expected_agents
+        )
+
+    def _read_metric(self, name, model):
+        if self._metrics is None:
+            # Called outside collect() (e.g. directly by user code)
+            return compute_model_metrics(model)[name]
+        return self._metrics[name]
+
+    def collect_scheduled(self, model):
+        """
+        Collect whatever is due on the current day.
+
+        Must be called once per simulated day (before current_step is
+        incremented), so flows on days without a model-level collection can
+        be accumulated.
+
+        Args:
+            model: FisheryModel instance
+        """
+        day = model.current_step + 1
+        last_day = day >= model.end_of_sim
+        agent_due = last_day or day % self.agent_interval == 0
+
+        if last_day or day % self.model_interval == 0:
+            self.collect(model, agent_level=agent_due)
+        else:
+            self.accumulate_flows(model)
+            if agent_due:
+                self._record_agents(model)
+
+    def is_due(self, model):
+        """Whether collect_scheduled reads more than the flows on the current day"""
+        day = model.current_step + 1
+        return day >= model.end_of_sim or day % self.model_interval == 0 or day % self.agent_interval == 0
+
+    def accumulate_flows(self, model):
+        """Add the current day's flows to the next model-level collection"""
+        flows = compute_flow_metrics(model)
+        if self._pending_flows is None:
+            self._pending_flows = flows
+        else:
+            for name in FLOW_COLUMNS:
+                self._pending_flows[name] += flows[name]
+
+    def collect(self, model, agent_level=True):
+        """
+        Collect model-level data (and agent-level data unless agent_level is
+        False), including the flows accumulated since the last collection.
+        """
+        metrics = compute_model_metrics(model)
+        if self._pending_flows is not None:
+            for name in FLOW_COLUMNS:
+                metrics[name] = self._pending_flows[name] + metrics[name]
+            self._pending_flows = None
+
+        self._metrics = metrics
+        self._skip_agents = not agent_level
+        try:
+            super().collect(model)
+        finally:
+            self._metrics = None
+            self._skip_agents = False
+
+    def _record_agents(self, model):
+        """
+        Record the agent reporters into the columnar history.
+
+        Overrides the Mesa hook that would build one tuple per agent; the
+        per-step record list Mesa keeps is left empty.
+        """
+        if not self._skip_agents:
+            step = getattr(model, "time", model.steps)
+            self.agent_history.record(step, model.agents, self.agent_reporters)
+        return ()
+
+    def get_agent_vars_dataframe(self, as_categorical=False):
+        """
+        Build the agent dataframe from the columnar history.
+
+        Args:
+            as_categorical: Return string fields as pandas Categoricals
+
+        Returns:
+            pd.DataFrame: (Step, AgentID) index, one column per agent reporter
+        """
+        if not self.agent_reporters:
+            raise UserWarning(
+                "No agent reporters have been defined in the DataCollector, returning empty DataFrame."
+            )
+        return self.agent_history.to_dataframe(as_categorical)
+
+    def get_state(self):
+        """Collected rows and pending flows (for checkpoints)"""
+        return {
+            "model_vars": {name: encode_values(values) for name, values in self.model_vars.items()},
+            "collection_steps": encode_values(getattr(self, "_collection_steps", [])),
+            "agent_record_steps": encode_values(list(self._agent_records)),
+            "pending_flows": self._pending_flows,
+            "model_rows_taken": self._model_rows_taken,
+            "agent_rows_taken": self._agent_rows_taken,
+            "agent_history": self.agent_history.get_state(),
+        }
+
+    def set_state(self, state):
+        """Restore the state returned by get_state"""
+        for name, values in state["model_vars"].items():
+            self.model_vars[name] = decode_values(values)
+        if hasattr(self, "_collection_steps"):
+            self._collection_steps = decode_values(state["collection_steps"])
+        self._agent_records = {step: [] for step in decode_values(state["agent_record_steps"])}
+        self._pending_flows = state["pending_flows"]
+        self._model_rows_taken = state["model_rows_taken"]
+        self._agent_rows_taken = state["agent_rows_taken"]
+        self.agent_history.set_state(state["agent_history"])
+
+    def take_new_rows(self, release=False, as_categorical=False):
+        """
+        Model and agent rows collected since the previous call.
+
+        Args:
+            release: Also drop every collected row from memory afterwards,
+                so memory stays bounded by the interval between calls
+            as_categorical: Return string agent fields as pandas Categoricals
+
+        Returns:
+            Tuple (model_df, agent_df); agent_df keeps the (Step, AgentID)
+            index, model_df is numbered from 0 within the chunk
+        """
+        start = self._model_rows_taken
+        model_df = pd.DataFrame({
+            name: values[start:] for name, values in self.model_vars.items()
+        })
+        agent_df = self.agent_history.to_dataframe(as_categorical, start=self._agent_rows_taken)
+
+        if release:
+            for values in self.model_vars.values():
+                values.clear()
+            self._agent_records.clear()
+            if hasattr(self, "_collection_steps"):
+                self._collection_steps.clear()
+            self.agent_history.clear()
+            self._model_rows_taken = 0
+            self._agent_rows_taken = 0
+        else:
+            self._model_rows_taken = len(self.model_vars[MODEL_REPORTER_COLUMNS[0]])
+            self._agent_rows_taken = len(self.agent_history.steps)
+        return model_df, agent_df
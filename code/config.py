@@ -30,6 +30,9 @@ LAND = [[25, 50], [0, 24]]        # Non-fishing area
 GRID_WIDTH = 50
 GRID_HEIGHT = 56
 
+# On-disk cache for the static landscape raster (None = in-memory only)
+LANDSCAPE_CACHE_DIR = None
+
 # =============================================================================
 # HOTSPOT LOCATIONS
 # =============================================================================
@@ -151,6 +154,7 @@ TRAVEL_COST_PER_UNIT = 1.0
 # Memory settings
 DEFAULT_MEMORY_SIZE = 10              # Remember last N fishing trips
 SPATIAL_MEMORY_MAX_AGE = 365 * 2      # Forget spots after 2 years
+SPATIAL_MEMORY_FORGETTING = False     # Forget spots older than SPATIAL_MEMORY_MAX_AGE every day
 
 # Decision thresholds (archipelago)
 SATISFACTION_HOME_THRESHOLD = 0.5
@@ -185,6 +189,48 @@ TRAWLER_PROFIT_THRESHOLD_DAYS = 3
 
 BAD_WEATHER_PROBABILITY = 0.1         # 10% chance of bad weather per day
 
+# =============================================================================
+# RANDOM NUMBER PARAMETERS
+# =============================================================================
+
+RNG_PER_AGENT_STREAMS = False         # One decision stream per agent (instead of one shared stream)
+
+# =============================================================================
+# AGENT LOOP PARAMETERS
+# =============================================================================
+
+BATCH_ARCHIPELAGO_DECISIONS = True    # Decide for all archipelago fishers at once (same results)
+
+# =============================================================================
+# DATA COLLECTION PARAMETERS
+# =============================================================================
+
+# Collection cadence: "daily", "weekly", "monthly", "yearly" or a number of days
+MODEL_COLLECTION_CADENCE = "daily"    # Model-level data (flows are summed over the interval)
+AGENT_COLLECTION_CADENCE = "daily"    # Agent-level data (sampled at the end of the interval)
+
+# =============================================================================
+# CHECKPOINT PARAMETERS
+# =============================================================================
+
+CHECKPOINT_INTERVAL_YEARS = 0         # Write a checkpoint every N simulated years in run_model (0 = off)
+CHECKPOINT_DIR = "./checkpoints/"     # Directory of the automatic checkpoints
+CHECKPOINT_KEEP = 2                   # Most recent automatic checkpoints kept on disk
+
+# =============================================================================
+# RESULT CACHE PARAMETERS
+# =============================================================================
+
+CACHE_DIR = "./cache/"                # Directory of the run result cache
+CACHE_MAX_BYTES = 2 * 1024**3         # Disk budget of the cache (least recently used runs are evicted)
+
+# =============================================================================
+# DEBUG PARAMETERS
+# =============================================================================
+
+STOCK_CHECK_INTERVAL = 0              # Cross-check stock accumulators every N days (0 = off)
+STOCK_CHECK_TOLERANCE = 1e-9          # Relative tolerance of the cross-check
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -0,0 +1,77 @@
+"""
+Ensemble helpers for repeated FIBE simulations.
+
+Replicates get independent seeds spawned from one root seed, and their
+yearly summaries (FisheryModel.yearly_data) are combined into per-year
+ensemble statistics.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Statistics reported for every yearly indicator
+ENSEMBLE_STATISTICS = ("mean", "std", "min", "median", "max")
+
+
+def spawn_seeds(repetitions, root_seed=None):
+    """
+    Independent seeds for a set of replicates.
+
+    Args:
+        repetitions: Number of replicates
+        root_seed: Root seed (None = fresh OS entropy)
+
+    Returns:
+        Tuple (root entropy, list of int seeds); the entropy reproduces the
+        same seeds when passed back as root_seed
+    """
+    root = np.random.SeedSequence(root_seed)
+    # 63-bit seeds fit in an int64 column of the combined results
+    seeds = [int(child.generate_state(1, dtype=np.uint64)[0]) >> 1 for child in root.spawn(repetitions)]
+    return root.entropy, seeds
+
+
+def combine_yearly_data(runs):
+    """
+    Stack the yearly summaries of several replicates.
+
+    Args:
+        runs: List of dicts with "run_id", "seed" and "yearly_data"
+
+    Returns:
+        pd.DataFrame: One row per (replicate, year), with run_id and seed columns
+    """
+    frames = []
+    for run in runs:
+        df = pd.DataFrame(run["yearly_data"])
+        df.insert(0, "seed", run["seed"])
+        df.insert(0, "run_id", run["run_id"])
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize_ensemble(combined):
+    """
+    Per-year statistics of every numeric yearly indicator across replicates.
+
+    Args:
+        combined: Output of combine_yearly_data
+
+    Returns:
+        pd.DataFrame: One row per year, columns "<indicator>_<statistic>"
+            plus "num_runs"
+    """
+    if combined.empty:
+        return pd.DataFrame()
+
+    indicators = [
+        column for column in combined.select_dtypes(include="number").columns
+        if column not in ("run_id", "seed", "year", "step")
+    ]
+    grouped = combined.groupby("year")
+    summary = grouped[indicators].agg(list(ENSEMBLE_STATISTICS))
+    summary.columns = [f"{indicator}_{stat}" for indicator, stat in summary.columns]
+    summary.insert(0, "num_runs", grouped["run_id"].nunique())
+    return summary.reset_index()
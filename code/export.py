@@ -0,0 +1,339 @@
+"""
+Streaming export of simulation data for the FIBE fishery model.
+
+A StreamingSink attached to a model writes the collected rows to disk while
+the run is in progress: every flush_interval days the rows collected since
+the previous flush are handed to a background writer thread, which writes
+them as one numbered part file per table (Parquet when an engine is
+installed, CSV otherwise). Closing the sink flushes the remaining rows,
+writes the yearly summary and a JSON manifest listing every part.
+
+Layout (inside <directory>/<timestamp>/):
+
+    <prefix>_model/part-00000.parquet   Model-level rows
+    <prefix>_agent/part-00000.parquet   Agent-level rows (with Step, AgentID)
+    <prefix>_yearly.parquet             Yearly summaries
+    <prefix>_manifest.json              Parts, row counts and step ranges
+"""
+
+import importlib.util
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+EXPORT_FORMATS = ("parquet", "csv")
+
+
+def resolve_export_format(export_format="auto"):
+    """
+    Pick the file format of a sink.
+
+    Args:
+        export_format: "parquet", "csv" or "auto" (Parquet if pyarrow or
+            fastparquet is installed, CSV otherwise)
+
+    Returns:
+        str: "parquet" or "csv"
+
+    Raises:
+        ValueError: If the format is unknown
+        ImportError: If "parquet" is requested but no engine is installed
+    """
+    has_parquet = any(importlib.util.find_spec(engine) for engine in ("pyarrow", "fastparquet"))
+    if export_format == "auto":
+        return "parquet" if has_parquet else "csv"
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{export_format}' (expected 'auto' or one of {EXPORT_FORMATS})")
+    if export_format == "parquet" and not has_parquet:
+        raise ImportError("Parquet export requires pyarrow or fastparquet")
+    return export_format
+
+
+class StreamingSink:
+    """
+    Write collected data to partitioned files during the run.
+
+    The simulation thread only slices the newly collected rows into
+    DataFrames; writing happens on a background thread so disk I/O overlaps
+    with the simulation. By default the flushed rows are released from the
+    model's DataCollector, so memory is bounded by the flush interval
+    rather than the run length.
+    """
+
+    def __init__(self, filename_prefix='fibe_output', directory='./results/',
+                 flush_interval=365, export_format="auto", release_rows=True,
+                 max_pending=4, timestamp=None):
+        """
+        Args:
+            filename_prefix: Prefix for output files (includes the run id
+                suffix when running repetitions)
+            directory: Parent output directory (a timestamped subdirectory
+                is created in it, as in FisheryModel.export_data)
+            flush_interval: Days between flushes
+            export_format: "parquet", "csv" or "auto"
+            release_rows: Drop flushed rows from the DataCollector
+            max_pending: Flushed chunks that may wait for the writer thread
+                before the simulation blocks
+            timestamp: Output subdirectory name (defaults to the current time)
+        """
+        if flush_interval < 1:
+            raise ValueError("flush_interval must be at least 1 day")
+
+        self.filename_prefix = filename_prefix
+        self.timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.directory = os.path.join(directory, self.timestamp)
+        self.flush_interval = flush_interval
+        self.export_format = resolve_export_format(export_format)
+        self.release_rows = release_rows
+
+        self.parts = {"model": [], "agent": []}
+        self.yearly_file = None
+        self.closed = False
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._error = None
+
+    # ----- Simulation side -----
+
+    def after_step(self, model):
+        """Flush if a flush interval ended on this step (called by the model)"""
+        if model.current_step % self.flush_interval == 0:
+            self.flush(model)
+
+    def flush(self, model):
+        """Hand the rows collected since the last flush to the writer"""
+        self._raise_writer_error()
+        model_df, agent_df = model.datacollector.take_new_rows(
+            release=self.release_rows,
+            as_categorical=self.export_format == "parquet",
+        )
+        if len(model_df):
+            self._submit("model", model_df)
+        if len(agent_df):
+            self._submit("agent", agent_df.reset_index())
+
+    def close(self, model):
+        """
+        Flush the remaining rows, write the yearly summary and the manifest.
+
+        Args:
+            model: FisheryModel the sink is attached to
+
+        Returns:
+            dict: Manifest
+        """
+        if self.closed:
+            return self._manifest(model)
+
+        self.flush(model)
+        if model.yearly_data:
+            self._submit("yearly", pd.DataFrame(model.yearly_data))
+
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+        self.closed = True
+        self._raise_writer_error()
+
+        manifest = self._manifest(model)
+        path = os.path.join(self.directory, f"{self.filename_prefix}_manifest.json")
+        _atomic_write(path, lambda tmp: _write_json(manifest, tmp))
+        return manifest
+
+    def drain(self):
+        """Wait until every submitted part has been written"""
+        self._queue.join()
+        self._raise_writer_error()
+
+    def get_state(self):
+        """Settings and parts written so far (for checkpoints)"""
+        return {
+            "filename_prefix": self.filename_prefix,
+            "timestamp": self.timestamp,
+            "directory": self.directory,
+            "flush_interval": self.flush_interval,
+            "export_format": self.export_format,
+            "release_rows": self.release_rows,
+            "parts": self.parts,
+            "yearly_file": self.yearly_file,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Sink continuing the output of a checkpointed run.
+
+        Args:
+            state: Output of get_state
+
+        Returns:
+            StreamingSink writing the next parts in the same directory
+        """
+        sink = cls(
+            filename_prefix=state["filename_prefix"],
+            flush_interval=state["flush_interval"],
+            export_format=state["export_format"],
+            release_rows=state["release_rows"],
+            timestamp=state["timestamp"],
+        )
+        sink.directory = state["directory"]
+        sink.parts = {table: list(parts) for table, parts in state["parts"].items()}
+        sink.yearly_file = state["yearly_file"]
+        return sink
+
+    def _submit(self, table, df):
+        if self.closed:
+            raise RuntimeError("StreamingSink is closed")
+        if self._thread is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._thread = threading.Thread(target=self._writer_loop, name="fibe-export-writer", daemon=True)
+            self._thread.start()
+
+        if table == "yearly":
+            filename = f"{self.filename_prefix}_yearly.{self.export_format}"
+            self.yearly_file = filename
+        else:
+            part = len(self.parts[table])
+            filename = os.path.join(f"{self.filename_prefix}_{table}", f"part-{part:05d}.{self.export_format}")
+            steps = df["Step"] if table == "agent" else df["current_step"]
+            self.parts[table].append({
+                "file": filename,
+                "rows": len(df),
+                "first_step": steps.iloc[0].item(),
+                "last_step": steps.iloc[-1].item(),
+            })
+        self._queue.put((os.path.join(self.directory, filename), df))
+
+    def _raise_writer_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"Export writer failed: {error}") from error
+
+    def _manifest(self, model):
+        return {
+            "filename_prefix": self.filename_prefix,
+            "timestamp": self.timestamp,
+            "format": self.export_format,
+            "flush_interval": self.flush_interval,
+            "days_simulated": model.current_step,
+            "model_collection_interval": model.model_collection_interval,
+            "agent_collection_interval": model.agent_collection_interval,
+            "tables": {
+                table: {
+                    "rows": sum(part["rows"] for part in parts),
+                    "parts": parts,
+                }
+                for table, parts in self.parts.items()
+            },
+            "yearly": self.yearly_file,
+            "complete": self.closed,
+        }
+
+    # ----- Writer thread -----
+
+    def _writer_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            path, df = item
+            if self._error is None:
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    _atomic_write(path, lambda tmp: self._write_table(df, tmp))
+                except Exception as e:
+                    self._error = e
+            self._queue.task_done()
+
+    def _write_table(self, df, path):
+        if self.export_format == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+
+
+def read_table(manifest_path, table):
+    """
+    Read a streamed table back into one DataFrame.
+
+    Args:
+        manifest_path: Path to the <prefix>_manifest.json file
+        table: "model", "agent" or "yearly"
+
+    Returns:
+        pd.DataFrame
+    """
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    directory = os.path.dirname(manifest_path)
+    read = pd.read_parquet if manifest["format"] == "parquet" else pd.read_csv
+
+    if table == "yearly":
+        if manifest["yearly"] is None:
+            return pd.DataFrame()
+        return read(os.path.join(directory, manifest["yearly"]))
+
+    parts = [read(os.path.join(directory, part["file"])) for part in manifest["tables"][table]["parts"]]
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat(parts, ignore_index=True)
+
+
+def export_tables(model_df, agent_df, yearly_data, filename_prefix='fibe_output',
+                  directory='./results/', verbose=False):
+    """
+    Export the collected data of a finished run to CSV files.
+
+    Args:
+        model_df: Model-level dataframe
+        agent_df: Agent-level dataframe
+        yearly_data: List of yearly summary dicts
+        filename_prefix: Prefix for output files
+        directory: Parent directory of the timestamped output directory
+        verbose: Print the exported files
+
+    Returns:
+        str: Timestamp of the output directory
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    directory = os.path.join(directory, timestamp)
+    os.makedirs(directory, exist_ok=True)
+    
+    # Export daily model data
+    model_df.to_csv(f"{os.path.join(directory, f"{filename_prefix}_model_{timestamp}.csv")}", index=False)
+    if verbose:
+        print(f"Exported: {filename_prefix}_model_{timestamp}.csv ({len(model_df)} rows)")
+    
+    # Export daily agent data
+    agent_df.to_csv(f"{os.path.join(directory, f"{filename_prefix}_agent_{timestamp}.csv")}", index=False)
+    if verbose:
+        print(f"Exported: {filename_prefix}_agents_{timestamp}.csv ({len(agent_df)} rows)")
+    
+    if yearly_data:
+        yearly_df = pd.DataFrame(yearly_data)
+        yearly_df.to_csv(f"{os.path.join(directory, f"{filename_prefix}_yearly_{timestamp}.csv")}", index=False)
+        if verbose:
+            print(f"Exported: {filename_prefix}_yearly_{timestamp}.csv ({len(yearly_df)} rows)")
+    
+    if verbose:
+        print(f"\n All data exported with timestamp: {timestamp}")
+    
+    return timestamp
+
+
+def _atomic_write(path, write):
+    """Write to a temporary file, then move it into place"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_json(data, path):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
@@ -0,0 +1,202 @@
+"""
+Spatial index of the fishers of the FIBE fishery model.
+
+The social spot-selection strategies (follow the best fisher, go where most
+fishers are) and the neighbour queries look at where the other fishers are.
+Scanning every agent for each query makes a simulated day O(N^2) when all
+fishers use them; FleetIndex keeps that information up to date instead:
+
+- the fishers placed on each grid cell
+- the fishers currently fishing in each region (gone_fishing and
+  current_region set), and how many of them are on each cell
+- the most occupied cell of each region (cached until the region changes)
+
+Fishers report their own changes (FisherAgent.move_to, return_home, ...)
+through update(). Query results match a scan of model.agents: ties go to
+the fisher created first, i.e. the first one in model.agents order.
+"""
+
+import math
+
+
+class FleetIndex:
+    """
+    Where the fishers are and who is fishing in each region.
+
+    Usage:
+        index = FleetIndex()
+        index.add(agent)            # new fisher (creation order = rank)
+        index.update(agent)         # after pos, gone_fishing or current_region changed
+        index.most_occupied_cell("A", exclude=agent)
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._rank = {}          # agent -> creation rank (model.agents order)
+        self._next_rank = 0
+        self._pos = {}           # agent -> cell (placed fishers)
+        self._cells = {}         # cell -> {agent: None}
+        self._fishing = {}       # agent -> (region, cell or None) of fishing fishers
+        self._regions = {}       # region -> {agent: None}
+        self._occupancy = {}     # region -> {cell: {agent: None}} (fishing and placed)
+        self._best_cell = {}     # region -> most occupied cell (cache)
+
+    # ----- Maintenance -----
+
+    def add(self, agent):
+        """Register a new fisher and index its current state"""
+        self._rank[agent] = self._next_rank
+        self._next_rank += 1
+        self.update(agent)
+
+    def discard(self, agent):
+        """Forget a removed fisher"""
+        self._set_pos(agent, None)
+        self._set_fishing(agent, None, None)
+        self._rank.pop(agent, None)
+
+    def rebuild(self, agents):
+        """Index the fishers from scratch (after restoring a checkpoint)"""
+        self._reset()
+        for agent in agents:
+            self.add(agent)
+
+    def update(self, agent):
+        """
+        Re-index a fisher after its position, gone_fishing or current_region
+        changed.
+        """
+        pos = agent.pos or None
+        region = agent.current_region if agent.gone_fishing else None
+        self._set_pos(agent, pos)
+        self._set_fishing(agent, region, pos)
+
+    def _set_pos(self, agent, pos):
+        old = self._pos.get(agent)
+        if old == pos:
+            return
+        if old is not None:
+            _remove(self._cells, old, agent)
+            del self._pos[agent]
+        if pos is not None:
+            self._cells.setdefault(pos, {})[agent] = None
+            self._pos[agent] = pos
+
+    def _set_fishing(self, agent, region, pos):
+        new = (region, pos) if region is not None else None
+        old = self._fishing.get(agent)
+        if old == new:
+            return
+        if old is not None:
+            old_region, old_cell = old
+            _remove(self._regions, old_region, agent)
+            if old_cell is not None:
+                _remove(self._occupancy[old_region], old_cell, agent)
+                self._best_cell.pop(old_region, None)
+            del self._fishing[agent]
+        if new is not None:
+            self._regions.setdefault(region, {})[agent] = None
+            self._fishing[agent] = new
+            if pos is not None:
+                self._occupancy.setdefault(region, {}).setdefault(pos, {})[agent] = None
+                self._best_cell.pop(region, None)
+
+    # ----- Queries -----
+
+    def fishers_in_region(self, region):
+        """Fishers fishing in a region (in no particular order)"""
+        return list(self._regions.get(region, ()))
+
+    def best_fisher(self, region, exclude=None):
+        """
+        Fisher with the highest total catch among those fishing in a region.
+
+        Args:
+            region: Region name
+            exclude: Fisher left out (the one asking)
+
+        Returns:
+            FisherAgent, or None if nobody else fishes there
+        """
+        rank = self._rank
+        best = None
+        for agent in self._regions.get(region, ()):
+            if agent is exclude:
+                continue
+            if (best is None or agent.total_catch > best.total_catch
+                    or (agent.total_catch == best.total_catch and rank[agent] < rank[best])):
+                best = agent
+        return best
+
+    def most_occupied_cell(self, region, exclude=None):
+        """
+        Cell with the most fishers fishing in a region.
+
+        Args:
+            region: Region name
+            exclude: Fisher left out of the counts (the one asking)
+
+        Returns:
+            (x, y) tuple, or None if nobody else fishes there
+        """
+        fishing = self._fishing.get(exclude)
+        if fishing is not None and fishing[0] == region and fishing[1] is not None:
+            # The cached cell counts the excluded fisher
+            return self._scan_cells(region, exclude)
+        if region not in self._best_cell:
+            self._best_cell[region] = self._scan_cells(region, None)
+        return self._best_cell[region]
+
+    def _scan_cells(self, region, exclude):
+        rank = self._rank
+        best = None
+        best_key = None
+        for cell, agents in self._occupancy.get(region, {}).items():
+            ranks = [rank[agent] for agent in agents if agent is not exclude]
+            if not ranks:
+                continue
+            # Most fishers first, then the cell of the first fisher in agent order
+            key = (-len(ranks), min(ranks))
+            if best_key is None or key < best_key:
+                best, best_key = cell, key
+        return best
+
+    def neighbors_in_radius(self, pos, radius, exclude=None):
+        """
+        Placed fishers within a Euclidean distance of a cell.
+
+        Args:
+            pos: Center (x, y)
+            radius: Search radius
+            exclude: Fisher left out (the one asking)
+
+        Returns:
+            list: Fishers in model.agents order
+        """
+        x0, y0 = pos
+        reach = math.floor(radius)
+        found = []
+        if (2 * reach + 1) ** 2 < len(self._cells):
+            cells = (
+                ((x, y), self._cells.get((x, y)))
+                for x in range(x0 - reach, x0 + reach + 1)
+                for y in range(y0 - reach, y0 + reach + 1)
+            )
+        else:
+            cells = self._cells.items()
+        for (x, y), agents in cells:
+            if not agents:
+                continue
+            if ((x0 - x) ** 2 + (y0 - y) ** 2) ** 0.5 <= radius:
+                found.extend(agent for agent in agents if agent is not exclude)
+        found.sort(key=self._rank.__getitem__)
+        return found
+
+
+def _remove(index, key, agent):
+    members = index[key]
+    del members[agent]
+    if not members:
+        del index[key]
@@ -0,0 +1,265 @@
+"""
+Static landscape raster for the FIBE fishery model.
+
+The landscape (region, density level and carrying capacity of every cell)
+depends only on the grid size, the region boundaries, the hotspot locations
+and the carrying capacity constants. It is computed once into read-only
+arrays, memoized per process, and can optionally be persisted to an on-disk
+cache keyed by a hash of those inputs.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from . import config
+from .patches import REGION_CODES, DENSITY_CODES, FISHING_REGIONS
+
+# Version of the raster layout (bump when the construction rule changes)
+LANDSCAPE_FORMAT_VERSION = 1
+
+# Hotspot radii: high density within HIGH_RADIUS, medium within MEDIUM_RADIUS
+HIGH_RADIUS = 1.5
+MEDIUM_RADIUS = 3
+
+# In-process memo: key -> Landscape
+_LANDSCAPE_CACHE = {}
+
+
+class Landscape:
+    """
+    Immutable landscape raster.
+
+    Arrays are flat, indexed by ``x * height + y`` like PatchField, and
+    flagged read-only so they can be shared between model instances.
+    """
+
+    def __init__(self, key, width, height, region_id, density_id, carrying_capacity):
+        self.key = key
+        self.width = width
+        self.height = height
+        self.region_id = _read_only(region_id)
+        self.density_id = _read_only(density_id)
+        self.carrying_capacity = _read_only(carrying_capacity)
+
+
+def _read_only(array):
+    array = np.ascontiguousarray(array)
+    array.flags.writeable = False
+    return array
+
+
+def landscape_key(width, height, regions, hotspots, capacities):
+    """
+    Hash the inputs that determine the landscape.
+
+    Args:
+        width, height: Grid dimensions
+        regions: {name: [[x0, x1], [y0, y1]]} for A, B, C, D and LAND
+        hotspots: {region: [[x, y], ...]} for A, B, C, D
+        capacities: {density level: carrying capacity}
+
+    Returns:
+        str: Hex digest
+    """
+    payload = {
+        "version": LANDSCAPE_FORMAT_VERSION,
+        "width": width,
+        "height": height,
+        "regions": {name: [list(r) for r in bounds] for name, bounds in regions.items()},
+        "hotspots": {name: [list(h) for h in spots] for name, spots in hotspots.items()},
+        "capacities": capacities,
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def classify_cell_density(x, y, hotspots):
+    """
+    Density level of a single cell from the hotspots of its region.
+
+    A hotspot centre is high density; otherwise the first hotspot (in list
+    order) within radius 3 decides: high within 1.5, medium within 3.
+
+    Args:
+        x, y: Cell coordinates
+        hotspots: Hotspots of the cell's region (lists or tuples)
+
+    Returns:
+        str: config.HIGH, config.MEDIUM or config.LOW
+    """
+    if (x, y) in {tuple(hs) for hs in hotspots}:
+        return config.HIGH
+
+    for hs in hotspots:
+        distance = ((x - hs[0])**2 + (y - hs[1])**2)**0.5
+        if distance <= HIGH_RADIUS:
+            return config.HIGH
+        elif distance <= MEDIUM_RADIUS:
+            return config.MEDIUM
+
+    return config.LOW
+
+
+def classify_density(xs, ys, hotspots):
+    """
+    Vectorized density classification (same rule as classify_cell_density).
+
+    A KD-tree over the hotspots gives the two nearest hotspots of every
+    cell. Cells with no hotspot within MEDIUM_RADIUS are low density, cells
+    on a hotspot centre are high density, and cells with a single hotspot
+    in range are thresholded on its distance. Only cells where several
+    hotspots overlap need the first-match rule, which is resolved with a
+    ball query restricted to those cells.
+
+    Args:
+        xs, ys: Cell coordinates (1-D arrays)
+        hotspots: Hotspots of the cells' region, in priority order
+
+    Returns:
+        np.ndarray: Density codes (DENSITY_CODES)
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    codes = np.full(len(xs), DENSITY_CODES[config.LOW], dtype=np.int8)
+    if len(xs) == 0 or len(hotspots) == 0:
+        return codes
+
+    hs = np.asarray(hotspots, dtype=np.float64).reshape(-1, 2)
+    cells = np.column_stack([xs, ys])
+    tree = cKDTree(hs)
+
+    # Upper bound nudged so cells exactly at MEDIUM_RADIUS are kept
+    reach = np.nextafter(float(MEDIUM_RADIUS), np.inf)
+    k = min(2, len(hs))
+    dist, idx = tree.query(cells, k=k, distance_upper_bound=reach)
+    if k == 1:
+        dist = dist[:, None]
+        idx = idx[:, None]
+
+    in_range = np.isfinite(dist[:, 0])
+    overlap = in_range & np.isfinite(dist[:, -1]) if k == 2 else np.zeros(len(xs), dtype=bool)
+
+    # First hotspot (in list order) within range of each cell
+    first = np.where(in_range, idx[:, 0], -1)
+    for i in np.flatnonzero(overlap):
+        first[i] = min(tree.query_ball_point(cells[i], reach))
+
+    # Distance to the deciding hotspot, thresholded at the two radii
+    cand = np.flatnonzero(first >= 0)
+    dx = xs[cand] - hs[first[cand], 0]
+    dy = ys[cand] - hs[first[cand], 1]
+    distance = (dx**2 + dy**2)**0.5
+    high = distance <= HIGH_RADIUS
+    medium = ~high & (distance <= MEDIUM_RADIUS)
+    codes[cand[high]] = DENSITY_CODES[config.HIGH]
+    codes[cand[medium]] = DENSITY_CODES[config.MEDIUM]
+
+    # Hotspot centres are always high density
+    codes[in_range & (dist[:, 0] == 0)] = DENSITY_CODES[config.HIGH]
+
+    return codes
+
+
+def build_landscape(width, height, regions, hotspots, capacities, key=None):
+    """
+    Compute the landscape raster.
+
+    Args:
+        width, height: Grid dimensions
+        regions: {name: [[x0, x1], [y0, y1]]} for A, B, C, D and LAND
+        hotspots: {region: [[x, y], ...]} for A, B, C, D
+        capacities: {density level: carrying capacity}
+        key: Precomputed landscape key (optional)
+
+    Returns:
+        Landscape
+    """
+    if key is None:
+        key = landscape_key(width, height, regions, hotspots, capacities)
+
+    xs, ys = np.meshgrid(np.arange(width), np.arange(height), indexing="ij")
+    xs = xs.ravel()
+    ys = ys.ravel()
+
+    # Regions: first matching boundary wins (A, B, C, D, then LAND)
+    region_id = np.full(width * height, REGION_CODES["NULL"], dtype=np.int8)
+    for name in reversed(FISHING_REGIONS + ("LAND",)):
+        (x0, x1), (y0, y1) = regions[name]
+        inside = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        region_id[inside] = REGION_CODES[name]
+
+    # Density levels (land and NULL cells have none)
+    density_id = np.zeros(width * height, dtype=np.int8)
+    for name in FISHING_REGIONS:
+        cells = np.flatnonzero(region_id == REGION_CODES[name])
+        density_id[cells] = classify_density(xs[cells], ys[cells], hotspots[name])
+
+    # Carrying capacity from density level
+    capacity_by_code = np.zeros(len(DENSITY_CODES), dtype=np.int64)
+    for level, capacity in capacities.items():
+        capacity_by_code[DENSITY_CODES[level]] = capacity
+    carrying_capacity = capacity_by_code[density_id]
+
+    return Landscape(key, width, height, region_id, density_id, carrying_capacity)
+
+
+def get_landscape(width, height, regions, hotspots, capacities, cache_dir=None):
+    """
+    Get the landscape raster, building it only if it is not cached.
+
+    Looks up the in-process memo first, then the on-disk cache (if
+    cache_dir is given), and stores newly built rasters in both.
+
+    Args:
+        width, height: Grid dimensions
+        regions: {name: [[x0, x1], [y0, y1]]} for A, B, C, D and LAND
+        hotspots: {region: [[x, y], ...]} for A, B, C, D
+        capacities: {density level: carrying capacity}
+        cache_dir: Directory of the on-disk cache (None = in-memory only)
+
+    Returns:
+        Landscape
+    """
+    key = landscape_key(width, height, regions, hotspots, capacities)
+
+    landscape = _LANDSCAPE_CACHE.get(key)
+    if landscape is not None:
+        return landscape
+
+    cache_path = os.path.join(cache_dir, f"landscape_{key}.npz") if cache_dir else None
+
+    if cache_path and os.path.exists(cache_path):
+        with np.load(cache_path) as data:
+            landscape = Landscape(
+                key, width, height,
+                data["region_id"], data["density_id"], data["carrying_capacity"]
+            )
+    else:
+        landscape = build_landscape(width, height, regions, hotspots, capacities, key=key)
+        if cache_path:
+            _save_landscape(landscape, cache_path)
+
+    _LANDSCAPE_CACHE[key] = landscape
+    return landscape
+
+
+def _save_landscape(landscape, cache_path):
+    """Write a landscape to the on-disk cache (atomically)"""
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(
+        tmp_path,
+        region_id=landscape.region_id,
+        density_id=landscape.density_id,
+        carrying_capacity=landscape.carrying_capacity,
+    )
+    os.replace(tmp_path, cache_path)
+
+
+def clear_landscape_cache():
+    """Drop the in-process landscape memo"""
+    _LANDSCAPE_CACHE.clear()
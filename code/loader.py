@@ -4,6 +4,7 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional
 from . import config as default_config
+from .params import FibeParams, MODEL_ALIASES
  
 class ConfigLoader:
     """Load and validate experiment configuration from JSON files"""
@@ -100,13 +101,24 @@ class ConfigLoader:
             "simulation": {
                 "verbose": True,
                 "random_seed": None,
-                "repetitions": 1
+                "repetitions": 1,
+                "stock_check_interval": 0,
+                "checkpoint_interval_years": 0
             },
             "output": {
                 "export_data": True,
                 "filename_prefix": "fibe_output",
                 "save_final_state": False,
-                "export_yearly_only": False
+                "export_yearly_only": False,
+                "model_collection": None,
+                "agent_collection": None,
+                "stream_export": False,
+                "flush_interval_days": 365,
+                "export_format": "auto",
+                "checkpoint_dir": None,
+                "cache_results": False,
+                "cache_dir": None,
+                "profile": False
             },
             "parameters": {}
         }
@@ -133,15 +145,47 @@ class ConfigLoader:
             raise ValueError("No configuration loaded. Call load() first.")
         
         config = self.loaded_config
+        model_collection, agent_collection = self._collection_cadences(config["output"])
         
         return{
             "end_of_sim": config["simulation"]["duration_years"] * 365,
             "num_archipelago": config["agents"]["num_archipelago"],
             "num_coastal": config["agents"]["num_coastal"],
             "num_trawler": config["agents"]["num_trawler"],
-            "verbose": config["simulation"]["verbose"]
+            "verbose": config["simulation"]["verbose"],
+            "seed": config["simulation"]["random_seed"],
+            "stock_check_interval": config["simulation"]["stock_check_interval"],
+            "model_collection": model_collection,
+            "agent_collection": agent_collection
         }
     
+    def _collection_cadences(self, output):
+        """
+        Resolve the model-level and agent-level collection cadences.
+        
+        Explicit "model_collection" / "agent_collection" entries win.
+        Otherwise "export_yearly_only" collects both levels yearly, and
+        "export_interval_years" collects agent data every N years.
+        
+        Args:
+            output: Output section of the configuration
+            
+        Returns:
+            Tuple (model_collection, agent_collection), None = model default
+        """
+        model_collection = output.get("model_collection")
+        agent_collection = output.get("agent_collection")
+        
+        if output.get("export_yearly_only"):
+            if model_collection is None:
+                model_collection = "yearly"
+            if agent_collection is None:
+                agent_collection = "yearly"
+        elif output.get("export_interval_years") and agent_collection is None:
+            agent_collection = output["export_interval_years"] * default_config.YEAR
+            
+        return model_collection, agent_collection
+    
     def get_output_params(self):
         """Get output configuration parameters"""
         if self.loaded_config is None:
@@ -156,32 +200,69 @@ class ConfigLoader:
         
         return self.loaded_config["metadata"]
     
-    def apply_custom_parameters(self, model):
+    def get_parameter_overrides(self):
         """
-        Apply custom parameter overrides to model.
+        Model attribute overrides from the "parameters" section.
         
-        Args:
-            model: FisheryModel instance
+        Returns:
+            Dict mapping FisheryModel attribute names to values
         """
         if self.loaded_config is None or "parameters" not in self.loaded_config:
-            return
+            return {}
         
         params = self.loaded_config["parameters"]
+        overrides = {}
         
         if "fish_dynamics" in params:
             fish_params = params["fish_dynamics"]
             if "growth_rate" in fish_params:
-                model.GROWTH_RATE = fish_params["growth_rate"]
+                overrides["GROWTH_RATE"] = fish_params["growth_rate"]
                 
         if "economics" in params:
             eco_params = params["economics"]
             if "fish_price" in eco_params:
-                model.FISH_PRICE = eco_params["fish_price"]
+                overrides["FISH_PRICE"] = eco_params["fish_price"]
                 
         if "weather" in params:
             weather_params = params["weather"]
             if "bad_weather_probability" in weather_params:
-                model.bad_weather_probability = weather_params["bad_weather_probability"]
+                overrides["bad_weather_probability"] = weather_params["bad_weather_probability"]
+        
+        # Any other model parameter, by its config.py name
+        if "constants" in params:
+            overrides.update(params["constants"])
+        
+        return overrides
+    
+    def get_params(self):
+        """
+        Model parameters of the run: config.py defaults plus the
+        "parameters" section.
+        
+        Returns:
+            FibeParams
+            
+        Raises:
+            ValueError: If the "constants" section names an unknown parameter
+        """
+        overrides = {
+            MODEL_ALIASES.get(attribute, attribute): value
+            for attribute, value in self.get_parameter_overrides().items()
+        }
+        return FibeParams.from_config(**overrides)
+    
+    def apply_custom_parameters(self, model):
+        """
+        Apply custom parameter overrides to model.
+        
+        Args:
+            model: FisheryModel instance
+        """
+        overrides = {
+            MODEL_ALIASES.get(attribute, attribute): value
+            for attribute, value in self.get_parameter_overrides().items()
+        }
+        model.params = model.params.replace(**overrides)
                 
     def save_config(self, output_path):
         """
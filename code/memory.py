@@ -0,0 +1,464 @@
+"""
+Trip memory of the FIBE fishers.
+
+TripMemory is a fixed-capacity ring buffer of trip records (catch, cost,
+profit, region, tick, went_fishing), stored column by column. Alongside the
+records it keeps running sums over the most recent trips for a set of
+windows (the MEMORY_*_WINDOW parameters), updated as trips are added and
+drop out, so the daily perception and satisfaction updates read them in
+constant time whatever the memory size.
+
+Running sums are exact: values are accumulated as integers in fixed point
+with 2**-1074 resolution (every float is a whole number of such units), so
+adding and removing trips never drifts and a window sum or mean is the
+correctly rounded value of the exact one, as statistics.mean computes it.
+Per-region catch means (the catch estimates of the coastal and trawler
+decisions) are cached until a trip to that region is added or forgotten.
+
+SpotMemory is the spatial memory of the good fishing spots: the visited
+cells with their running average catch, partitioned by region (looked up
+once, when a cell is first visited) and kept ranked by average catch as
+visits update it, so the good spots of a region are read in O(k). A
+min-heap on the last visit (stale entries are skipped when popped) lets
+old spots be forgotten in O(expired log n) rather than by a full scan.
+"""
+
+import bisect
+import heapq
+from collections.abc import Mapping
+
+from .patches import REGION_CODES, REGION_NAMES
+
+# Fixed-point unit of the running sums: the smallest float is 2**-1074
+_FRACTION_BITS = 1074
+_ONE = 1 << _FRACTION_BITS
+
+_NO_REGION = -1
+
+# Keys of the trip records
+RECORD_KEYS = ("catch", "cost", "profit", "region", "tick", "went_fishing")
+
+
+def _fixed(value):
+    """Exact fixed-point value of a number"""
+    if isinstance(value, int):
+        return value << _FRACTION_BITS
+    numerator, denominator = float(value).as_integer_ratio()
+    return numerator << (_FRACTION_BITS + 1 - denominator.bit_length())
+
+
+class TripMemory:
+    """
+    Last trips of a fisher, oldest first.
+
+    Records read back as dicts with the RECORD_KEYS keys ("region" is the
+    region name, or None for days at home).
+
+    Usage:
+        memory = TripMemory(capacity=10, windows=(5, 7, 10, 14))
+        memory.append(catch=12, cost=3.5, profit=8.5, region="A", tick=4)
+        memory.catch_sum(7)          # catches of the last 7 trips
+        memory.profit_mean(7, skip=7)   # mean profit of the 7 trips before those
+    """
+
+    def __init__(self, capacity, windows=()):
+        """
+        Args:
+            capacity: Maximum number of trips remembered
+            windows: Window sizes (in trips) with running sums; other
+                windows are summed on demand
+        """
+        self.capacity = max(0, int(capacity))
+        self.windows = tuple(sorted({int(n) for n in windows if n > 0}))
+        self.clear()
+
+    def clear(self):
+        """Forget every trip"""
+        capacity = self.capacity
+        self._catch = [0] * capacity
+        self._cost = [0] * capacity
+        self._profit = [0] * capacity
+        self._region = [_NO_REGION] * capacity
+        self._tick = [None] * capacity
+        self._went_fishing = [True] * capacity
+        self._start = 0
+        self._len = 0
+        # window -> [catch, profit, catch when fishing, trips fishing, trips with a profit]
+        self._sums = {n: [0, 0, 0, 0, 0] for n in self.windows}
+        # region code -> {n: region_catch_mean}
+        self._region_means = {}
+
+    def resize(self, capacity):
+        """Change the capacity, keeping the most recent trips"""
+        records = list(self)[-capacity:] if capacity > 0 else []
+        self.capacity = max(0, int(capacity))
+        self.clear()
+        for record in records:
+            self.append_record(record)
+
+    # ----- Adding trips -----
+
+    def append(self, catch, cost, profit, region=None, tick=None, went_fishing=True):
+        """Remember a trip (the oldest one is forgotten when the memory is full)"""
+        capacity = self.capacity
+        if capacity == 0:
+            return
+        region_code = _NO_REGION if region is None else REGION_CODES[region]
+        went_fishing = bool(went_fishing)
+        new = _contributions(catch, profit, went_fishing)
+
+        length = self._len
+        for n, sums in self._sums.items():
+            size = n if n < capacity else capacity
+            if length >= size:
+                # The trip leaving the window
+                i = (self._start + length - size) % capacity
+                old = _contributions(self._catch[i], self._profit[i], self._went_fishing[i])
+                for k in range(5):
+                    sums[k] += new[k] - old[k]
+            else:
+                for k in range(5):
+                    sums[k] += new[k]
+
+        region_means = self._region_means
+        region_means.pop(region_code, None)
+        if length == capacity:
+            i = self._start
+            self._start = (i + 1) % capacity
+            region_means.pop(self._region[i], None)
+        else:
+            i = (self._start + length) % capacity
+            self._len = length + 1
+        self._catch[i] = catch
+        self._cost[i] = cost
+        self._profit[i] = profit
+        self._region[i] = region_code
+        self._tick[i] = tick
+        self._went_fishing[i] = went_fishing
+
+    def append_record(self, record):
+        """Remember a trip given as a dict (see FisherAgent.update_memory)"""
+        self.append(
+            record.get("catch", 0),
+            record.get("cost", 0),
+            record.get("profit", 0),
+            record.get("region"),
+            record.get("tick"),
+            record.get("went_fishing", True),
+        )
+
+    # ----- Window statistics -----
+
+    def count(self, n, skip=0):
+        """Number of trips among the n most recent, leaving out the skip most recent"""
+        return max(0, min(n, self._len) - min(skip, self._len))
+
+    def catch_sum(self, n, skip=0):
+        """Total catch of the n most recent trips, leaving out the skip most recent"""
+        return self._window(n, skip)[0] / _ONE
+
+    def catch_mean(self, n, skip=0):
+        """Mean catch of a window (None if empty)"""
+        return _mean(self._window(n, skip)[0], self.count(n, skip))
+
+    def profit_sum(self, n, skip=0):
+        """Total profit of a window"""
+        return self._window(n, skip)[1] / _ONE
+
+    def profit_mean(self, n, skip=0):
+        """Mean profit of a window (None if empty)"""
+        return _mean(self._window(n, skip)[1], self.count(n, skip))
+
+    def fishing_count(self, n, skip=0):
+        """Number of days out fishing in a window"""
+        return self._window(n, skip)[3]
+
+    def fishing_catch_mean(self, n, skip=0):
+        """Mean catch of the days out fishing in a window (None if none)"""
+        sums = self._window(n, skip)
+        return _mean(sums[2], sums[3])
+
+    def profit_count(self, n, skip=0):
+        """Number of trips with a non-zero profit in a window"""
+        return self._window(n, skip)[4]
+
+    def region_catch_mean(self, region, n):
+        """
+        Mean catch of the n most recent trips to a region.
+
+        Returns:
+            float, or None if no trip to that region is remembered
+        """
+        code = REGION_CODES[region]
+        means = self._region_means.setdefault(code, {})
+        if n not in means:
+            means[n] = self._scan_region_catch_mean(code, n)
+        return means[n]
+
+    def _scan_region_catch_mean(self, code, n):
+        capacity = self.capacity
+        total = 0
+        found = 0
+        for offset in range(self._len - 1, -1, -1):
+            i = (self._start + offset) % capacity
+            if self._region[i] == code:
+                total += _fixed(self._catch[i])
+                found += 1
+                if found == n:
+                    break
+        return _mean(total, found)
+
+    def _window(self, n, skip):
+        if skip >= n:
+            return [0, 0, 0, 0, 0]
+        sums = self._sums_of(n)
+        if skip <= 0:
+            return sums
+        skipped = self._sums_of(skip)
+        return [a - b for a, b in zip(sums, skipped)]
+
+    def _sums_of(self, n):
+        sums = self._sums.get(n)
+        if sums is not None:
+            return sums
+        # Window without running sums
+        sums = [0, 0, 0, 0, 0]
+        capacity = self.capacity
+        for offset in range(max(0, self._len - n), self._len):
+            i = (self._start + offset) % capacity
+            for k, value in enumerate(_contributions(self._catch[i], self._profit[i], self._went_fishing[i])):
+                sums[k] += value
+        return sums
+
+    # ----- Records -----
+
+    def __len__(self):
+        return self._len
+
+    def __bool__(self):
+        return self._len > 0
+
+    def _record(self, i):
+        region = self._region[i]
+        return {
+            "catch": self._catch[i],
+            "cost": self._cost[i],
+            "profit": self._profit[i],
+            "region": None if region == _NO_REGION else REGION_NAMES[region],
+            "tick": self._tick[i],
+            "went_fishing": self._went_fishing[i],
+        }
+
+    def __iter__(self):
+        for offset in range(self._len):
+            yield self._record((self._start + offset) % self.capacity)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("trip memory index out of range")
+        return self._record((self._start + index) % self.capacity)
+
+    def __eq__(self, other):
+        if not isinstance(other, TripMemory):
+            return NotImplemented
+        return self.capacity == other.capacity and list(self) == list(other)
+
+    def __repr__(self):
+        return f"TripMemory({self._len}/{self.capacity} trips)"
+
+
+class SpotMemory(Mapping):
+    """
+    Visited fishing spots: location -> {'avg_catch', 'visits', 'last_visit',
+    'efficiency', 'is_good'}, in first-visit order.
+
+    Good spots are kept per region in lists sorted by decreasing average
+    catch (ties in first-visit order). Spot dicts must be changed through
+    visit() or item assignment, so the ranking and the expiry heap follow.
+    """
+
+    def __init__(self, region_of):
+        """
+        Args:
+            region_of: Function location -> region name (None outside the
+                grid; such spots belong to every region)
+        """
+        self._region_of = region_of
+        self.clear()
+
+    def clear(self):
+        """Forget every spot"""
+        self._spots = {}
+        self._region = {}        # location -> region
+        self._order = {}         # location -> first-visit number (tie-break)
+        self._next_order = 0
+        self._ranked = {}        # region -> sorted [(-avg_catch, order, location)] of good spots
+        self._expiry = []        # heap of (last_visit, order, location), stale entries included
+
+    def visit(self, location, catch, efficiency, tick, threshold):
+        """
+        Record a fishing day at a spot.
+
+        Args:
+            location: (x, y) tuple
+            catch: Catch of the day
+            efficiency: Catch relative to the expected catch
+            tick: Model step of the visit
+            threshold: Efficiency from which the spot is good
+        """
+        spot = self._spots.get(location)
+        if spot is not None:
+            self._unrank(location, spot)
+            total_visits = spot['visits']
+            spot['avg_catch'] = (spot['avg_catch'] * total_visits + catch) / (total_visits + 1)
+            spot['visits'] += 1
+            spot['last_visit'] = tick
+            spot['efficiency'] = efficiency
+        else:
+            spot = {
+                'avg_catch': catch,
+                'visits': 1,
+                'last_visit': tick,
+                'efficiency': efficiency
+            }
+            self._add(location, spot)
+
+        # Mark as "good" if efficiency exceeds threshold
+        spot['is_good'] = efficiency >= threshold
+        self._rank(location, spot)
+        self._push_expiry(location, spot)
+
+    def good_spots(self, region=None, min_visits=1):
+        """
+        Good spots sorted by decreasing average catch.
+
+        Args:
+            region: Region filter (None = every region)
+            min_visits: Minimum number of visits
+
+        Returns:
+            list: (location, spot dict) tuples
+        """
+        if region:
+            lists = [self._ranked.get(region, ()), self._ranked.get(None, ())]
+        else:
+            lists = list(self._ranked.values())
+        lists = [ranked for ranked in lists if ranked]
+        entries = lists[0] if len(lists) == 1 else heapq.merge(*lists)
+        spots = self._spots
+        return [
+            (location, spots[location]) for _, _, location in entries
+            if spots[location]['visits'] >= min_visits
+        ]
+
+    def forget_before(self, tick):
+        """
+        Forget the spots last visited before a tick.
+
+        Args:
+            tick: Oldest last visit kept
+
+        Returns:
+            list: Forgotten locations, oldest visit first
+        """
+        expiry = self._expiry
+        forgotten = []
+        while expiry and expiry[0][0] < tick:
+            last_visit, order, location = heapq.heappop(expiry)
+            spot = self._spots.get(location)
+            # Skip entries of spots revisited, replaced or already forgotten
+            if spot is None or self._order[location] != order or spot['last_visit'] != last_visit:
+                continue
+            del self[location]
+            forgotten.append(location)
+        return forgotten
+
+    def region(self, location):
+        """Region of a remembered spot"""
+        return self._region[location]
+
+    def _add(self, location, spot):
+        self._spots[location] = spot
+        self._region[location] = self._region_of(location)
+        self._order[location] = self._next_order
+        self._next_order += 1
+
+    def _rank(self, location, spot):
+        if spot.get('is_good', False):
+            ranked = self._ranked.setdefault(self._region[location], [])
+            bisect.insort(ranked, (-spot['avg_catch'], self._order[location], location))
+
+    def _push_expiry(self, location, spot):
+        expiry = self._expiry
+        heapq.heappush(expiry, (spot['last_visit'], self._order[location], location))
+        if len(expiry) > 2 * len(self._spots) + 32:
+            # Drop the stale entries
+            expiry[:] = [
+                (s['last_visit'], self._order[loc], loc) for loc, s in self._spots.items()
+            ]
+            heapq.heapify(expiry)
+
+    def _unrank(self, location, spot):
+        if spot.get('is_good', False):
+            region = self._region[location]
+            ranked = self._ranked[region]
+            del ranked[bisect.bisect_left(ranked, (-spot['avg_catch'], self._order[location]))]
+            if not ranked:
+                del self._ranked[region]
+
+    # ----- Mapping -----
+
+    def __getitem__(self, location):
+        return self._spots[location]
+
+    def __setitem__(self, location, spot):
+        old = self._spots.get(location)
+        if old is not None:
+            self._unrank(location, old)
+            self._spots[location] = spot
+        else:
+            self._add(location, spot)
+        self._rank(location, spot)
+        self._push_expiry(location, spot)
+
+    def __delitem__(self, location):
+        self._unrank(location, self._spots.pop(location))
+        del self._region[location]
+        del self._order[location]
+
+    def __iter__(self):
+        return iter(self._spots)
+
+    def __len__(self):
+        return len(self._spots)
+
+    def __eq__(self, other):
+        if isinstance(other, SpotMemory):
+            return self._spots == other._spots
+        return self._spots == other
+
+    def __repr__(self):
+        return f"SpotMemory({len(self._spots)} spots)"
+
+
+def _contributions(catch, profit, went_fishing):
+    """Running-sum terms of a trip"""
+    catch = _fixed(catch)
+    return (
+        catch,
+        _fixed(profit),
+        catch if went_fishing else 0,
+        1 if went_fishing else 0,
+        1 if profit != 0 else 0,
+    )
+
+
+def _mean(total, count):
+    """Correctly rounded mean of a fixed-point total"""
+    if count == 0:
+        return None
+    return total / (_ONE * count)
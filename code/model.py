@@ -1,19 +1,45 @@
 from mesa import Model
 from mesa.space import MultiGrid
-from mesa.datacollection import DataCollector
 from .agent import FisherAgent
+from .collector import FisheryDataCollector, cadence_interval
+from .patches import PatchField, DENSITY_LEVELS, FISHING_REGIONS
+from .fleet_index import FleetIndex
+from .scheduler import ActivationScheduler
+from .landscape import get_landscape, classify_cell_density
+from .rng import RandomStreams
+from .params import FibeParams, PARAMETER_NAMES, MODEL_ALIASES
+from .export import export_tables
+from . import checkpoint
 from . import config
-import random
-import pandas as pd
-from datetime import datetime
 import os
 
 class FisheryModel(Model):
-    def __init__(self, end_of_sim, num_archipelago, num_coastal, num_trawler, verbose=True):
-        super().__init__()
+    def __init__(self, end_of_sim, num_archipelago, num_coastal, num_trawler, verbose=True,
+                 stock_check_interval=None, model_collection=None, agent_collection=None,
+                 seed=None, per_agent_streams=None, params=None):
+        # Seeded random streams (weather, agent init, decisions); see rng.py
+        if per_agent_streams is None:
+            per_agent_streams = config.RNG_PER_AGENT_STREAMS
+        self.rng_streams = RandomStreams(seed, per_agent=per_agent_streams)
+        self.seed = self.rng_streams.seed
+        
+        super().__init__(rng=self.rng_streams.mesa_seed)
         
         self.verbose = verbose
         
+        # Debug: cross-check stock accumulators every N days (0 = off)
+        if stock_check_interval is None:
+            stock_check_interval = config.STOCK_CHECK_INTERVAL
+        self.stock_check_interval = stock_check_interval
+
+        # Data collection cadences ("daily", "weekly", "monthly", "yearly" or days)
+        if model_collection is None:
+            model_collection = config.MODEL_COLLECTION_CADENCE
+        if agent_collection is None:
+            agent_collection = config.AGENT_COLLECTION_CADENCE
+        self.model_collection_interval = cadence_interval(model_collection)
+        self.agent_collection_interval = cadence_interval(agent_collection)
+        
         self.current_step = 0
         self.end_of_sim = end_of_sim
 
@@ -21,159 +47,46 @@ class FisheryModel(Model):
         self.num_coastal = num_coastal
         self.num_trawler = num_trawler
 
-        # Define time constants
-        self.WEEK = config.WEEK
-        self.MONTH = config.MONTH
-        self.SEASON = config.SEASON
-        self.HALFYEAR = config.HALFYEAR
-        self.YEAR = config.YEAR
+        # Model parameters, shared read-only with the agents (see params.py).
+        # Every parameter can also be read as a model attribute (self.YEAR,
+        # self.FISH_PRICE, ...); setting one swaps in an updated copy.
+        self.params = params if params is not None else FibeParams.from_config()
         
         # Weather tracking
         self.bad_weather = False
-        self.bad_weather_probability = config.BAD_WEATHER_PROBABILITY
-
-        # Define spatial constants
-        self.REGION_A = config.REGION_A
-        self.REGION_B = config.REGION_B
-        self.REGION_C = config.REGION_C
-        self.REGION_D = config.REGION_D
-        self.LAND = config.LAND
-
-        # Define level labels
-        self.LOW = config.LOW
-        self.MEDIUM = config.MEDIUM
-        self.HIGH = config.HIGH
-        self.MEDIUM_HIGH = config.MEDIUM_HIGH
-        self.LOW_MEDIUM = config.LOW_MEDIUM
-
-        # Define cost existence values
-        self.LOW_COST_EXISTENCE = config.ARCHIPELAGO_COST_EXISTENCE # archepelago
-        self.MEDIUM_COST_EXISTENCE = config.COASTAL_COST_EXISTENCE # coastal
-        self.HIGH_COST_EXISTENCE = config.TRAWLER_COST_EXISTENCE # trawler
-
-        # Define activity cost
-        self.LOW_COST_ACTIVITY = config.ARCHIPELAGO_COST_ACTIVITY # small equipment
-        self.MEDIUM_COST_ACTIVITY = config.COASTAL_COST_ACTIVITY # medium equipment
-        self.HIGH_COST_ACTIVITY = config.TRAWLER_COST_ACTIVITY # industrial equipment
-
-        # Define travel cost
-        self.LOW_COST_TRAVEL = config.LOW_COST_TRAVEL # go to region A
-        self.MEDIUM_COST_TRAVEL = config.MEDIUM_COST_TRAVEL # go to region B
-        self.MEDIUM_COST_TRAVEL_BIGVESSEL = config.MEDIUM_COST_TRAVEL_BIGVESSEL # go to region B with trawler
-        self.HIGH_COST_TRAVEL = config.HIGH_COST_TRAVEL # go to region C or D
-        # self.COST_TRAVEL_B2C = 10.0 # go from region B to C
-        # self.COST_TRAVEL_C2D = 10.0 # go from region C to D
-        # self.COST_TRAVEL_B2D = 15.0 # go from region B to D
 
-        # Define carring capacity
-        self.LOW_CARRYING_CAPACITY = config.LOW_CARRYING_CAPACITY # poor patch
-        self.MEDIUM_CARRYING_CAPACITY = config.MEDIUM_CARRYING_CAPACITY # medium patch
-        self.HIGH_CARRYING_CAPACITY = config.HIGH_CARRYING_CAPACITY # rich patch
-        self.CARRYING_CAPACITY_A = config.CARRYING_CAPACITY_A_INITIAL # capacity region A
-        self.CARRYING_CAPACITY_B = config.CARRYING_CAPACITY_B_INITIAL # capacity region B
-        self.CARRYING_CAPACITY_C = config.CARRYING_CAPACITY_C_INITIAL # capacity region C
-        self.CARRYING_CAPACITY_D = config.CARRYING_CAPACITY_D_INITIAL # capacity region D
-
-        # Define MSY (Maximum Sustainable Yield)
+        # Regional carrying capacities and MSY (recalculated from the patches)
+        self.CARRYING_CAPACITY_A = self.params.CARRYING_CAPACITY_A_INITIAL # capacity region A
+        self.CARRYING_CAPACITY_B = self.params.CARRYING_CAPACITY_B_INITIAL # capacity region B
+        self.CARRYING_CAPACITY_C = self.params.CARRYING_CAPACITY_C_INITIAL # capacity region C
+        self.CARRYING_CAPACITY_D = self.params.CARRYING_CAPACITY_D_INITIAL # capacity region D
         self.MSY_STOCK_A = config.get_msy_stock(self.CARRYING_CAPACITY_A)
         self.MSY_STOCK_B = config.get_msy_stock(self.CARRYING_CAPACITY_B)
         self.MSY_STOCK_C = config.get_msy_stock(self.CARRYING_CAPACITY_C)
         self.MSY_STOCK_D = config.get_msy_stock(self.CARRYING_CAPACITY_D)
-
-        # Define daily catchability
-        self.CATCHABILITY_ARCHEPELAGO = config.ARCHIPELAGO_CATCHABILITY # archepelago
-        self.CATCHABILITY_COASTAL = config.COASTAL_CATCHABILITY # coastal
-        self.CATCHABILITY_TRAWLER = config.TRAWLER_CATCHABILITY # trawler
-
-        # Define patchs 
-        self.HOTSPOTS_A = config.HOTSPOTS_A # high density spots in region A
-        self.HOTSPOTS_B = config.HOTSPOTS_B # high density spots in region B
-        self.HOTSPOTS_C = config.HOTSPOTS_C # high density spots in region C
-        self.HOTSPOTS_D = config.HOTSPOTS_D # high density spots in region D
-
-        # Define growth rate
-        self.GROWTH_RATE = config.GROWTH_RATE # 10% per year
-        
-        self.FISH_PRICE = config.FISH_PRICE
         
         # Initialize spatial grid(50x56)
-        self.grid = MultiGrid(config.GRID_WIDTH, config.GRID_HEIGHT, torus=False)
+        self.grid = MultiGrid(self.GRID_WIDTH, self.GRID_HEIGHT, torus=False)
 
         # Initialize patches with fish stocks
         self.init_patches()
         
         self._recalculate_regional_capacities()
         
+        # Who is where, kept up to date by the fishers (see fleet_index.py)
+        self.fleet_index = FleetIndex()
+        
+        # Fishers laying low, left out of the agent loop during run_model
+        # and only brought up to date when they are read (see scheduler.py)
+        self.scheduler = ActivationScheduler()
+        self._lazy_agents = False
+        
+        # Archipelago decisions taken for the whole fleet before the agent loop
+        self.batch_decisions = config.BATCH_ARCHIPELAGO_DECISIONS
+        
         self._create_agents()
-        # Data collector
-        self.datacollector = DataCollector(
-            model_reporters={
-                # Fish stocks
-                "stock_A": lambda m: m.get_region_stock("A"),
-                "stock_B": lambda m: m.get_region_stock("B"),
-                "stock_C": lambda m: m.get_region_stock("C"),
-                "stock_D": lambda m: m.get_region_stock("D"),
-                "total_stock": lambda m: m.get_total_stock(),
-                "stock_below_MSY_A": lambda m: 1 if m.get_region_stock("A") < m.MSY_STOCK_A else 0,
-                "stock_below_MSY_B": lambda m: 1 if m.get_region_stock("B") < m.MSY_STOCK_B else 0,
-                "stock_below_MSY_C": lambda m: 1 if m.get_region_stock("C") < m.MSY_STOCK_C else 0,
-                "stock_below_MSY_D": lambda m: 1 if m.get_region_stock("D") < m.MSY_STOCK_D else 0,
-                
-                # Agent counts
-                "num_agents": lambda m: len(list(m.agents)),
-                "num_archipelago": lambda m: sum(1 for a in m.agents if a.fisher_type == "archipelago"),
-                "num_coastal": lambda m: sum(1 for a in m.agents if a.fisher_type == "coastal"),
-                "num_trawler": lambda m: sum(1 for a in m.agents if a.fisher_type == "trawler"),
-                "num_fishing": lambda m: sum(1 for a in m.agents if a.gone_fishing),
-                "num_at_home": lambda m: sum(1 for a in m.agents if a.at_home),
-                "num_bankrupt": lambda m: sum(1 for a in m.agents if a.bankrupt),
-                
-                # Catches
-                "total_catch_daily": lambda m: sum(a.accumulated_catch for a in m.agents),
-                "total_catch_cumulative": lambda m: sum(a.total_catch for a in m.agents),
-                "total_catch": lambda m: m.get_total_catch_all_agents(),
-                "avg_catch_per_agent": lambda m: m._safe_mean([a.total_catch for a in m.agents]),
-                "catch_region_A": lambda m: sum(a.accumulated_catch for a in m.agents if a.current_region == "A"),
-                "catch_region_B": lambda m: sum(a.accumulated_catch for a in m.agents if a.current_region == "B"),
-                "catch_region_C": lambda m: sum(a.accumulated_catch for a in m.agents if a.current_region == "C"),
-                "catch_region_D": lambda m: sum(a.accumulated_catch for a in m.agents if a.current_region == "D"),
-                
-                # Economic metrics
-                "total_capital": lambda m: sum(a.capital for a in m.agents),
-                "avg_capital": lambda m: m._safe_mean([a.capital for a in m.agents]),
-                "median_capital": lambda m: m._safe_median([a.capital for a in m.agents]),
-                "min_capital": lambda m: min([a.capital for a in m.agents]) if len(list(m.agents)) > 0 else 0,
-                "max_capital": lambda m: max([a.capital for a in m.agents]) if len(list(m.agents)) > 0 else 0,
-                "total_profit": lambda m: sum(a.total_profit for a in m.agents),
-                "avg_profit": lambda m: m._safe_mean([a.total_profit for a in m.agents]),
-                "total_revenue": lambda m: sum(a.total_revenue for a in m.agents),
-                "total_costs": lambda m: sum(a.total_cost for a in m.agents),
-                
-                # Inequality
-                "gini_capital": lambda m: m.calculate_gini([a.capital for a in m.agents]),
-                "gini_wealth": lambda m: m.calculate_gini([a.wealth for a in m.agents]),
-                "gini_catch": lambda m: m.calculate_gini([a.total_catch for a in m.agents]),
-                
-                # Activity
-                "avg_days_at_sea": lambda m: m._safe_mean([a.days_at_sea for a in m.agents]),
-                "total_trips": lambda m: sum(a.profitable_trip + a.unprofitable_trip for a in m.agents),
-                "avg_success_rate": lambda m: m._safe_mean([
-                    a.profitable_trip / (a.profitable_trip + a.unprofitable_trip) 
-                    if (a.profitable_trip + a.unprofitable_trip) > 0 else 0 
-                    for a in m.agents
-                ]),
-                
-                # memory and perception
-                "avg_growth_perception": lambda m: m._safe_mean([a.growth_perception for a in m.agents]),
-                "num_perceive_scarcity": lambda m: sum(1 for a in m.agents if getattr(a, 'perceive_scarcity', False)),
-                "avg_memory_size": lambda m: m._safe_mean([len(a.memory) for a in m.agents]),
-                
-                # Weather and time
-                "bad_weather": lambda m: 1 if m.bad_weather else 0,
-                "current_step": lambda m: m.current_step,
-                "current_year": lambda m: m.current_step // m.YEAR,
-                "current_day_of_year": lambda m: m.current_step % m.YEAR,
-            },
+        # Data collector (model-level metrics come from one fused pass, see collector.py)
+        self.datacollector = FisheryDataCollector(
             agent_reporters={
                 # Identity
                 "unique_id": "unique_id",
@@ -207,10 +120,20 @@ class FisheryModel(Model):
                 # Memory
                 "memory_size": lambda a: len(a.memory),
                 "good_spots_count": lambda a: len(a.good_spots_memory),
-            }
+            },
+            expected_steps=self.end_of_sim,
+            expected_agents=num_archipelago + num_coastal + num_trawler,
+            model_interval=self.model_collection_interval,
+            agent_interval=self.agent_collection_interval
         )
         
         self.yearly_data = []
+        
+        # Optional streaming export (see attach_sink)
+        self.sink = None
+        
+        # Optional step profiler (see attach_profiler)
+        self.profiler = None
     
     def _create_agents(self):
         """Create fisher agents of different types"""
@@ -228,31 +151,68 @@ class FisheryModel(Model):
         for _ in range(self.num_trawler):
             agent = FisherAgent(agent_id, self, "trawler")
             agent_id += 1
+        
+        # Identifier of the next agent added during the run (see set_fleet_size)
+        self.next_agent_id = agent_id
+    
+    def set_fleet_size(self, fisher_type, count):
+        """
+        Add or remove fishers of one type (e.g. to change the fleet mix of
+        a scenario branching from a checkpoint).
+        
+        Removed fishers are the most recently created ones of that type;
+        new fishers start with default attributes and fresh identifiers.
+        
+        Args:
+            fisher_type: "archipelago", "coastal" or "trawler"
+            count: Number of fishers of that type after the change
+        """
+        if fisher_type not in ("archipelago", "coastal", "trawler"):
+            raise ValueError(f"Unknown fisher type '{fisher_type}'")
+        if count < 0:
+            raise ValueError("Fleet size must be non-negative")
+        
+        fleet = [a for a in self.agents if a.fisher_type == fisher_type]
+        for agent in fleet[count:]:
+            if agent.pos is not None:
+                self.grid.remove_agent(agent)
+            agent.remove()
+        for _ in range(count - len(fleet)):
+            FisherAgent(self.next_agent_id, self, fisher_type)
+            self.next_agent_id += 1
+        
+        setattr(self, f"num_{fisher_type}", count)
        
     def init_patches(self):
         """Initialize all patches with region, density, and fish stock information"""
-        # Dictionary to store patch attributes
-        self.patches = {}
-        
-        # Initialize all patches in the grid
-        for x in range(self.grid.width):
-            for y in range(self.grid.height):
-                region = self.get_region(x, y)
-                density = self.get_density(x, y, region)
-                fish_stock = self.get_initial_fish_stock(x, y, region, density)
-                carrying_capacity = self.get_carrying_capacity(region, density)
-                
-                # Store patch attributes
-                self.patches[(x, y)] = {
-                    'region' : region,
-                    'density' : density,
-                    'fish_stock' : fish_stock,
-                    'carrying_capacity' : carrying_capacity,
-                    'growth_rate' : self.GROWTH_RATE,
-                    'regen_amount' : 0,
-                    'patch_stock_after_regrowth' : fish_stock
-            
-        }
+        # Static landscape (region, density, carrying capacity), computed once
+        # per set of inputs and shared between model instances
+        self.landscape = get_landscape(
+            self.grid.width,
+            self.grid.height,
+            regions={
+                "A": self.REGION_A,
+                "B": self.REGION_B,
+                "C": self.REGION_C,
+                "D": self.REGION_D,
+                "LAND": self.LAND,
+            },
+            hotspots={
+                "A": self.HOTSPOTS_A,
+                "B": self.HOTSPOTS_B,
+                "C": self.HOTSPOTS_C,
+                "D": self.HOTSPOTS_D,
+            },
+            capacities={
+                self.LOW: self.LOW_CARRYING_CAPACITY,
+                self.MEDIUM: self.MEDIUM_CARRYING_CAPACITY,
+                self.HIGH: self.HIGH_CARRYING_CAPACITY,
+            },
+            cache_dir=config.LANDSCAPE_CACHE_DIR,
+        )
+        
+        # Columnar patch storage, every patch starting at K/2 (MSY)
+        self.patches = PatchField(self.landscape, self.GROWTH_RATE)
     
     def get_region(self, x, y):
         """Determine which region a coordinate belongs to"""
@@ -278,9 +238,7 @@ class FisheryModel(Model):
         if region == 'LAND' or region == 'NULL':
             return None
         
-        coord = [x, y]
-        
-        # Check if coordinate is a hotspot center
+        # Check the hotspots of the region
         hotspots = []
         if region == 'A':
             hotspots = self.HOTSPOTS_A
@@ -291,20 +249,7 @@ class FisheryModel(Model):
         elif region == 'D':
             hotspots = self.HOTSPOTS_D
             
-        # if this is a hotspot center, it's high density
-        if coord in hotspots:
-            return self.HIGH
-        
-        # Check the proxinmity to hotspots (within radius 3 for example)
-        for hs in hotspots:
-            distance = ((x - hs[0])**2 + (y - hs[1])**2)**0.5
-            if distance <= 1.5:
-                return self.HIGH
-            elif distance <= 3:
-                return self.MEDIUM
-            
-        # Default to LOW density
-        return self.LOW
+        return classify_cell_density(x, y, hotspots)
     
     def get_carrying_capacity(self, region, density):
         """Get carrying capacity based on region and density"""
@@ -338,15 +283,11 @@ class FisheryModel(Model):
     
     def get_region_stock(self, region_name):
         """Calculate total fish stock in a specific region"""
-        total = 0
-        for pos, patch in self.patches.items():
-            if patch['region'] == region_name:
-                total += patch['fish_stock']
-        return total
+        return self.patches.region_stock(region_name)
     
     def get_total_stock(self):
         """Calculate total fish stock across all regions"""
-        return sum(patch['fish_stock'] for patch in self.patches.values() if patch['region'] not in ["LAND", "NULL"])
+        return self.patches.total_stock()
     
     def update_fish_stock(self, time_step_days=1):
         """Update fish stocks with yearly regrowth (logistic growth)"""
@@ -363,56 +304,20 @@ class FisheryModel(Model):
             self.LOW: 1.0,
         }
 
-        growth_by_region = {"A": 0, "B": 0, "C": 0, "D": 0}
-        
-        for pos, patch in self.patches.items():
-            region = patch['region']
-            if patch['region'] not in ["LAND", "NULL"]:
-                current_stock = patch['fish_stock']
-                carrying_capacity = patch['carrying_capacity']
-                
-                factor = density_factor.get(patch['density'], 1.0)
-                regen_amount = current_stock * effective_rate * factor * (1 - current_stock / carrying_capacity)
-            
-                
-                
-                patch['regen_amount'] = regen_amount
-                growth_by_region[region] += regen_amount
-        
-        # Check regional constraints before applying growth
-        for region in ["A", "B", "C", "D"]:
-            current_regional_stock = self.get_region_stock(region)
-            regional_capacity = self.get_region_carrying_capacity(region)
-            proposed_stock = current_regional_stock + growth_by_region[region]
-            
-            if proposed_stock > regional_capacity:
-                if growth_by_region[region] > 0:
-                    scale_factor = (regional_capacity - current_regional_stock) / growth_by_region[region]
-                    scale_factor = max(0, min(1, scale_factor))
-                else:
-                    scale_factor = 0
-                    
-                for pos, patch in self.patches.items():
-                    if patch['region'] == region:
-                        patch['regen_amount'] = round(patch['regen_amount'] * scale_factor)
-                        patch['fish_stock'] = patch['fish_stock'] + patch['regen_amount']
-                        patch['patch_stock_after_regrowth'] = patch['fish_stock']
-            else:
-                for pos, patch in self.patches.items():
-                    if patch['region'] == region:
-                        patch['fish_stock'] = patch['fish_stock'] + patch['regen_amount']
-                        patch['patch_stock_after_regrowth'] = patch['fish_stock']
+        self.patches.regrow(
+            effective_rate,
+            [density_factor.get(level, 1.0) for level in DENSITY_LEVELS],
+            [self.get_region_carrying_capacity(region) for region in FISHING_REGIONS],
+        )
 
-                
     def get_patch_info(self, x, y):
         """Get information about a specific patch"""
         return self.patches.get((x, y), None)
     
-    def reduce_stock(self, x, y, catch_amount):
-        "Reduce fish stock at a specific location due to fishing"
-        if (x, y) in self.patches:
-            patch = self.patches[(x, y)]
-            patch['fish_stock'] = max(0, patch['fish_stock'] - catch_amount)
+    def get_patch_region(self, location):
+        """Region of the patch at (x, y) (None outside the grid)"""
+        patch = self.patches.get(location, None)
+        return patch['region'] if patch is not None else None
     
     def step(self):
         """
@@ -425,29 +330,64 @@ class FisheryModel(Model):
         4. (If end of year) Fish stock regeneration
         5. Check simulation end condition
         """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_step()
         
         # Determine weather
         self.determine_weather()
+        if profiler is not None:
+            profiler.lap("weather")
         
         # --- DEBUG: snapshot before fishing (monthly) ---
         if self.current_step % self.MONTH == 0:
             p = self.patches.get((7, 3), {})
             #print(f"[Before fishing] Day {self.current_step} | Patch(7,3)={p.get('fish_stock', 0):.2f} | Stock A={self.get_region_stock('A'):,.0f}")
 
-        # All agent act
-        for agent in self.agents:
-            agent.step()
+        # All agent act (except those laying low)
+        if self.batch_decisions:
+            FisherAgent.satisfice_lifestyle_batch([
+                agent for agent in self.agents
+                if agent.fisher_type == "archipelago" and agent not in self.scheduler
+            ])
+        agents = self.scheduler.active_agents(self.agents, self.current_step)
+        if profiler is not None:
+            profiler.step_agents(agents)
+        else:
+            for agent in agents:
+                agent.step()
+        
+        # Apply the days the parked fishers skipped before they are read
+        if not self._lazy_agents:
+            self.scheduler.wake_all()
+        elif self.datacollector.is_due(self) or (self.current_step + 1) % self.YEAR == 0:
+            self.scheduler.sync()
+        if profiler is not None:
+            profiler.lap("scheduler")
 
         # --- DEBUG: snapshot after fishing (monthly) ---
         if self.current_step % self.MONTH == 0:
             p = self.patches.get((7, 3), {})
             #print(f"[After fishing ] Day {self.current_step} | Patch(7,3)={p.get('fish_stock', 0):.2f} | Stock A={self.get_region_stock('A'):,.0f}")
 
-        # Collect daily data
-        self.datacollector.collect(self)
+        # Debug: verify the running stock totals against a full recount
+        if self.stock_check_interval and self.current_step % self.stock_check_interval == 0:
+            self.check_stock_accumulators()
+        if profiler is not None:
+            profiler.lap("stock_check")
+
+        # Collect data (model and agent levels on their own cadence), with the
+        # stock totals re-based on the patch-order sums after today's fishing
+        if self.datacollector.is_due(self):
+            self.patches.resync_stock_totals()
+        self.datacollector.collect_scheduled(self)
+        if profiler is not None:
+            profiler.lap("collect")
 
         # Daily regeneration
         self.update_fish_stock(time_step_days=1)
+        if profiler is not None:
+            profiler.lap("fish_stock")
 
         # --- DEBUG: snapshot after regen (monthly) ---
         if self.current_step % self.MONTH == 0:
@@ -503,12 +443,22 @@ class FisheryModel(Model):
                     if agents:
                         catch = sum(a.total_catch for a in agents)
                         print(f"  {ftype}: {len(agents)} agents, {catch} total catch")
+        if profiler is not None:
+            profiler.lap("yearly")
                 
+        # Stream collected rows to disk
+        if self.sink is not None:
+            self.sink.after_step(self)
+        if profiler is not None:
+            profiler.lap("sink")
+        
         # Check if simulation should end
         if self.current_step >= self.end_of_sim:
             self.running = False
             if self.verbose:
                 self.print_final_summary()
+        if profiler is not None:
+            profiler.end_step(self)
             
     def print_final_summary(self):
         """Print comprehensive summary at end of simulation"""
@@ -557,37 +507,64 @@ class FisheryModel(Model):
         
         print("="*80 + "\n")
         
-    def export_data(self, filename_prefix='fibe_output', directory='./results/'):
+    def attach_sink(self, sink):
         """
-        Export collected data to CSV files.
+        Stream collected data to disk during the run.
         
         Args:
-            filename_prefix: Prefix for output files
+            sink: StreamingSink (see export.py); export_data() closes it
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        directory = directory + f"{timestamp}/"
-        os.makedirs(directory, exist_ok=True)
+        self.sink = sink
         
-        # Export daily model data
-        model_df = self.datacollector.get_model_vars_dataframe()
-        model_df.to_csv(f"{os.path.join(directory, f"{filename_prefix}_model_{timestamp}.csv")}", index=False)
-        if self.verbose:
-            print(f"Exported: {filename_prefix}_model_{timestamp}.csv ({len(model_df)} rows)")
+    def attach_profiler(self, profiler):
+        """
+        Time the phases of every step.
         
-        # Export daily agent data
-        agent_df = self.datacollector.get_agent_vars_dataframe()
-        agent_df.to_csv(f"{os.path.join(directory, f"{filename_prefix}_agent_{timestamp}.csv")}", index=False)
-        if self.verbose:
-            print(f"Exported: {filename_prefix}_agents_{timestamp}.csv ({len(agent_df)} rows)")
+        Args:
+            profiler: StepProfiler (see profiler.py); export_data() writes
+                its per-year table next to the CSV files
+        """
+        self.profiler = profiler
         
-        if self.yearly_data:
-            yearly_df = pd.DataFrame(self.yearly_data)
-            yearly_df.to_csv(f"{os.path.join(directory, f"{filename_prefix}_yearly_{timestamp}.csv")}", index=False)
+    def export_data(self, filename_prefix='fibe_output', directory='./results/'):
+        """
+        Export collected data to CSV files.
+        
+        If a streaming sink is attached, the data has already been written
+        during the run: the sink is closed (final flush, yearly summary and
+        manifest) instead.
+        
+        Args:
+            filename_prefix: Prefix for output files
+            
+        Returns:
+            str: Timestamp of the output directory
+        """
+        if self.sink is not None:
+            self.sink.close(self)
             if self.verbose:
-                print(f"Exported: {filename_prefix}_yearly_{timestamp}.csv ({len(yearly_df)} rows)")
+                print(f"\n All data streamed to {self.sink.directory}")
+            timestamp = self.sink.timestamp
+            output_dir = self.sink.directory
+            filename_prefix = self.sink.filename_prefix
+        else:
+            timestamp = export_tables(
+                self.datacollector.get_model_vars_dataframe(),
+                self.datacollector.get_agent_vars_dataframe(),
+                self.yearly_data,
+                filename_prefix=filename_prefix,
+                directory=directory,
+                verbose=self.verbose
+            )
+            output_dir = os.path.join(directory, timestamp)
+        
+        if self.profiler is not None:
+            profile_file = os.path.join(output_dir, f"{filename_prefix}_profile_{timestamp}.csv")
+            self.profiler.export(profile_file)
+            if self.verbose:
+                print(f" Step profile exported to {profile_file}")
         
-        if self.verbose:
-            print(f"\n All data exported with timestamp: {timestamp}")
+        return timestamp
         
     def get_region_carrying_capacity(self, region_name):
         """Get total carrying capacity for a region"""
@@ -606,19 +583,8 @@ class FisheryModel(Model):
         Reduce fish stock at a specific locationdue to fishing.
         Returns the actual amount caught.
         """
-        if (x, y) in self.patches:
-            patch = self.patches[(x, y)]
-            current_stock = patch['fish_stock']
-            
-            # Can't catch more than available
-            actual_catch = min(catch_amount, current_stock)
-            
-            # Update stock
-            patch['fish_stock'] = max(0, current_stock - actual_catch)
-            
-            return actual_catch
-        
-        return 0
+        # Can't catch more than available
+        return self.patches.reduce(x, y, catch_amount)
     
     def validate_regional_stocks(self):
         """
@@ -642,13 +608,26 @@ class FisheryModel(Model):
                 })
         return violation
     
+    def check_stock_accumulators(self):
+        """
+        Cross-check the running regional/total stock accumulators against
+        a full recount of the patches.
+        
+        Raises:
+            RuntimeError: If an accumulator drifted beyond tolerance
+        """
+        drift = self.patches.stock_totals_drift()
+        if drift:
+            details = ", ".join(
+                f"{d['region']}: tracked={d['tracked']:,.6f} recount={d['recount']:,.6f}"
+                for d in drift
+            )
+            raise RuntimeError(f"Stock accumulators out of sync at step {self.current_step}: {details}")
+    
     def _recalculate_regional_capacities(self):
         """Recalculate regional carrying capacities based on actual patch distribution"""
         for region in ["A", "B", "C", "D"]:
-            total_capacity = 0
-            for pos, patch in self.patches.items():
-                if patch['region'] == region:
-                    total_capacity += patch['carrying_capacity']
+            total_capacity = self.patches.region_capacity(region)
             
             # Update the capacity constants with actual values
             if region == "A":
@@ -676,44 +655,104 @@ class FisheryModel(Model):
         Determine daily weather conditions (stochastic).
         Bad weather occurs with 10% probability per day.
         """
-        self.bad_weather = random.random() < self.bad_weather_probability
+        self.bad_weather = self.rng_streams.weather.random() < self.bad_weather_probability
         return self.bad_weather
     
-    def run_model(self, steps=None):
+    def run_model(self, steps=None, checkpoint_interval=None, checkpoint_dir=None):
         """
         Run the model for a specified number of steps or until end_of_sim.
         
         Args:
             steps: Number of steps to run (if None, runs until end_of_sim)
+            checkpoint_interval: Write a checkpoint every N simulated years
+                (None = config.CHECKPOINT_INTERVAL_YEARS, 0 = off)
+            checkpoint_dir: Directory of the checkpoints
+                (None = config.CHECKPOINT_DIR)
         """
         
         if steps is None:
             steps = self.end_of_sim
+        if checkpoint_interval is None:
+            checkpoint_interval = config.CHECKPOINT_INTERVAL_YEARS
+        if checkpoint_dir is None:
+            checkpoint_dir = config.CHECKPOINT_DIR
         
         if self.verbose:    
             print(f"Starting simulation for {steps} days ({steps/self.YEAR:.1f} years)")
             print(f"Agents: {self.num_archipelago} archipelago, {self.num_coastal} coastal, {self.num_trawler} trawler")
             print("=" * 60) 
             
-        for _ in range(steps):
-            self.step()
-            
-            # Print progress every month
-            if self.current_step % self.MONTH == 0:
-                month = self.current_step // self.MONTH
+        self._lazy_agents = True
+        try:
+            for _ in range(steps):
+                self.step()
+                
                 # Print progress every month
-            if self.current_step % self.MONTH == 0:
-                month = self.current_step // self.MONTH
-                patch_7_3 = self.patches.get((7, 3), {}).get('fish_stock', 0)
-                #print(f"Month {month} - Day {self.current_step} - Stock A: {self.get_region_stock('A'):,.0f} - Patch(7,3): {patch_7_3:,.2f}")
-  
-            if not self.running:
-                break
+                if self.current_step % self.MONTH == 0:
+                    month = self.current_step // self.MONTH
+                    # Print progress every month
+                if self.current_step % self.MONTH == 0:
+                    month = self.current_step // self.MONTH
+                    patch_7_3 = self.patches.get((7, 3), {}).get('fish_stock', 0)
+                    #print(f"Month {month} - Day {self.current_step} - Stock A: {self.get_region_stock('A'):,.0f} - Patch(7,3): {patch_7_3:,.2f}")
+                
+                # Periodic checkpoint (not after the last day)
+                if (checkpoint_interval and self.running
+                        and self.current_step % (checkpoint_interval * self.YEAR) == 0):
+                    self._write_periodic_checkpoint(checkpoint_dir)
+      
+                if not self.running:
+                    break
+        finally:
+            self._lazy_agents = False
+            self.scheduler.wake_all()
         
         if self.verbose:    
             print("=" * 60)
             print(f"Simulation completed after {self.current_step} days ({self.current_step/self.YEAR:.1f} years)")
 
+    def save_checkpoint(self, path):
+        """
+        Save the full model state to a checkpoint file.
+        
+        The checkpoint holds the patch stocks, every agent field and memory,
+        the yearly summaries, the collected data and the random generator
+        states, as a compressed .npz archive (see checkpoint.py).
+        
+        Args:
+            path: Checkpoint file (.npz)
+        """
+        checkpoint.save_model(self, path)
+    
+    @classmethod
+    def load_checkpoint(cls, path, verbose=None):
+        """
+        Rebuild a model from a checkpoint file.
+        
+        Args:
+            path: Checkpoint file written by save_checkpoint
+            verbose: Override the stored verbose flag
+            
+        Returns:
+            FisheryModel: Model ready to continue the run with run_model()
+        """
+        return checkpoint.load_model(cls, path, verbose=verbose)
+    
+    def _write_periodic_checkpoint(self, directory):
+        """Write a run_model checkpoint and drop the oldest ones"""
+        year = self.current_step // self.YEAR
+        path = os.path.join(directory, f"checkpoint_year{year:03d}.npz")
+        self.save_checkpoint(path)
+        if self.verbose:
+            print(f"Checkpoint written: {path}")
+        
+        written = sorted(
+            name for name in os.listdir(directory)
+            if name.startswith("checkpoint_year") and name.endswith(".npz")
+        )
+        for name in written[:-config.CHECKPOINT_KEEP] if config.CHECKPOINT_KEEP > 0 else []:
+            os.remove(os.path.join(directory, name))
+
     def get_model_summary(self):
         """
         Get a summary of current model state.
@@ -864,4 +903,21 @@ class FisheryModel(Model):
     
     def get_total_catch_all_agents(model):
         """Somme des captures de TOUS les agents"""
-        return sum(agent.total_catch for agent in model.agents)
\ No newline at end of file
+        return sum(agent.total_catch for agent in model.agents)
+
+
+def _parameter_property(name):
+    """Model attribute reading a FibeParams field (setting it swaps in an updated copy)"""
+    def get(model):
+        return getattr(model.params, name)
+    
+    def set(model, value):
+        model.params = model.params.replace(**{name: value})
+    
+    return property(get, set, doc=f"Model parameter {name} (see FibeParams)")
+
+
+for _name in PARAMETER_NAMES:
+    setattr(FisheryModel, _name, _parameter_property(_name))
+for _alias, _name in MODEL_ALIASES.items():
+    setattr(FisheryModel, _alias, _parameter_property(_name))
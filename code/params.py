@@ -0,0 +1,226 @@
+"""
+Compiled parameter set of the FIBE fishery model.
+
+FibeParams is an immutable snapshot of the model parameters of config.py
+(time units, landscape, fish dynamics, economics, fisher types, decision
+thresholds, weather), built once per run from the config module defaults
+plus the run's overrides (e.g. the "parameters" section of a JSON
+configuration). A model and its agents read their parameters from the same
+instance, so runs with different parameters can share a process without
+patching the config module.
+
+Simulation settings that are not model parameters (collection cadences,
+random stream mode, checkpoint, cache and debug settings) stay in config.py.
+
+Usage:
+    params = FibeParams.from_config(FISH_PRICE=12.0, DEFAULT_MEMORY_SIZE=30)
+    model = FisheryModel(..., params=params)
+"""
+
+import dataclasses
+from dataclasses import dataclass
+
+from . import config
+
+
+@dataclass(frozen=True, slots=True)
+class FibeParams:
+    """
+    Immutable model parameters (field names are the config.py constant names).
+
+    List values (regions, hotspots, accessible regions) are stored as
+    tuples. Fields read when a fisher is created (capital, age range, memory
+    size, thresholds, costs) only affect fishers created afterwards.
+    """
+
+    # Time
+    WEEK: int
+    MONTH: int
+    SEASON: int
+    HALFYEAR: int
+    YEAR: int
+
+    # Spatial definitions
+    REGION_A: tuple
+    REGION_B: tuple
+    REGION_C: tuple
+    REGION_D: tuple
+    LAND: tuple
+    GRID_WIDTH: int
+    GRID_HEIGHT: int
+
+    # Hotspot locations
+    HOTSPOTS_A: tuple
+    HOTSPOTS_B: tuple
+    HOTSPOTS_C: tuple
+    HOTSPOTS_D: tuple
+
+    # Density levels
+    LOW: str
+    MEDIUM: str
+    HIGH: str
+    MEDIUM_HIGH: str
+    LOW_MEDIUM: str
+
+    # Fish stock
+    GROWTH_RATE: float
+    LOW_CARRYING_CAPACITY: int
+    MEDIUM_CARRYING_CAPACITY: int
+    HIGH_CARRYING_CAPACITY: int
+    CARRYING_CAPACITY_A_INITIAL: int
+    CARRYING_CAPACITY_B_INITIAL: int
+    CARRYING_CAPACITY_C_INITIAL: int
+    CARRYING_CAPACITY_D_INITIAL: int
+
+    # Economics
+    FISH_PRICE: float
+    INITIAL_CAPITAL: float
+    MIN_AGE: int
+    MAX_AGE: int
+    BANKRUPTCY_THRESHOLD_YEARS: int
+    BANKRUPTCY_LAYLOW_DAYS: int
+    NEGATIVE_CAPITAL_LAYLOW_PROBABILITY: float
+    NEGATIVE_CAPITAL_LAYLOW_DAYS: int
+    SAFETY_BUFFER_DAYS: int
+
+    # Fisher types
+    ARCHIPELAGO_COST_EXISTENCE: float
+    ARCHIPELAGO_COST_ACTIVITY: float
+    ARCHIPELAGO_CATCHABILITY: int
+    ARCHIPELAGO_ACCESSIBLE_REGIONS: tuple
+    ARCHIPELAGO_MAX_GOOD_SPOTS: int
+    COASTAL_COST_EXISTENCE: float
+    COASTAL_COST_ACTIVITY: float
+    COASTAL_CATCHABILITY: int
+    COASTAL_ACCESSIBLE_REGIONS: tuple
+    COASTAL_MAX_GOOD_SPOTS: int
+    TRAWLER_COST_EXISTENCE: float
+    TRAWLER_COST_ACTIVITY: float
+    TRAWLER_CATCHABILITY: int
+    TRAWLER_ACCESSIBLE_REGIONS: tuple
+    TRAWLER_MAX_GOOD_SPOTS: int
+    TRAWLER_STORAGE_CAPACITY: int
+
+    # Travel costs
+    LOW_COST_TRAVEL: float
+    MEDIUM_COST_TRAVEL: float
+    MEDIUM_COST_TRAVEL_BIGVESSEL: float
+    HIGH_COST_TRAVEL: float
+    INTER_REGION_TRAVEL_MULTIPLIER: float
+    TRAVEL_COST_PER_UNIT: float
+
+    # Decision-making
+    DEFAULT_MEMORY_SIZE: int
+    SPATIAL_MEMORY_MAX_AGE: int
+    SPATIAL_MEMORY_FORGETTING: bool
+    SATISFACTION_HOME_THRESHOLD: float
+    SATISFACTION_GROWTH_THRESHOLD: float
+    SCARCE_PERCEPTION_THRESHOLD: float
+    GOOD_SPOT_EFFICIENCY_THRESHOLD: float
+    SIMPLE_FISHING_PROBABILITY: float
+    MEMORY_RECENT_WINDOW: int
+    MEMORY_OLDER_WINDOW: int
+    MEMORY_WEEKLY_WINDOW: int
+    MEMORY_BIWEEKLY_WINDOW: int
+    MEMORY_MONTHLY_WINDOW: int
+    SCARCITY_CATCH_RATIO_THRESHOLD: float
+    SCARCITY_MIN_MEMORY: int
+    EXPLORATION_PHASE_TRIPS: int
+    TRAWLER_PROFIT_THRESHOLD_DAYS: int
+
+    # Weather
+    BAD_WEATHER_PROBABILITY: float
+
+    def __post_init__(self):
+        for name in PARAMETER_NAMES:
+            value = getattr(self, name)
+            if isinstance(value, (list, tuple)):
+                object.__setattr__(self, name, _freeze(value))
+
+    @classmethod
+    def from_config(cls, **overrides):
+        """
+        Build the parameters from the current config module values.
+
+        Args:
+            **overrides: Parameter values replacing the config defaults
+
+        Returns:
+            FibeParams
+
+        Raises:
+            ValueError: If an override is not a parameter
+        """
+        _check_names(overrides)
+        values = {name: getattr(config, name) for name in PARAMETER_NAMES}
+        values.update(overrides)
+        return cls(**values)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild parameters from to_dict() output (missing fields take the config defaults)"""
+        return cls.from_config(**data)
+
+    def to_dict(self):
+        """Parameters as a dict (for checkpoints and saved configurations)"""
+        return {name: getattr(self, name) for name in PARAMETER_NAMES}
+
+    def replace(self, **changes):
+        """
+        Copy of the parameters with some values changed.
+
+        Raises:
+            ValueError: If a change is not a parameter
+        """
+        _check_names(changes)
+        return dataclasses.replace(self, **changes)
+
+    def safety_buffer(self, cost_existence):
+        """Capital to keep as a buffer for trip affordability (see config.get_safety_buffer)"""
+        return cost_existence * self.SAFETY_BUFFER_DAYS
+
+
+PARAMETER_NAMES = tuple(field.name for field in dataclasses.fields(FibeParams))
+
+# FisheryModel attributes kept from the per-instance copies, and the
+# parameter each one reads
+MODEL_ALIASES = {
+    "LOW_COST_EXISTENCE": "ARCHIPELAGO_COST_EXISTENCE",
+    "MEDIUM_COST_EXISTENCE": "COASTAL_COST_EXISTENCE",
+    "HIGH_COST_EXISTENCE": "TRAWLER_COST_EXISTENCE",
+    "LOW_COST_ACTIVITY": "ARCHIPELAGO_COST_ACTIVITY",
+    "MEDIUM_COST_ACTIVITY": "COASTAL_COST_ACTIVITY",
+    "HIGH_COST_ACTIVITY": "TRAWLER_COST_ACTIVITY",
+    "CATCHABILITY_ARCHEPELAGO": "ARCHIPELAGO_CATCHABILITY",
+    "CATCHABILITY_COASTAL": "COASTAL_CATCHABILITY",
+    "CATCHABILITY_TRAWLER": "TRAWLER_CATCHABILITY",
+    "bad_weather_probability": "BAD_WEATHER_PROBABILITY",
+}
+
+
+def split_overrides(overrides):
+    """
+    Separate parameter overrides from other config constants.
+
+    Args:
+        overrides: Dict of config constant names to values
+
+    Returns:
+        Tuple (parameter overrides, other constants)
+    """
+    parameters = {name: value for name, value in overrides.items() if name in PARAMETER_NAMES}
+    constants = {name: value for name, value in overrides.items() if name not in PARAMETER_NAMES}
+    return parameters, constants
+
+
+def _check_names(values):
+    unknown = sorted(set(values) - set(PARAMETER_NAMES))
+    if unknown:
+        raise ValueError(f"Unknown model parameters: {', '.join(unknown)}")
+
+
+def _freeze(value):
+    """Nested lists as nested tuples"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
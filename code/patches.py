@@ -0,0 +1,357 @@
+"""
+Columnar patch storage for the FIBE fishery model.
+
+Patches are stored as NumPy columns indexed by ``x * height + y`` (the same
+x-major order the original dict-of-dicts was filled in), so daily passes over
+the landscape can be vectorized. A dict-like compatibility view is kept so
+``model.patches[(x, y)]['fish_stock']`` and ``get_patch_info(x, y)`` still work.
+
+Regional and total stocks are kept in running accumulators: fishing updates
+them in O(1), and the regrowth step and data collection re-base them on an
+exact recount in patch order (the floating-point result of the original
+patch-by-patch sums).
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from . import config
+
+# Region codes stored in PatchField.region_id
+REGION_NAMES = ("A", "B", "C", "D", "LAND", "NULL")
+FISHING_REGIONS = ("A", "B", "C", "D")
+REGION_CODES = {name: code for code, name in enumerate(REGION_NAMES)}
+NUM_FISHING_REGIONS = len(FISHING_REGIONS)
+
+# Density codes stored in PatchField.density_id (0 = no density, land)
+DENSITY_LEVELS = (None, config.LOW, config.MEDIUM, config.HIGH)
+DENSITY_CODES = {level: code for code, level in enumerate(DENSITY_LEVELS)}
+
+
+class PatchView(Mapping):
+    """
+    Dict-like view on a single patch of a PatchField.
+
+    Reads and writes go straight to the underlying columns, so the view
+    behaves like the old ``{'region': ..., 'fish_stock': ...}`` dict.
+    """
+
+    __slots__ = ("_field", "_index")
+
+    KEYS = (
+        'region',
+        'density',
+        'fish_stock',
+        'carrying_capacity',
+        'growth_rate',
+        'regen_amount',
+        'patch_stock_after_regrowth',
+    )
+
+    def __init__(self, field, index):
+        self._field = field
+        self._index = index
+
+    def __getitem__(self, key):
+        field = self._field
+        i = self._index
+        if key == 'fish_stock':
+            return field.fish_stock[i].item()
+        if key == 'region':
+            return REGION_NAMES[field.region_id[i]]
+        if key == 'density':
+            return DENSITY_LEVELS[field.density_id[i]]
+        if key == 'carrying_capacity':
+            return field.carrying_capacity[i].item()
+        if key == 'growth_rate':
+            return field.growth_rate
+        if key == 'regen_amount':
+            return field.regen_amount[i].item()
+        if key == 'patch_stock_after_regrowth':
+            return field.stock_after_regrowth[i].item()
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        field = self._field
+        i = self._index
+        if key == 'fish_stock':
+            field.set_stock(i, value)
+        elif key == 'regen_amount':
+            field.regen_amount[i] = value
+        elif key == 'patch_stock_after_regrowth':
+            field.stock_after_regrowth[i] = value
+        else:
+            raise KeyError(f"Patch attribute '{key}' is read-only")
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class PatchField(Mapping):
+    """
+    Array-backed patch grid.
+
+    Behaves as a read-only mapping ``(x, y) -> PatchView`` for compatibility,
+    while exposing the NumPy columns for vectorized updates:
+
+    - region_id: region code (index into REGION_NAMES)
+    - density_id: density code (index into DENSITY_LEVELS)
+    - carrying_capacity: patch carrying capacity
+    - fish_stock: current fish stock
+    - regen_amount: regrowth applied at the last update
+    - stock_after_regrowth: stock right after the last regrowth
+
+    Stock totals are tracked incrementally, so region_stock() and
+    total_stock() are constant-time lookups. Code that writes the fish_stock
+    column directly must call resync_stock_totals() afterwards.
+
+    The static columns (region_id, density_id, carrying_capacity) are shared
+    read-only with the Landscape the field was built from.
+    """
+
+    def __init__(self, landscape, growth_rate=config.GROWTH_RATE):
+        """
+        Initialize the patch field from a landscape raster, with every
+        patch at half its carrying capacity (MSY).
+
+        Args:
+            landscape: Landscape raster (see landscape.py)
+            growth_rate: Growth rate recorded on every patch
+        """
+        self.width = landscape.width
+        self.height = landscape.height
+        self.size = self.width * self.height
+        self.growth_rate = growth_rate
+
+        # Static columns (read-only, shared between models)
+        self.region_id = landscape.region_id
+        self.density_id = landscape.density_id
+        self.carrying_capacity = landscape.carrying_capacity
+        # Indices of the patches of fishing regions, in patch order
+        self._fishing_index = np.flatnonzero(self.region_id < NUM_FISHING_REGIONS)
+
+        # Dynamic columns
+        self.fish_stock = np.rint(self.carrying_capacity / 2)
+        self.regen_amount = np.zeros(self.size, dtype=np.float64)
+        self.stock_after_regrowth = self.fish_stock.copy()
+
+        # Running stock totals (one per entry of REGION_NAMES)
+        self._region_stock = [0.0] * len(REGION_NAMES)
+        self._total_stock = 0.0
+        self.resync_stock_totals()
+
+    def index(self, x, y):
+        """
+        Get the column index of a patch.
+
+        Returns:
+            int: Index, or None if (x, y) is outside the grid
+        """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return x * self.height + y
+        return None
+
+    def set_stock(self, i, value):
+        """Overwrite the fish stock of the patch at column index i"""
+        delta = value - self.fish_stock[i].item()
+        self.fish_stock[i] = value
+        self._apply_stock_delta(self.region_id[i], delta)
+
+    def _apply_stock_delta(self, region_code, delta):
+        """Update the running totals after a stock change in one patch"""
+        self._region_stock[region_code] += delta
+        if region_code < NUM_FISHING_REGIONS:
+            self._total_stock += delta
+
+    def resync_stock_totals(self):
+        """Rebuild the running stock totals from a full recount"""
+        self._region_stock = self.region_totals().tolist()
+        self._total_stock = self.fishing_total()
+
+    def fishing_total(self):
+        """
+        Total fish stock of the fishing regions: the built-in sum over the
+        patches in patch order, as the original patch-by-patch total (the
+        sum of the regional totals can differ by a few ulps).
+        """
+        return sum(self.fish_stock[self._fishing_index].tolist())
+
+    def stock_totals_drift(self, tolerance=config.STOCK_CHECK_TOLERANCE):
+        """
+        Compare the running totals with a full recount.
+
+        Fishing updates introduce rounding differences of a few ulps, so
+        totals are compared with a relative tolerance.
+
+        Args:
+            tolerance: Relative tolerance
+
+        Returns:
+            list: One dict per mismatching total (empty if all OK)
+        """
+        recount = self.region_totals().tolist()
+        tracked = dict(zip(REGION_NAMES, self._region_stock))
+        tracked["TOTAL"] = self._total_stock
+        expected = dict(zip(REGION_NAMES, recount))
+        expected["TOTAL"] = self.fishing_total()
+
+        drift = []
+        for name, value in tracked.items():
+            if abs(value - expected[name]) > tolerance * max(1.0, abs(expected[name])):
+                drift.append({
+                    "region": name,
+                    "tracked": value,
+                    "recount": expected[name],
+                    "difference": value - expected[name],
+                })
+        return drift
+
+    def region_mask(self, region_name):
+        """Boolean mask of the patches belonging to a region"""
+        return self.region_id == REGION_CODES[region_name]
+
+    def region_totals(self, column=None):
+        """
+        Sum a column per region.
+
+        The bincount accumulates in patch order, which gives the same
+        floating-point result as walking the patches one by one.
+
+        Args:
+            column: Array to sum (defaults to fish_stock)
+
+        Returns:
+            np.ndarray: One total per entry of REGION_NAMES
+        """
+        if column is None:
+            column = self.fish_stock
+        return np.bincount(self.region_id, weights=column, minlength=len(REGION_NAMES))
+
+    def region_stock(self, region_name):
+        """Total fish stock in a region"""
+        return self._region_stock[REGION_CODES[region_name]]
+
+    def total_stock(self):
+        """Total fish stock across all fishing regions"""
+        return self._total_stock
+
+    def regrow(self, effective_rate, density_factors, regional_capacities):
+        """
+        Apply one step of logistic regrowth with regional capping.
+
+        Growth is computed for every fishing patch at once, summed per region
+        with a bincount and, where a region would exceed its carrying
+        capacity, scaled back by a clamped factor broadcast to its patches
+        (scaled growth is rounded, as in the original per-patch update).
+
+        Args:
+            effective_rate: Growth rate for this time step
+            density_factors: Regen multiplier per density code (DENSITY_LEVELS order)
+            regional_capacities: Carrying capacity per fishing region (FISHING_REGIONS order)
+        """
+        fishing = self.region_id < NUM_FISHING_REGIONS
+        region_ids = self.region_id[fishing]
+        stock = self.fish_stock[fishing]
+        capacity = self.carrying_capacity[fishing]
+        factor = np.asarray(density_factors, dtype=np.float64)[self.density_id[fishing]]
+
+        # Per-patch logistic growth
+        regen = stock * effective_rate * factor * (1 - stock / capacity)
+
+        # Per-region sums (bincount accumulates in patch order)
+        growth_by_region = np.bincount(region_ids, weights=regen, minlength=NUM_FISHING_REGIONS)
+        regional_stocks = np.bincount(region_ids, weights=stock, minlength=NUM_FISHING_REGIONS)
+
+        # Clamped scale factor for regions that would exceed their capacity
+        scale = np.ones(NUM_FISHING_REGIONS)
+        scaled = np.zeros(NUM_FISHING_REGIONS, dtype=bool)
+        for r in range(NUM_FISHING_REGIONS):
+            current_regional_stock = regional_stocks[r].item()
+            growth = growth_by_region[r].item()
+            if current_regional_stock + growth > regional_capacities[r]:
+                scaled[r] = True
+                if growth > 0:
+                    scale[r] = max(0, min(1, (regional_capacities[r] - current_regional_stock) / growth))
+                else:
+                    scale[r] = 0
+
+        patch_scaled = scaled[region_ids]
+        regen[patch_scaled] = np.rint(regen[patch_scaled] * scale[region_ids[patch_scaled]])
+
+        stock = stock + regen
+        self.regen_amount[fishing] = regen
+        self.fish_stock[fishing] = stock
+        self.stock_after_regrowth[fishing] = stock
+
+        # Re-base the running totals on the exact post-growth sums
+        regional_stocks = np.bincount(region_ids, weights=stock, minlength=NUM_FISHING_REGIONS).tolist()
+        self._region_stock[:NUM_FISHING_REGIONS] = regional_stocks
+        self._total_stock = self.fishing_total()
+
+    def region_capacity(self, region_name):
+        """Total carrying capacity of a region"""
+        return int(self.carrying_capacity[self.region_mask(region_name)].sum())
+
+    def reduce(self, x, y, catch_amount):
+        """
+        Remove fish from a patch.
+
+        Returns:
+            Actual amount caught (0 if the patch does not exist)
+        """
+        i = self.index(x, y)
+        if i is None:
+            return 0
+        current_stock = self.fish_stock[i].item()
+        actual_catch = min(catch_amount, current_stock)
+        new_stock = max(0, current_stock - actual_catch)
+        self.fish_stock[i] = new_stock
+        self._apply_stock_delta(self.region_id[i], new_stock - current_stock)
+        return actual_catch
+
+    def get_state(self):
+        """Dynamic columns and running totals (for checkpoints)"""
+        return {
+            "fish_stock": self.fish_stock.copy(),
+            "regen_amount": self.regen_amount.copy(),
+            "stock_after_regrowth": self.stock_after_regrowth.copy(),
+            "region_stock": list(self._region_stock),
+            "total_stock": self._total_stock,
+        }
+
+    def set_state(self, state):
+        """Restore the state returned by get_state"""
+        self.fish_stock[:] = state["fish_stock"]
+        self.regen_amount[:] = state["regen_amount"]
+        self.stock_after_regrowth[:] = state["stock_after_regrowth"]
+        self._region_stock = list(state["region_stock"])
+        self._total_stock = state["total_stock"]
+
+    # ----- Mapping interface (compatibility with the old dict-of-dicts) -----
+
+    def __getitem__(self, pos):
+        i = self.index(pos[0], pos[1])
+        if i is None:
+            raise KeyError(pos)
+        return PatchView(self, i)
+
+    def __contains__(self, pos):
+        try:
+            return self.index(pos[0], pos[1]) is not None
+        except (TypeError, IndexError):
+            return False
+
+    def __iter__(self):
+        for x in range(self.width):
+            for y in range(self.height):
+                yield (x, y)
+
+    def __len__(self):
+        return self.size
@@ -0,0 +1,177 @@
+"""
+Per-phase step profiler for the FIBE fishery model.
+
+A StepProfiler attached to a model (FisheryModel.attach_profiler) records
+the wall-clock and CPU time of every phase of FisheryModel.step, and of
+each fisher type within the agent loop, and rolls them up per simulated
+year. Timings are taken with integer nanosecond counters at phase
+boundaries only (the agent loop reads the clocks when the fisher type
+changes, not around every agent), so the overhead stays small.
+
+CPU time is the simulation thread's own time (time.thread_time_ns), so the
+streaming export's writer thread is not counted in the phases.
+
+Phases (in step order):
+
+    weather       determine_weather
+    agents        the agent loop (split per fisher type as agents.<type>)
+    scheduler     catching up the parked fishers (ActivationScheduler)
+    stock_check   debug cross-check of the stock accumulators
+    collect       datacollector.collect_scheduled
+    fish_stock    update_fish_stock
+    yearly        collect_yearly_data and the verbose yearly report
+    sink          streaming export (after_step)
+"""
+
+import time
+
+import pandas as pd
+
+PHASES = ("weather", "agents", "scheduler", "stock_check", "collect", "fish_stock", "yearly", "sink")
+
+# Columns of the profile table
+PROFILE_COLUMNS = ("year", "phase", "calls", "wall_time_s", "cpu_time_s", "wall_share")
+
+
+class StepProfiler:
+    """
+    Wall and CPU time per step phase, accumulated per simulated year.
+
+    Usage:
+        profiler = StepProfiler()
+        model.attach_profiler(profiler)
+        model.run_model()
+        profiler.to_dataframe()       # one row per year and phase
+        profiler.summary()            # totals over the run
+    """
+
+    def __init__(self):
+        self.rows = []
+        self._wall = time.perf_counter_ns
+        self._cpu = time.thread_time_ns
+        self._reset_year()
+        self._last_wall = 0
+        self._last_cpu = 0
+
+    def _reset_year(self):
+        # phase -> [calls, wall ns, cpu ns]
+        self._phases = {phase: [0, 0, 0] for phase in PHASES}
+        self._agent_types = {}
+
+    # ----- Called by FisheryModel.step -----
+
+    def start_step(self):
+        """Start timing a step"""
+        self._last_wall = self._wall()
+        self._last_cpu = self._cpu()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to a phase"""
+        wall = self._wall()
+        cpu = self._cpu()
+        entry = self._phases[phase]
+        entry[0] += 1
+        entry[1] += wall - self._last_wall
+        entry[2] += cpu - self._last_cpu
+        self._last_wall = wall
+        self._last_cpu = cpu
+
+    def step_agents(self, agents):
+        """
+        Run the agent loop, timing each run of consecutive agents of the
+        same fisher type, then charge the whole loop to the "agents" phase.
+
+        Args:
+            agents: Agents in step order
+        """
+        wall_clock = self._wall
+        cpu_clock = self._cpu
+        totals = self._agent_types
+        current = None
+        count = 0
+        start_wall = self._last_wall
+        start_cpu = self._last_cpu
+
+        for agent in agents:
+            fisher_type = agent.fisher_type
+            if fisher_type != current:
+                if current is not None:
+                    wall = wall_clock()
+                    cpu = cpu_clock()
+                    _add(totals, current, count, wall - start_wall, cpu - start_cpu)
+                    start_wall, start_cpu = wall, cpu
+                current = fisher_type
+                count = 0
+            count += 1
+            agent.step()
+
+        if current is not None:
+            _add(totals, current, count, wall_clock() - start_wall, cpu_clock() - start_cpu)
+        self.lap("agents")
+
+    def end_step(self, model):
+        """Close the step; the year's rows are stored at the end of each year and of the run"""
+        if model.current_step % model.YEAR == 0 or not model.running:
+            self._store_year((model.current_step - 1) // model.YEAR + 1)
+
+    def _store_year(self, year):
+        step_wall = sum(entry[1] for entry in self._phases.values())
+        rows = [(phase, *entry) for phase, entry in self._phases.items()]
+        rows += [(f"agents.{fisher_type}", *entry) for fisher_type, entry in self._agent_types.items()]
+        for phase, calls, wall, cpu in rows:
+            self.rows.append({
+                "year": year,
+                "phase": phase,
+                "calls": calls,
+                "wall_time_s": wall / 1e9,
+                "cpu_time_s": cpu / 1e9,
+                "wall_share": wall / step_wall if step_wall else 0.0,
+            })
+        self._reset_year()
+
+    # ----- Results -----
+
+    def to_dataframe(self):
+        """
+        Timing table, one row per simulated year and phase.
+
+        Returns:
+            pd.DataFrame: Columns PROFILE_COLUMNS. calls counts steps for
+                the step phases and agent steps for the agents.<type> rows;
+                wall_share is the share of the year's step time
+        """
+        return pd.DataFrame(self.rows, columns=list(PROFILE_COLUMNS))
+
+    def summary(self):
+        """
+        Timing totals over the run.
+
+        Returns:
+            pd.DataFrame: One row per phase (same columns, without year)
+        """
+        df = self.to_dataframe()
+        totals = df.groupby("phase", sort=False)[["calls", "wall_time_s", "cpu_time_s"]].sum().reset_index()
+        step_wall = totals.loc[totals["phase"].isin(PHASES), "wall_time_s"].sum()
+        totals["wall_share"] = totals["wall_time_s"] / step_wall if step_wall else 0.0
+        return totals
+
+    def export(self, path):
+        """Write the per-year timing table to a CSV file"""
+        self.to_dataframe().to_csv(path, index=False)
+
+    def print_summary(self):
+        """Print the timing totals, slowest phase first"""
+        summary = self.summary()
+        print("\n--- STEP PROFILE ---")
+        for row in summary.sort_values("wall_time_s", ascending=False).itertuples():
+            print(f"{row.phase:<20} {row.wall_time_s:>9.3f} s wall  {row.cpu_time_s:>9.3f} s CPU  "
+                  f"{row.wall_share:>6.1%}  ({row.calls} calls)")
+
+
+def _add(totals, fisher_type, count, wall, cpu):
+    entry = totals.get(fisher_type)
+    if entry is None:
+        entry = totals[fisher_type] = [0, 0, 0]
+    entry[0] += count
+    entry[1] += wall
+    entry[2] += cpu
@@ -0,0 +1,105 @@
+"""
+Random number streams for the FIBE fishery model.
+
+Every model owns a seeded generator hierarchy instead of drawing from the
+module-level ``random``: a root numpy SeedSequence spawns one independent
+``random.Random`` stream per subsystem (weather, agent initialization,
+decisions), plus optional per-agent decision streams derived from the
+agent's unique_id. Two models built with the same seed draw exactly the
+same numbers, whatever else runs in the process.
+"""
+
+import random
+
+import numpy as np
+
+# Subsystem streams, in spawn order (do not reorder: it changes every stream)
+SUBSYSTEM_STREAMS = ("weather", "agent_init", "decisions", "mesa")
+
+# Spawn-key branch of the per-agent decision streams
+AGENT_STREAM_BRANCH = len(SUBSYSTEM_STREAMS)
+
+
+def _python_seed(seed_sequence):
+    """128-bit integer seed for random.Random from a SeedSequence"""
+    return int.from_bytes(seed_sequence.generate_state(4).tobytes(), "little")
+
+
+def get_random_state(generator):
+    """
+    State of a random.Random, as an array plus JSON values (for checkpoints).
+
+    Args:
+        generator: random.Random
+
+    Returns:
+        dict: "version", "internal" (uint32 array) and "gauss"
+    """
+    version, internal, gauss = generator.getstate()
+    return {"version": version, "internal": np.array(internal, dtype=np.uint32), "gauss": gauss}
+
+
+def set_random_state(generator, state):
+    """Restore a state returned by get_random_state"""
+    generator.setstate((state["version"], tuple(state["internal"].tolist()), state["gauss"]))
+
+
+class RandomStreams:
+    """
+    Seeded generator hierarchy of one model.
+
+    Attributes:
+        seed: Root entropy (passing it back as seed reproduces every stream)
+        weather: Stream for daily weather draws
+        agent_init: Stream for agent initialization (e.g. age)
+        decisions: Shared stream for agent decisions
+        mesa_seed: Integer seed for Mesa's own generators
+    """
+
+    def __init__(self, seed=None, per_agent=False):
+        """
+        Args:
+            seed: Root seed (int or None for fresh OS entropy)
+            per_agent: Give every agent its own decision stream
+        """
+        root = np.random.SeedSequence(seed)
+        self.seed = root.entropy
+        self.per_agent = per_agent
+        self._root = root
+
+        children = dict(zip(SUBSYSTEM_STREAMS, root.spawn(len(SUBSYSTEM_STREAMS))))
+        self.weather = random.Random(_python_seed(children["weather"]))
+        self.agent_init = random.Random(_python_seed(children["agent_init"]))
+        self.decisions = random.Random(_python_seed(children["decisions"]))
+        self.mesa_seed = int(children["mesa"].generate_state(1, dtype=np.uint64)[0] >> 1)
+
+    def agent_stream(self, unique_id):
+        """
+        Decision stream of an agent.
+
+        With per_agent streams the generator depends only on the root seed
+        and the agent's unique_id, so an agent's draws do not depend on how
+        many draws other agents made. Otherwise every agent shares the
+        decisions stream.
+
+        Args:
+            unique_id: Agent identifier (non-negative int)
+
+        Returns:
+            random.Random
+        """
+        if not self.per_agent:
+            return self.decisions
+        seed_sequence = np.random.SeedSequence(
+            self.seed, spawn_key=self._root.spawn_key + (AGENT_STREAM_BRANCH, unique_id)
+        )
+        return random.Random(_python_seed(seed_sequence))
+
+    def get_state(self):
+        """States of the subsystem streams (per-agent streams belong to the agents)"""
+        return {name: get_random_state(getattr(self, name)) for name in SUBSYSTEM_STREAMS[:-1]}
+
+    def set_state(self, state):
+        """Restore the states returned by get_state"""
+        for name, stream_state in state.items():
+            set_random_state(getattr(self, name), stream_state)
@@ -0,0 +1,126 @@
+"""
+Activation scheduler of the FIBE fishers.
+
+A fisher laying low (after a negative capital, or bankrupt) spends its days
+at home without drawing random numbers or touching anything but its own
+state: it counts down lay_low_counter, pays its existence costs and
+remembers a day at home, or does nothing at all once bankrupt (see
+FisherAgent.can_lay_low). Its daily decision and perceptions are
+overwritten the next day.
+
+ActivationScheduler parks such fishers after their step and leaves them out
+of the agent loop until their wake-up day, kept in a priority queue:
+archipelago fishers wake on the day their lay-low counter runs out, the
+others (which never leave lay-low) never do. The days skipped are applied
+through FisherAgent.catch_up when a fisher wakes up, or when the model
+reads the fishers (data collection, yearly summary, checkpoint) through
+sync(), so results are identical to stepping every fisher every day.
+Fishers are only parked within run_model: every one is back in the loop
+when it returns, so they can be read or changed freely between runs.
+"""
+
+import heapq
+
+
+class ActivationScheduler:
+    """
+    Fishers left out of the daily agent loop.
+
+    Usage:
+        for agent in scheduler.active_agents(model.agents, model.current_step):
+            agent.step()
+        scheduler.sync()        # apply the skipped days before reading the fishers
+        scheduler.wake_all()    # ... and unpark everyone before changing them
+    """
+
+    def __init__(self):
+        self._parked = {}       # agent -> [last day applied, wake-up day or None, settled]
+        self._wake = []         # heap of (wake-up day, sequence, agent), stale entries included
+        self._sequence = 0
+        self.day = None         # last day run by active_agents
+
+    def __len__(self):
+        return len(self._parked)
+
+    def __contains__(self, agent):
+        return agent in self._parked
+
+    def active_agents(self, agents, day):
+        """
+        Fishers to step on a day, in agent order.
+
+        Parked fishers due today are woken up first (their skipped days
+        applied); fishers that can lay low from tomorrow on are parked once
+        they have been stepped.
+
+        Args:
+            agents: Agents in step order
+            day: Model step (current_step)
+
+        Yields:
+            FisherAgent
+        """
+        self.day = day
+        parked = self._parked
+        due = self._due(day)
+        for agent in agents:
+            if agent in parked:
+                if agent not in due:
+                    continue
+                self._catch_up(agent, day - 1)
+                if agent.can_lay_low():
+                    # Went bankrupt meanwhile: today is laid low as well
+                    self._park(agent, day - 1, parked[agent][2])
+                    continue
+                del parked[agent]
+            was_bankrupt = agent.bankrupt
+            yield agent
+            if agent.can_lay_low():
+                # A whole day bankrupt: nothing but the spatial memory changes any more
+                self._park(agent, day, was_bankrupt and agent.bankrupt)
+
+    def sync(self):
+        """Apply the days skipped by the parked fishers, up to the last day run"""
+        for agent in self._parked:
+            self._catch_up(agent, self.day)
+
+    def wake_all(self):
+        """Apply the skipped days and put every fisher back in the agent loop"""
+        self.sync()
+        self._parked.clear()
+        self._wake.clear()
+
+    def discard(self, agent):
+        """Forget a removed fisher"""
+        self._parked.pop(agent, None)
+
+    def _park(self, agent, day, settled):
+        wake = agent.lay_low_wake_up(day)
+        self._parked[agent] = [day, wake, settled]
+        if wake is not None:
+            heapq.heappush(self._wake, (wake, self._sequence, agent))
+            self._sequence += 1
+
+    def _catch_up(self, agent, day):
+        entry = self._parked[agent]
+        last, _, settled = entry
+        if last >= day:
+            return
+        was_bankrupt = agent.bankrupt
+        agent.catch_up(last + 1, day, settled)
+        entry[0] = day
+        # The last day applied started bankrupt: the fisher is settled
+        entry[2] = settled or (was_bankrupt and agent.bankrupt)
+
+    def _due(self, day):
+        """Parked fishers whose wake-up day has come"""
+        wake = self._wake
+        parked = self._parked
+        due = set()
+        while wake and wake[0][0] <= day:
+            wake_day, _, agent = heapq.heappop(wake)
+            entry = parked.get(agent)
+            # Skip entries of fishers woken up or parked again since
+            if entry is not None and entry[1] == wake_day:
+                due.add(agent)
+        return due
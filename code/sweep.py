@@ -0,0 +1,571 @@
+"""
+Parameter sweeps for the FIBE fishery model.
+
+An experiment spec declares parameter ranges, a sampling design (full grid,
+Latin hypercube or scrambled Sobol) and a replicate count. Every
+(parameter point, replicate) pair is simulated, over a process pool, and
+the yearly summaries are appended to one columnar store keyed by point_id
+and seed.
+
+A swept parameter can be:
+
+    - a FisheryModel constructor argument (end_of_sim, num_archipelago, ...)
+    - a config module constant (e.g. "DEFAULT_MEMORY_SIZE" or
+      "config.TRAVEL_COST_PER_UNIT"): model parameters go into the run's
+      FibeParams (see params.py), other settings are set on the config
+      module for the duration of the run
+    - a FisheryModel attribute (e.g. "model.FISH_PRICE"), set on the model
+      after construction
+
+Bare names are looked up in that order. Replicate r of every point uses the
+same seed (common random numbers), so differences between points are not
+blurred by seed noise.
+
+Spec file (JSON):
+
+    {
+      "name": "price_growth",
+      "base_config": "config_default.json",
+      "design": "lhs",
+      "samples": 64,
+      "replicates": 3,
+      "root_seed": 12345,
+      "parameters": {
+        "FISH_PRICE": {"low": 5.0, "high": 20.0},
+        "GROWTH_RATE": {"low": 0.05, "high": 0.3},
+        "num_trawler": {"values": [10, 20, 40]}
+      }
+    }
+"""
+
+import contextlib
+import itertools
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from . import config
+from .ensemble import spawn_seeds
+from .export import resolve_export_format, _atomic_write, _write_json
+from .loader import ConfigLoader
+from .model import FisheryModel
+from .params import FibeParams, MODEL_ALIASES, split_overrides
+
+SAMPLING_DESIGNS = ("grid", "lhs", "sobol")
+
+# FisheryModel constructor arguments that can be swept
+MODEL_ARGUMENTS = ("end_of_sim", "num_archipelago", "num_coastal", "num_trawler")
+
+# Parameters that the model also exposes under another attribute name
+CONFIG_MODEL_ALIASES = {name: alias for alias, name in MODEL_ALIASES.items()}
+
+# Columns identifying a run in the result store
+KEY_COLUMNS = ("point_id", "replicate", "seed")
+
+
+def parameter_target(name):
+    """
+    Resolve where a swept parameter is applied.
+
+    Args:
+        name: Parameter name, optionally prefixed with "config." or "model."
+
+    Returns:
+        Tuple (kind, attribute), kind being "argument", "config" or "model"
+
+    Raises:
+        ValueError: If a "config." name is not a config constant
+    """
+    if name.startswith("config."):
+        attribute = name[len("config."):]
+        if not hasattr(config, attribute):
+            raise ValueError(f"Unknown config constant '{attribute}'")
+        return "config", attribute
+    if name.startswith("model."):
+        return "model", name[len("model."):]
+    if name in MODEL_ARGUMENTS:
+        return "argument", name
+    if hasattr(config, name):
+        return "config", name
+    return "model", name
+
+
+@contextlib.contextmanager
+def override_config(values):
+    """
+    Temporarily set config module constants.
+
+    Args:
+        values: Dict mapping config constant names to values
+    """
+    previous = {name: getattr(config, name) for name in values}
+    try:
+        for name, value in values.items():
+            setattr(config, name, value)
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(config, name, value)
+
+
+class ParameterRange:
+    """Range of one swept parameter: explicit values or [low, high]"""
+
+    def __init__(self, name, values=None, low=None, high=None, levels=None, integer=False):
+        """
+        Args:
+            name: Parameter name (see parameter_target)
+            values: Explicit values (grid levels, or categories sampled
+                uniformly by LHS/Sobol designs)
+            low: Lower bound of a continuous range
+            high: Upper bound of a continuous range
+            levels: Number of evenly spaced grid levels in [low, high]
+            integer: Round sampled values to integers
+        """
+        if values is not None:
+            if len(values) == 0:
+                raise ValueError(f"Parameter '{name}' has an empty list of values")
+        elif low is None or high is None or not low < high:
+            raise ValueError(f"Parameter '{name}' needs 'values' or 'low' < 'high'")
+        if levels is not None and levels < 1:
+            raise ValueError(f"Parameter '{name}' needs at least one grid level")
+
+        self.name = name
+        self.values = list(values) if values is not None else None
+        self.low = low
+        self.high = high
+        self.levels = levels
+        self.integer = integer
+        self.target = parameter_target(name)
+
+    @classmethod
+    def from_dict(cls, name, data):
+        """Build a range from its spec entry (a dict, or a list of values)"""
+        if isinstance(data, list):
+            return cls(name, values=data)
+        unknown = set(data) - {"values", "low", "high", "levels", "integer"}
+        if unknown:
+            raise ValueError(f"Unknown keys for parameter '{name}': {sorted(unknown)}")
+        return cls(name, **data)
+
+    def to_dict(self):
+        data = {}
+        if self.values is not None:
+            data["values"] = self.values
+        else:
+            data["low"] = self.low
+            data["high"] = self.high
+            if self.levels is not None:
+                data["levels"] = self.levels
+        if self.integer:
+            data["integer"] = True
+        return data
+
+    def grid_values(self):
+        """Levels of the parameter in a full grid design"""
+        if self.values is not None:
+            return list(self.values)
+        if self.levels is None:
+            raise ValueError(f"Parameter '{self.name}' needs 'values' or 'levels' for a grid design")
+        return [self._cast(value) for value in np.linspace(self.low, self.high, self.levels)]
+
+    def scale(self, u):
+        """Map a unit-interval sample to a parameter value"""
+        if self.values is not None:
+            return self.values[min(int(u * len(self.values)), len(self.values) - 1)]
+        return self._cast(self.low + u * (self.high - self.low))
+
+    def _cast(self, value):
+        if self.integer:
+            return int(round(value))
+        return float(value)
+
+
+class ExperimentSpec:
+    """
+    Declarative description of a parameter sweep.
+
+    Attributes:
+        name: Experiment name (default name of the result store)
+        parameters: List of ParameterRange (or, when building, a dict of
+            spec entries keyed by parameter name)
+        design: "grid", "lhs" or "sobol"
+        samples: Number of points of an LHS/Sobol design
+        replicates: Runs per parameter point
+        root_seed: Root seed entropy (fixed at construction, so the points
+            and replicate seeds are reproducible from to_dict(); a spec
+            without root_seed draws fresh entropy)
+        base_config: JSON configuration the points start from
+        duration_years: Overrides the base configuration duration
+        fixed: Dict of parameters set to the same value for every point
+    """
+
+    def __init__(self, name, parameters, design="grid", samples=None, replicates=1,
+                 root_seed=None, base_config="config_default.json", duration_years=None,
+                 fixed=None):
+        if design not in SAMPLING_DESIGNS:
+            raise ValueError(f"Unknown sampling design '{design}' (expected one of {SAMPLING_DESIGNS})")
+        if not parameters:
+            raise ValueError("An experiment needs at least one swept parameter")
+        if design != "grid" and (samples is None or samples < 1):
+            raise ValueError(f"The '{design}' design needs a positive number of samples")
+        if replicates < 1:
+            raise ValueError("replicates must be at least 1")
+
+        self.name = name
+        if isinstance(parameters, dict):
+            parameters = [ParameterRange.from_dict(key, value) for key, value in parameters.items()]
+        self.parameters = list(parameters)
+        self.design = design
+        self.samples = samples
+        self.replicates = replicates
+        self.base_config = base_config
+        self.duration_years = duration_years
+        self.fixed = dict(fixed or {})
+        for key in self.fixed:
+            parameter_target(key)
+
+        # One seed for the design sampler, one per replicate
+        self.root_seed, seeds = spawn_seeds(replicates + 1, root_seed)
+        self._design_seed = seeds[0]
+        self.replicate_seeds = seeds[1:]
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a spec from its JSON dictionary"""
+        data = dict(data)
+        if "name" not in data or "parameters" not in data:
+            raise ValueError("An experiment spec needs 'name' and 'parameters'")
+        return cls(**data)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a spec from a JSON file.
+
+        A relative base_config is looked up next to the spec file first,
+        then in the configs directory (as in ConfigLoader).
+        """
+        with open(path, 'r') as f:
+            data = json.load(f)
+        base_config = data.get("base_config")
+        if base_config and not os.path.isabs(base_config):
+            candidate = os.path.join(os.path.dirname(os.path.abspath(path)), base_config)
+            if os.path.exists(candidate):
+                data["base_config"] = candidate
+        return cls.from_dict(data)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "parameters": {parameter.name: parameter.to_dict() for parameter in self.parameters},
+            "design": self.design,
+            "samples": self.samples,
+            "replicates": self.replicates,
+            "root_seed": self.root_seed,
+            "base_config": self.base_config,
+            "duration_years": self.duration_years,
+            "fixed": self.fixed,
+        }
+
+    def points(self):
+        """
+        Parameter points of the design.
+
+        Returns:
+            List of dicts mapping parameter names to values
+        """
+        names = [parameter.name for parameter in self.parameters]
+        if self.design == "grid":
+            levels = [parameter.grid_values() for parameter in self.parameters]
+            return [dict(zip(names, values)) for values in itertools.product(*levels)]
+
+        rng = np.random.default_rng(self._design_seed)
+        if self.design == "lhs":
+            sampler = qmc.LatinHypercube(d=len(self.parameters), rng=rng)
+        else:
+            sampler = qmc.Sobol(d=len(self.parameters), scramble=True, rng=rng)
+        sample = sampler.random(self.samples)
+        return [
+            {parameter.name: parameter.scale(u) for parameter, u in zip(self.parameters, row)}
+            for row in sample
+        ]
+
+    def tasks(self):
+        """
+        Runs of the experiment, one per (point, replicate).
+
+        Returns:
+            List of dicts with point_id, replicate, seed, point and the
+            model arguments / attribute overrides / config overrides
+        """
+        model_params, model_overrides = self._base_run()
+        tasks = []
+        for point_id, point in enumerate(self.points()):
+            arguments = dict(model_params)
+            attributes = dict(model_overrides)
+            constants = {}
+            for name, value in itertools.chain(self.fixed.items(), point.items()):
+                kind, attribute = parameter_target(name)
+                if kind == "argument":
+                    arguments[attribute] = value
+                elif kind == "config":
+                    constants[attribute] = value
+                    # The swept constant wins over the base configuration
+                    attributes.pop(attribute, None)
+                    attributes.pop(CONFIG_MODEL_ALIASES.get(attribute), None)
+                else:
+                    attributes[attribute] = value
+
+            for replicate, seed in enumerate(self.replicate_seeds):
+                tasks.append({
+                    "point_id": point_id,
+                    "replicate": replicate,
+                    "seed": seed,
+                    "point": point,
+                    "model_params": arguments,
+                    "model_overrides": attributes,
+                    "config_overrides": constants,
+                })
+        return tasks
+
+    def _base_run(self):
+        """Model arguments and attribute overrides of the base configuration"""
+        loader = ConfigLoader()
+        loader.load(self.base_config)
+        model_params = loader.get_model_params()
+        if self.duration_years is not None:
+            model_params["end_of_sim"] = self.duration_years * config.YEAR
+        # Only the yearly summaries are stored
+        model_params.update(verbose=False, model_collection="yearly", agent_collection="yearly")
+        model_params.pop("seed")
+        return model_params, loader.get_parameter_overrides()
+
+
+def run_point(model_params, model_overrides=None, config_overrides=None, seed=None):
+    """
+    Simulate one parameter point.
+
+    Args:
+        model_params: FisheryModel constructor arguments
+        model_overrides: Model attributes set after construction
+        config_overrides: Config constants of the run (model parameters go
+            into the model's FibeParams, other settings are set for the
+            duration of the run)
+        seed: Model seed
+
+    Returns:
+        FisheryModel: Completed model
+    """
+    parameters, constants = split_overrides(config_overrides or {})
+    with override_config(constants):
+        params = FibeParams.from_config(**parameters)
+        model = FisheryModel(**dict(model_params, seed=seed), params=params)
+        for attribute, value in (model_overrides or {}).items():
+            if not hasattr(model, attribute):
+                raise ValueError(f"FisheryModel has no attribute '{attribute}'")
+            setattr(model, attribute, value)
+        model.run_model()
+    return model
+
+
+def _run_task(task, cache=None):
+    """Run one sweep task (in a worker process), or fetch it from the result cache"""
+    key = None
+    cached = None
+    if cache is not None:
+        key = cache.key(task["model_params"], task["seed"], task["model_overrides"], task["config_overrides"])
+        cached = cache.get(key)
+
+    if cached is not None:
+        yearly_data = cached.yearly_data
+    else:
+        model = run_point(task["model_params"], task["model_overrides"], task["config_overrides"], task["seed"])
+        yearly_data = model.yearly_data
+        if cache is not None:
+            cache.put(key, yearly_data)
+    return {
+        "point_id": task["point_id"],
+        "replicate": task["replicate"],
+        "seed": task["seed"],
+        "point": task["point"],
+        "yearly_data": yearly_data,
+    }
+
+
+class SweepStore:
+    """
+    Columnar result store of a sweep.
+
+    Finished runs are appended as numbered part files (one row per run and
+    year, with the key and parameter columns first); the manifest lists the
+    parts, the parameter points and the completed (point_id, seed) keys, so
+    an interrupted sweep resumes where it stopped.
+
+    Layout (inside directory):
+
+        runs/part-00000.parquet   Yearly rows of the finished runs
+        sweep_manifest.json       Spec, points, parts and completed keys
+    """
+
+    MANIFEST = "sweep_manifest.json"
+
+    def __init__(self, directory, spec, export_format="auto"):
+        """
+        Args:
+            directory: Store directory (created if missing)
+            spec: ExperimentSpec of the sweep
+            export_format: "parquet", "csv" or "auto" (ignored when the
+                store already exists)
+
+        Raises:
+            ValueError: If the store was created by a different spec
+        """
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, self.MANIFEST)
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest["spec"] != json.loads(json.dumps(spec.to_dict())):
+                raise ValueError(f"Sweep store {directory} was created by a different experiment spec")
+            self.export_format = manifest["format"]
+            self.parts = manifest["parts"]
+            self.completed = {tuple(key) for key in manifest["completed"]}
+            self._manifest = manifest
+        else:
+            self.export_format = resolve_export_format(export_format)
+            self.parts = []
+            self.completed = set()
+            self._manifest = {
+                "spec": spec.to_dict(),
+                "format": self.export_format,
+                "points": [{"point_id": i, **point} for i, point in enumerate(spec.points())],
+            }
+            os.makedirs(os.path.join(directory, "runs"), exist_ok=True)
+            self._write_manifest()
+
+    def append(self, results):
+        """
+        Append finished runs as one part file.
+
+        Args:
+            results: List of run results (see _run_task)
+        """
+        if not results:
+            return
+        frames = []
+        for result in results:
+            df = pd.DataFrame(result["yearly_data"])
+            for position, (name, value) in enumerate(
+                    itertools.chain(((key, result[key]) for key in KEY_COLUMNS), result["point"].items())):
+                df.insert(position, name, value)
+            frames.append(df)
+        df = pd.concat(frames, ignore_index=True)
+
+        filename = os.path.join("runs", f"part-{len(self.parts):05d}.{self.export_format}")
+        path = os.path.join(self.directory, filename)
+        if self.export_format == "parquet":
+            _atomic_write(path, lambda tmp: df.to_parquet(tmp, index=False))
+        else:
+            _atomic_write(path, lambda tmp: df.to_csv(tmp, index=False))
+
+        self.parts.append({"file": filename, "runs": len(results), "rows": len(df)})
+        self.completed.update((result["point_id"], result["seed"]) for result in results)
+        self._write_manifest()
+
+    def read(self):
+        """
+        Read every stored run.
+
+        Returns:
+            pd.DataFrame: One row per (run, year), sorted by key and year
+        """
+        read = pd.read_parquet if self.export_format == "parquet" else pd.read_csv
+        frames = [read(os.path.join(self.directory, part["file"])) for part in self.parts]
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True)
+        return df.sort_values(["point_id", "replicate", "year"], ignore_index=True)
+
+    def points(self):
+        """Parameter points of the sweep, one row per point_id"""
+        return pd.DataFrame(self._manifest["points"])
+
+    def _write_manifest(self):
+        self._manifest["parts"] = self.parts
+        self._manifest["completed"] = sorted(self.completed)
+        _atomic_write(self.manifest_path, lambda tmp: _write_json(self._manifest, tmp))
+
+
+def run_sweep(spec, directory, workers=None, batch_size=50, export_format="auto", verbose=True,
+              cache=None):
+    """
+    Run every point of an experiment and append the results to its store.
+
+    Runs already recorded in the store are skipped, so re-running an
+    interrupted sweep only simulates the missing runs. With a result cache,
+    runs simulated by any earlier sweep (e.g. before points were added to
+    the spec) are read back instead of simulated.
+
+    Args:
+        spec: ExperimentSpec
+        directory: Result store directory
+        workers: Worker processes (default: one per CPU; 1 runs in-process)
+        batch_size: Finished runs per part file
+        export_format: "parquet", "csv" or "auto"
+        verbose: Print progress
+        cache: ResultCache shared by the workers (None = no caching)
+
+    Returns:
+        SweepStore
+    """
+    store = SweepStore(directory, spec, export_format)
+    tasks = [task for task in spec.tasks() if (task["point_id"], task["seed"]) not in store.completed]
+    total = len(tasks)
+    if verbose:
+        print(f"Sweep '{spec.name}': {total} runs to simulate "
+              f"({len(store.completed)} already in {directory})")
+    if not tasks:
+        return store
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, total))
+
+    finished = 0
+    batch = []
+
+    def record(result):
+        nonlocal finished
+        finished += 1
+        batch.append(result)
+        if len(batch) >= batch_size:
+            store.append(batch)
+            batch.clear()
+        if verbose:
+            print(f"  [sweep] {finished}/{total} runs finished")
+
+    try:
+        if workers == 1:
+            for task in tasks:
+                record(_run_task(task, cache))
+        else:
+            # Spawned workers, as in run_repetitions
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                pending = {pool.submit(_run_task, task, cache) for task in tasks}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future.result())
+    finally:
+        # Keep the runs that finished before an error or interruption
+        store.append(batch)
+
+    return store
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Run FIBE scenarios branching from a shared burn-in
+
+The burn-in is simulated once with the base configuration and checkpointed;
+every scenario then resumes from the checkpoint with its own overrides.
+
+Usage:
+    python scripts/run_scenarios.py configs/scenarios_example.json --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import traceback
+from pathlib import Path
+
+# Add parent directory to path to import code module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from code.loader import ConfigLoader
+from code.branching import run_burn_in, run_scenarios
+
+def main():
+    """
+    Command-line interface.
+    """
+    parser = argparse.ArgumentParser(
+        description='Run FIBE scenarios branching from a shared burn-in',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    
+    parser.add_argument(
+        'spec',
+        type=str,
+        help='Path to JSON scenario spec'
+    )
+    
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default=None,
+        help='Output directory (default: ./results/scenarios/<name>)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes (default: number of CPUs)'
+    )
+    
+    parser.add_argument(
+        '--reuse-burn-in',
+        action='store_true',
+        help='Branch from an existing burn-in checkpoint in the output directory'
+    )
+    
+    args = parser.parse_args()
+    
+    try:
+        with open(args.spec, 'r') as f:
+            spec = json.load(f)
+        name = spec.get("name", "scenarios")
+        directory = args.output_dir or os.path.join('./results/scenarios', name)
+        os.makedirs(directory, exist_ok=True)
+        
+        # Base configuration, relative to the spec file
+        base_config = spec.get("base_config", "config_default.json")
+        candidate = os.path.join(os.path.dirname(os.path.abspath(args.spec)), base_config)
+        if os.path.exists(candidate):
+            base_config = candidate
+        loader = ConfigLoader()
+        loader.load(base_config)
+        model_params = loader.get_model_params()
+        model_params["verbose"] = False
+        
+        checkpoint_path = os.path.join(directory, "burn_in.npz")
+        if args.reuse_burn_in and os.path.exists(checkpoint_path):
+            print(f"Reusing burn-in checkpoint {checkpoint_path}")
+        else:
+            print(f"Burn-in: {spec['burn_in_years']} years")
+            run_burn_in(model_params, spec["burn_in_years"], checkpoint_path,
+                        model_overrides=loader.get_parameter_overrides())
+        
+        print(f"Running {len(spec['scenarios'])} scenarios")
+        summary = run_scenarios(checkpoint_path, spec["scenarios"], workers=args.workers,
+                                output_dir=directory)
+        summary_path = os.path.join(directory, f"{name}_yearly_summary.csv")
+        summary.to_csv(summary_path, index=False)
+        print(f"Scenario summary: {summary_path}")
+        
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    except (KeyError, ValueError) as e:
+        print(f"ERROR: Invalid scenario spec - {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"ERROR: Scenarios failed - {e}", file=sys.stderr)
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
 """
-Run a single FIBE fishery simulation
+Run a FIBE fishery simulation (or a set of repetitions) from a JSON configuration
 
 Usage:
-    python scripts/run_simulation.py --years 25 --archipelago 30 --coastal 30 --trawler 30
+    python scripts/run_simulation.py configs/config_default.json
+    python scripts/run_simulation.py configs/config_default.json --repetitions 50 --workers 8
 """
 
 import argparse
+import json
+import os
 import sys
 import traceback
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+import multiprocessing
 from pathlib import Path
 
 # Add parent directory to path to import code module
@@ -16,23 +22,51 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from code.model import FisheryModel
 from code.loader import load_config
+from code.export import StreamingSink
+from code.cache import OUTPUTS, ResultCache
+from code.profiler import StepProfiler
+from code.ensemble import spawn_seeds, combine_yearly_data, summarize_ensemble
 
-def run_from_config(config_path, run_id=0):
+def run_from_config(config_path, run_id=0, stream=None, seed=None, output_dir='./results/',
+                    verbose=None, progress=None, resume=None, cache=None, profile=None):
     """
     Run simulation from JSON configuration.
     
     Args:
         config_path: Path to JSON configuration file
         run_id: Run identifier (for multiple repetitions)
+        stream: Stream data to disk during the run (None = use the
+            "stream_export" output setting)
+        seed: Random seed (None = use the "random_seed" simulation setting)
+        output_dir: Parent directory of the timestamped output directory
+            (exported data and the saved configuration)
+        verbose: Override the "verbose" simulation setting
+        progress: Callback progress(days_done, days_total), called once per
+            simulated year
+        resume: Checkpoint file to continue from (the configuration must be
+            the one the checkpointed run was started with)
+        cache: ResultCache (None = a cache in "cache_dir" if the
+            "cache_results" output setting is on). Seeded runs already in
+            the cache are not simulated again; streamed, resumed and
+            profiled runs are not cached
+        profile: Time the phases of every step and export the per-year
+            timing table with the data (None = use the "profile" output
+            setting)
         
     Returns:
-        FisheryModel: Completed model instance
+        FisheryModel: Completed model instance, or CachedRun (yearly_data
+            and collector dataframes) on a cache hit
     """
     loader = load_config(config_path)
     metadata = loader.get_metadata()
     model_params = loader.get_model_params()
     output_params = loader.get_output_params()
     
+    if verbose is not None:
+        model_params["verbose"] = verbose
+    if seed is not None:
+        model_params["seed"] = seed
+    
     if model_params["verbose"]:
         print("="*80)
         print(f"FIBE SIMULATION: {metadata['name']}")
@@ -45,27 +79,189 @@ def run_from_config(config_path, run_id=0):
               f"{model_params['num_trawler']} trawler")
         print("="*80 + "\n")
         
-    model = FisheryModel(**model_params)
-    
-    loader.apply_custom_parameters(model)
-    
-    model.run_model()
+    prefix = output_params["filename_prefix"]
+    if run_id > 0:
+        prefix = f"{prefix}_run{run_id:03d}"
+        
+    if stream is None:
+        stream = output_params["stream_export"]
+    streaming = stream and output_params["export_data"]
+    if profile is None:
+        profile = output_params["profile"]
     
-    if output_params["export_data"]:
-        prefix = output_params["filename_prefix"]
-        if run_id > 0:
-            prefix = f"{prefix}_run{run_id:03d}"
-            
-        timestamp = model.export_data(filename_prefix=prefix)
+    def export(result):
+        timestamp = result.export_data(filename_prefix=prefix, directory=output_dir)
         
-        config_output = f"{prefix}_config_{timestamp}.json"
+        config_output = os.path.join(output_dir, timestamp, f"{prefix}_config_{timestamp}.json")
         loader.save_config(config_output)
         
         if model_params["verbose"]:
             print(f"Configuration saved: {config_output}")
+    
+    if cache is None and output_params["cache_results"]:
+        cache = ResultCache(output_params["cache_dir"])
+    cache_key = None
+    outputs = OUTPUTS if output_params["export_data"] else ("yearly",)
+    if cache is not None and resume is None and not streaming and not profile:
+        cache_key = cache.key(model_params, model_params["seed"], loader.get_parameter_overrides(),
+                              outputs=outputs)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            cached.verbose = model_params["verbose"]
+            if model_params["verbose"]:
+                print(f"Result found in cache {cache.directory} ({cache_key[:12]})")
+            if output_params["export_data"]:
+                export(cached)
+            return cached
+        
+    if resume is not None:
+        # Parameters, state and streaming sink come from the checkpoint
+        model = FisheryModel.load_checkpoint(resume, verbose=model_params["verbose"])
+        if model_params["verbose"]:
+            print(f"Resumed from {resume} at day {model.current_step}")
+    else:
+        model = FisheryModel(**model_params, params=loader.get_params())
+        
+        if streaming:
+            model.attach_sink(StreamingSink(
+                filename_prefix=prefix,
+                directory=output_dir,
+                flush_interval=output_params["flush_interval_days"],
+                export_format=output_params["export_format"]
+            ))
+    
+    if profile:
+        model.attach_profiler(StepProfiler())
+    
+    checkpoint_interval = loader.loaded_config["simulation"]["checkpoint_interval_years"]
+    checkpoint_dir = output_params["checkpoint_dir"] or os.path.join(output_dir, f"{prefix}_checkpoints")
+    
+    if progress is None:
+        model.run_model(checkpoint_interval=checkpoint_interval, checkpoint_dir=checkpoint_dir)
+    else:
+        while model.running and model.current_step < model.end_of_sim:
+            model.run_model(steps=min(model.YEAR, model.end_of_sim - model.current_step),
+                            checkpoint_interval=checkpoint_interval, checkpoint_dir=checkpoint_dir)
+            progress(model.current_step, model.end_of_sim)
+    
+    if cache_key is not None:
+        cache.put_model(cache_key, model, outputs)
+    
+    if profile and model_params["verbose"]:
+        model.profiler.print_summary()
+    
+    if output_params["export_data"]:
+        export(model)
             
     return model
 
+def _run_replicate(config_path, run_id, seed, output_dir, stream, progress_queue):
+    """
+    Run one replicate in a worker process.
+    
+    Returns:
+        Dict with the run id, seed, output directory and yearly summaries
+    """
+    def progress(days_done, days_total):
+        progress_queue.put((run_id, days_done, days_total))
+    
+    os.makedirs(output_dir, exist_ok=True)
+    model = run_from_config(config_path, run_id=run_id, stream=stream, seed=seed,
+                            output_dir=output_dir, verbose=False, progress=progress)
+    return {
+        "run_id": run_id,
+        "seed": seed,
+        "output_dir": output_dir,
+        "yearly_data": model.yearly_data,
+    }
+
+def run_repetitions(config_path, repetitions, workers=None, root_seed=None, stream=None,
+                    output_dir='./results/'):
+    """
+    Run replicates of a configuration over a process pool.
+    
+    Every replicate gets its own seed (spawned from root_seed) and run
+    directory; progress is reported back as workers finish each year. The
+    yearly summaries of all replicates are combined into an ensemble
+    summary written next to the run directories.
+    
+    Args:
+        config_path: Path to JSON configuration file
+        repetitions: Number of replicates
+        workers: Number of worker processes (default: one per CPU, at most
+            one per replicate)
+        root_seed: Root seed (None = "random_seed" setting, or fresh entropy)
+        stream: Stream data to disk during each run (None = config setting)
+        output_dir: Parent directory of the ensemble directory
+        
+    Returns:
+        Tuple (ensemble directory, ensemble summary DataFrame)
+    """
+    loader = load_config(config_path)
+    prefix = loader.loaded_config["output"]["filename_prefix"]
+    if root_seed is None:
+        root_seed = loader.loaded_config["simulation"]["random_seed"]
+    entropy, seeds = spawn_seeds(repetitions, root_seed)
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, repetitions))
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ensemble_dir = os.path.join(output_dir, f"{prefix}_ensemble_{timestamp}")
+    os.makedirs(ensemble_dir, exist_ok=True)
+    
+    print(f"Running {repetitions} repetitions of {config_path} on {workers} workers")
+    print(f"Root seed entropy: {entropy}")
+    
+    # Spawned (not forked) workers: the progress manager runs a thread
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    with context.Manager() as manager, ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        progress_queue = manager.Queue()
+        futures = [
+            pool.submit(
+                _run_replicate, config_path, run_id, seed,
+                os.path.join(ensemble_dir, f"run_{run_id:03d}"), stream, progress_queue
+            )
+            for run_id, seed in enumerate(seeds, start=1)
+        ]
+        
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                runs.append(future.result())
+            _print_progress(progress_queue, len(runs), repetitions)
+    
+    runs.sort(key=lambda run: run["run_id"])
+    combined = combine_yearly_data(runs)
+    summary = summarize_ensemble(combined)
+    
+    combined.to_csv(os.path.join(ensemble_dir, f"{prefix}_ensemble_runs.csv"), index=False)
+    summary.to_csv(os.path.join(ensemble_dir, f"{prefix}_ensemble_summary.csv"), index=False)
+    with open(os.path.join(ensemble_dir, f"{prefix}_ensemble.json"), 'w') as f:
+        json.dump({
+            "config": str(config_path),
+            "repetitions": repetitions,
+            "workers": workers,
+            "root_seed_entropy": entropy,
+            "runs": [
+                {"run_id": run["run_id"], "seed": run["seed"], "output_dir": run["output_dir"]}
+                for run in runs
+            ],
+        }, f, indent=2)
+    
+    print(f"Ensemble summary written to {ensemble_dir}")
+    return ensemble_dir, summary
+
+def _print_progress(progress_queue, finished, repetitions):
+    """Print the progress messages sent by the workers"""
+    while not progress_queue.empty():
+        run_id, days_done, days_total = progress_queue.get()
+        print(f"  [run {run_id:03d}] year {days_done // 365}/{days_total // 365} "
+              f"({finished}/{repetitions} runs finished)")
+
 def main():
     """
     Command-line interface.
@@ -88,13 +284,69 @@ def main():
         help='Run identifier (for batch experiments)'
     )
     
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        default=None,
+        help='Stream data to disk during the run (overrides output.stream_export)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        default=None,
+        help='Time the phases of every step and export the timing table (overrides output.profile)'
+    )
+    
+    parser.add_argument(
+        '--repetitions',
+        type=int,
+        default=None,
+        help='Number of replicates (default: simulation.repetitions)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for repetitions (default: number of CPUs)'
+    )
+    
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Random seed, or root seed of the repetitions (default: simulation.random_seed)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        type=str,
+        default=None,
+        help='Continue a run from a checkpoint file'
+    )
+    
     args = parser.parse_args()
     
     try:
-        model = run_from_config(args.config, args.run_id)
-        
-        if model.verbose:
-            print("\n Simulation completed successfully")
+        repetitions = args.repetitions
+        if repetitions is None:
+            repetitions = load_config(args.config).loaded_config["simulation"]["repetitions"]
+            
+        if repetitions > 1:
+            # Single-run options: replicates get their own run ids and seeds
+            for option, value in (("--run-id", args.run_id), ("--resume", args.resume),
+                                  ("--profile", args.profile)):
+                if value:
+                    parser.error(f"{option} only applies to a single run (got {repetitions} repetitions)")
+            run_repetitions(args.config, repetitions, workers=args.workers,
+                            root_seed=args.seed, stream=args.stream)
+        else:
+            model = run_from_config(args.config, args.run_id, stream=args.stream, seed=args.seed,
+                                    resume=args.resume, profile=args.profile)
+            
+            if model.verbose:
+                print("\n Simulation completed successfully")
             
     except FileNotFoundError as e:
         print(f"ERROR: {e}", file=sys.stderr)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Run a FIBE parameter sweep from a JSON experiment spec
+
+Usage:
+    python scripts/run_sweep.py configs/sweep_example.json --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import traceback
+from pathlib import Path
+
+# Add parent directory to path to import code module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from code.sweep import ExperimentSpec, SweepStore, run_sweep
+from code.cache import ResultCache
+
+def main():
+    """
+    Command-line interface.
+    """
+    parser = argparse.ArgumentParser(
+        description='Run a FIBE parameter sweep from a JSON experiment spec',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    
+    parser.add_argument(
+        'spec',
+        type=str,
+        help='Path to JSON experiment spec'
+    )
+    
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default=None,
+        help='Result store directory (default: ./results/sweeps/<name>)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes (default: number of CPUs)'
+    )
+    
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=50,
+        help='Finished runs per result part file'
+    )
+    
+    parser.add_argument(
+        '--format',
+        choices=['auto', 'parquet', 'csv'],
+        default='auto',
+        help='Result file format'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=None,
+        help='Result cache shared between sweeps (default: no cache)'
+    )
+    
+    parser.add_argument(
+        '--cache-size',
+        type=float,
+        default=None,
+        help='Disk budget of the result cache in GB (default: config.CACHE_MAX_BYTES)'
+    )
+    
+    args = parser.parse_args()
+    
+    try:
+        with open(args.spec, 'r') as f:
+            spec_data = json.load(f)
+        directory = args.output_dir or os.path.join('./results/sweeps', spec_data.get("name", "sweep"))
+        
+        # Resuming a spec without a root seed: reuse the stored entropy
+        manifest_path = os.path.join(directory, SweepStore.MANIFEST)
+        spec = ExperimentSpec.load(args.spec)
+        if spec_data.get("root_seed") is None and os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                stored_seed = json.load(f)["spec"]["root_seed"]
+            spec = ExperimentSpec.from_dict(dict(spec.to_dict(), root_seed=stored_seed))
+        
+        cache = None
+        if args.cache_dir is not None:
+            max_bytes = None if args.cache_size is None else int(args.cache_size * 1024**3)
+            cache = ResultCache(args.cache_dir, max_bytes)
+        
+        store = run_sweep(spec, directory, workers=args.workers, batch_size=args.batch_size,
+                          export_format=args.format, cache=cache)
+        print(f"Sweep results: {len(store.completed)} runs in {directory} "
+              f"(root seed entropy: {spec.root_seed})")
+        
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"ERROR: Invalid experiment - {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"ERROR: Sweep failed - {e}", file=sys.stderr)
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Tests pour les décisions groupées des pêcheurs de l'archipel
+"""
+
+import sys
+import os
+import random
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.agent import FisherAgent
+from code.model import FisheryModel
+from code.params import FibeParams
+
+_SKIPPED_FIELDS = {"model", "memory", "good_spots_memory", "decision_rng"}
+
+
+def _model(batch, params=None, seed=3):
+    model = FisheryModel(end_of_sim=730, num_archipelago=40, num_coastal=5, num_trawler=5,
+                         verbose=False, seed=seed, params=params)
+    model.batch_decisions = batch
+    return model
+
+
+def _fields(agent):
+    return {k: v for k, v in vars(agent).items() if k not in _SKIPPED_FIELDS}
+
+
+def test_batch_matches_agent_rule():
+    """Test la règle groupée face à satisfice_lifestyle sur des états aléatoires"""
+    print("=" * 60)
+    print("TEST 1: Règle de satisfaction groupée")
+    print("=" * 60)
+
+    rng = random.Random(4)
+    batch_model, reference_model = _model(True), _model(False)
+    batch_model.run_model(steps=60)
+    reference_model.run_model(steps=60)
+    batch = [a for a in batch_model.agents if a.fisher_type == "archipelago"]
+    reference = [a for a in reference_model.agents if a.fisher_type == "archipelago"]
+    for _ in range(50):
+        bad_weather = rng.random() < 0.3
+        batch_model.bad_weather = reference_model.bad_weather = bad_weather
+        for a, b in zip(batch, reference):
+            a.capital = b.capital = rng.choice([-500.0, -0.5, 0.0, 3.5, 1000.0])
+            a.growth_perception = b.growth_perception = rng.choice([-1.0, -0.1, -0.05, 0.0, 0.2])
+            a.lay_low = b.lay_low = rng.random() < 0.3
+            a.lay_low_counter = b.lay_low_counter = rng.randrange(0, 4)
+            a.region_preference = b.region_preference = rng.choice([None, "A", "B"])
+        FisherAgent.satisfice_lifestyle_batch(batch)
+        for a, b in zip(batch, reference):
+            b.satisfice_lifestyle()
+            assert not a.decision_pending
+            a.decision_pending = True
+            assert _fields(a) == _fields(b)
+    print("✓ Test réussi\n")
+
+
+def test_runs_identical():
+    """Test des simulations avec et sans décisions groupées"""
+    print("=" * 60)
+    print("TEST 2: Simulations identiques")
+    print("=" * 60)
+
+    scenarios = [
+        None,
+        FibeParams.from_config(BAD_WEATHER_PROBABILITY=0.4, FISH_PRICE=4.0, INITIAL_CAPITAL=50),
+        FibeParams.from_config(FISH_PRICE=1.0, INITIAL_CAPITAL=0, NEGATIVE_CAPITAL_LAYLOW_PROBABILITY=0.8),
+    ]
+    for params in scenarios:
+        batch_model, reference_model = _model(True, params), _model(False, params)
+        batch_model.run_model()
+        reference_model.run_model()
+        assert (batch_model.datacollector.get_agent_vars_dataframe()
+                .equals(reference_model.datacollector.get_agent_vars_dataframe()))
+        assert (batch_model.datacollector.get_model_vars_dataframe()
+                .equals(reference_model.datacollector.get_model_vars_dataframe()))
+        for a, b in zip(batch_model.agents, reference_model.agents):
+            assert _fields(a) == _fields(b)
+            assert list(a.memory) == list(b.memory)
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests des décisions groupées"""
+    test_batch_matches_agent_rule()
+    test_runs_identical()
+    print("✓ Tous les tests des décisions groupées ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
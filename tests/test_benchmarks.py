@@ -0,0 +1,83 @@
+"""
+Tests pour la suite de benchmarks
+"""
+
+import sys
+import os
+import tempfile
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.model import FisheryModel
+from benchmarks.run_benchmarks import (
+    SUITES, append_history, case, compare, load_history, measure, scaled_params
+)
+
+
+def test_cases_and_grids():
+    """Test les cas des suites et les grilles agrandies"""
+    print("=" * 60)
+    print("TEST 1: Cas et grilles")
+    print("=" * 60)
+
+    names = [c["name"] for c in SUITES["full"]]
+    assert len(names) == len(set(names))
+    fleets = {c["num_trawler"] for c in SUITES["full"]}
+    assert min(fleets) == 10 and max(fleets) == 10000
+    assert {(c["width"], c["height"]) for c in SUITES["full"]} >= {(50, 56), (1000, 1000)}
+    assert {c["years"] for c in SUITES["full"]} >= {1, 50}
+
+    # Même disposition, coordonnées mises à l'échelle
+    params = scaled_params(100, 112)
+    assert params.REGION_D == ((50, 100), (48, 112))
+    assert params.HOTSPOTS_A[0] == (14, 6)
+    model = FisheryModel(end_of_sim=10, num_archipelago=1, num_coastal=1, num_trawler=1,
+                         verbose=False, seed=1, params=params)
+    assert (model.grid.width, model.grid.height) == (100, 112)
+    assert model.get_patch_info(14, 6)["region"] == "A"
+    assert model.get_patch_info(75, 20)["region"] == "LAND"
+    print("✓ Test réussi\n")
+
+
+def test_measure_and_compare():
+    """Test la mesure d'un cas, l'historique et la détection des régressions"""
+    print("=" * 60)
+    print("TEST 2: Mesure et comparaison")
+    print("=" * 60)
+
+    bench_case = case((2, 1, 1), years=1)
+    result = measure(bench_case)
+    assert result["status"] == "ok"
+    assert result["steps"] == 365 and result["agents"] == 4
+    assert result["steps_per_second"] > 0
+    assert {"weather", "agents", "collect", "fish_stock", "agents.trawler"} <= set(result["phases"])
+
+    baseline = {"commit": "abc", "results": [result]}
+    assert compare({"results": [result]}, baseline) == []
+    slower = dict(result, steps_per_second=result["steps_per_second"] * 0.8)
+    heavier = dict(result, peak_rss_mb=(result["peak_rss_mb"] or 100) * 1.5)
+    assert [r[1] for r in compare({"results": [slower]}, baseline)] == ["steps_per_second"]
+    assert compare({"results": [slower]}, baseline, tolerance=0.25) == []
+    if result["peak_rss_mb"] is not None:
+        assert [r[1] for r in compare({"results": [heavier]}, baseline)] == ["peak_rss_mb"]
+    timed_out = {"name": result["name"], "status": "timeout"}
+    assert compare({"results": [timed_out]}, baseline)[0][:2] == (result["name"], "status")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.json")
+        append_history(baseline, path)
+        append_history(baseline, path)
+        assert len(load_history(path)) == 2
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests des benchmarks"""
+    test_cases_and_grids()
+    test_measure_and_compare()
+    print("✓ Tous les tests des benchmarks ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,162 @@
+"""
+Tests pour les scénarios lancés depuis un point de reprise commun
+"""
+
+import sys
+import os
+import tempfile
+
+import pandas as pd
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code import config
+from code.model import FisheryModel
+from code.branching import apply_overrides, run_branch, run_burn_in, run_scenarios
+
+
+def _params():
+    return {"end_of_sim": 2 * 365, "num_archipelago": 3, "num_coastal": 3, "num_trawler": 3,
+            "verbose": False, "seed": 5}
+
+
+def test_fleet_size_and_checkpoint():
+    """Test le changement de flotte et sa sauvegarde"""
+    print("=" * 60)
+    print("TEST 1: Changement de flotte")
+    print("=" * 60)
+
+    model = FisheryModel(**_params())
+    model.run_model(steps=30)
+    ids = [a.unique_id for a in model.agents]
+
+    model.set_fleet_size("trawler", 1)
+    model.set_fleet_size("coastal", 5)
+    assert model.num_trawler == 1 and model.num_coastal == 5
+    types = [a.fisher_type for a in model.agents]
+    assert types.count("trawler") == 1 and types.count("coastal") == 5
+    # Les plus récents sont retirés, les nouveaux ont des identifiants neufs
+    new_ids = [a.unique_id for a in model.agents]
+    assert ids[6] in new_ids and ids[7] not in new_ids
+    assert new_ids[-2:] == [9, 10]
+
+    try:
+        model.set_fleet_size("whaler", 2)
+        assert False, "Type inconnu accepté"
+    except ValueError:
+        pass
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fleet.npz")
+        model.save_checkpoint(path)
+        resumed = FisheryModel.load_checkpoint(path)
+        assert [a.unique_id for a in resumed.agents] == new_ids
+        assert [a.fisher_type for a in resumed.agents] == types
+        assert resumed.next_agent_id == model.next_agent_id
+
+        model.run_model(steps=100)
+        resumed.run_model(steps=100)
+        pd.testing.assert_frame_equal(model.datacollector.get_model_vars_dataframe(),
+                                      resumed.datacollector.get_model_vars_dataframe())
+    print("✓ Test réussi\n")
+
+
+def test_overrides():
+    """Test l'application des modifications d'un scénario"""
+    print("=" * 60)
+    print("TEST 2: Modifications d'un scénario")
+    print("=" * 60)
+
+    model = FisheryModel(**_params())
+    model.run_model(steps=365)
+    constants = apply_overrides(model, {
+        "FISH_PRICE": 14.0,
+        "BAD_WEATHER_PROBABILITY": 0.3,
+        "num_archipelago": 1,
+        "end_of_sim": 3 * 365,
+        "STOCK_CHECK_TOLERANCE": 1e-6,
+    })
+    # Les paramètres du modèle vont dans ses FibeParams, le reste dans config
+    assert constants == {"STOCK_CHECK_TOLERANCE": 1e-6}
+    assert model.params.FISH_PRICE == 14.0
+    assert model.FISH_PRICE == 14.0
+    assert model.bad_weather_probability == 0.3
+    assert model.num_archipelago == 1
+    assert model.end_of_sim == 3 * 365
+    assert config.FISH_PRICE != 14.0
+
+    # Paramètres recopiés par les pêcheurs à leur création
+    apply_overrides(model, {"DEFAULT_MEMORY_SIZE": 5, "COASTAL_COST_EXISTENCE": 2.5,
+                            "model.HIGH_COST_EXISTENCE": 9.0, "SATISFACTION_HOME_THRESHOLD": 0.8})
+    for agent in model.agents:
+        assert agent.memory_size == 5 and agent.memory.capacity == 5 and len(agent.memory) == 5
+        assert agent.satisfaction_home_threshold == 0.8
+        assert agent.cost_existence == {"archipelago": model.params.ARCHIPELAGO_COST_EXISTENCE,
+                                        "coastal": 2.5, "trawler": 9.0}[agent.fisher_type]
+
+    for bad in ({"end_of_sim": 100}, {"model.no_such_attribute": 1},
+                {"INITIAL_CAPITAL": 5000.0}, {"MAX_AGE": 90}):
+        try:
+            apply_overrides(model, bad)
+            assert False, f"Modification invalide acceptée: {bad}"
+        except ValueError:
+            pass
+    print("✓ Test réussi\n")
+
+
+def test_scenarios_from_burn_in():
+    """Test des scénarios parallèles depuis un burn-in commun"""
+    print("=" * 60)
+    print("TEST 3: Scénarios depuis un burn-in")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "burn_in.npz")
+        burn_in = run_burn_in(_params(), 1, path)
+        assert burn_in.current_step == 365
+
+        scenarios = {
+            "baseline": {},
+            "high_price": {"FISH_PRICE": 20.0},
+            "small_fleet": {"num_trawler": 1},
+            "short_memory": {"DEFAULT_MEMORY_SIZE": 5},
+        }
+        summary = run_scenarios(path, scenarios, workers=2, output_dir=directory, verbose=False)
+        assert list(summary["scenario"].unique()) == list(scenarios)
+        assert len(summary) == 2 * len(scenarios)
+        assert os.path.isdir(os.path.join(directory, "high_price"))
+
+        # Les années de burn-in sont communes
+        first_year = summary[summary.year == 1]
+        assert first_year["total_catch_all"].nunique() == 1
+
+        # Le baseline poursuit exactement le run sans interruption
+        reference = FisheryModel(**_params())
+        reference.run_model()
+        baseline = summary[summary.scenario == "baseline"].drop(columns="scenario")
+        pd.testing.assert_frame_equal(baseline.reset_index(drop=True),
+                                      pd.DataFrame(reference.yearly_data))
+
+        # Même résultat en un seul processus
+        model = run_branch(path, scenarios["small_fleet"])
+        small_fleet = summary[summary.scenario == "small_fleet"]
+        assert small_fleet["total_catch_all"].tolist() == [y["total_catch_all"] for y in model.yearly_data]
+        assert config.FISH_PRICE != 20.0
+        # Une mémoire plus courte change les résultats après le burn-in
+        short_memory = summary[summary.scenario == "short_memory"]
+        assert (short_memory["total_catch_all"].tolist()
+                != baseline["total_catch_all"].tolist())
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests de scénarios"""
+    test_fleet_size_and_checkpoint()
+    test_overrides()
+    test_scenarios_from_burn_in()
+    print("✓ Tous les tests de scénarios ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
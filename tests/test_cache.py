@@ -0,0 +1,155 @@
+"""
+Tests pour le cache des résultats de simulation
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+
+import pandas as pd
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.model import FisheryModel
+from code.cache import CachedRun, ResultCache, run_key
+from code.sweep import ExperimentSpec, run_sweep
+from scripts.run_simulation import run_from_config
+
+
+def _params():
+    return {"end_of_sim": 60, "num_archipelago": 2, "num_coastal": 2, "num_trawler": 2, "verbose": False}
+
+
+def test_run_keys():
+    """Test les clés du cache"""
+    print("=" * 60)
+    print("TEST 1: Clés du cache")
+    print("=" * 60)
+
+    key = run_key(_params(), 1)
+    assert key == run_key(dict(_params(), verbose=True), 1)
+    assert key != run_key(_params(), 2)
+    assert key != run_key(dict(_params(), num_trawler=3), 1)
+    assert key != run_key(_params(), 1, model_overrides={"FISH_PRICE": 12.0})
+    assert key != run_key(_params(), 1, config_overrides={"GROWTH_RATE": 0.2})
+    assert key != run_key(_params(), 1, outputs=("yearly", "model"))
+    # Réglages sans effet sur les résultats
+    for name, value in (("STOCK_CHECK_INTERVAL", 30), ("STOCK_CHECK_TOLERANCE", 1e-6),
+                        ("LANDSCAPE_CACHE_DIR", "/tmp/landscapes"),
+                        ("BATCH_ARCHIPELAGO_DECISIONS", False)):
+        assert key == run_key(_params(), 1, config_overrides={name: value})
+    assert key == run_key(dict(_params(), stock_check_interval=30), 1)
+    # Sans graine, le run n'est pas reproductible
+    assert run_key(_params(), None) is None
+
+    try:
+        run_key(_params(), 1, outputs=("patches",))
+        assert False, "Sortie inconnue acceptée"
+    except ValueError:
+        pass
+    print("✓ Test réussi\n")
+
+
+def test_store_and_eviction():
+    """Test le stockage des sorties et l'éviction LRU"""
+    print("=" * 60)
+    print("TEST 2: Stockage et éviction")
+    print("=" * 60)
+
+    model = FisheryModel(seed=3, **dict(_params(), end_of_sim=400))
+    model.run_model()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(directory)
+        outputs = ("yearly", "model", "agent")
+        key = cache.key(_params(), 3, outputs=outputs)
+        assert cache.get(key) is None
+        cache.put_model(key, model, outputs)
+
+        cached = cache.get(key)
+        assert isinstance(cached, CachedRun)
+        assert cached.yearly_data == model.yearly_data
+        pd.testing.assert_frame_equal(cached.model_vars, model.datacollector.get_model_vars_dataframe())
+        pd.testing.assert_frame_equal(cached.agent_vars, model.datacollector.get_agent_vars_dataframe())
+        # Types des colonnes conservés (régions avec valeurs manquantes comprises)
+        assert cached.agent_vars["current_region"].dtype == object
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # Budget de deux entrées: la moins récemment utilisée est supprimée
+        cache.clear()
+        keys = [cache.key(_params(), seed) for seed in (10, 11, 12)]
+        cache.put(keys[0], [{"year": 1}])
+        time.sleep(0.05)
+        cache.put(keys[1], [{"year": 2}])
+        cache.max_bytes = cache.size()
+        time.sleep(0.05)
+        assert cache.get(keys[0]) is not None
+        time.sleep(0.05)
+        cache.put(keys[2], [{"year": 3}])
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]).yearly_data == [{"year": 1}]
+        assert cache.get(keys[2]).yearly_data == [{"year": 3}]
+        assert cache.size() <= cache.max_bytes
+    print("✓ Test réussi\n")
+
+
+def test_cached_runs():
+    """Test les runs et balayages servis par le cache"""
+    print("=" * 60)
+    print("TEST 3: Runs et balayages en cache")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_dir = os.path.join(directory, "cache")
+        config_path = os.path.join(directory, "cached.json")
+        with open(config_path, 'w') as f:
+            json.dump({
+                "metadata": {"name": "cache"},
+                "simulation": {"duration_years": 1, "verbose": False, "random_seed": 21},
+                "agents": {"num_archipelago": 2, "num_coastal": 2, "num_trawler": 2},
+                "output": {"export_data": True, "cache_results": True, "cache_dir": cache_dir},
+            }, f)
+
+        model_files = []
+        for name in ("simulated", "cached"):
+            output_dir = os.path.join(directory, name)
+            result = run_from_config(config_path, output_dir=output_dir)
+            run = os.listdir(output_dir)[0]
+            with open(os.path.join(output_dir, run, f"fibe_output_model_{run}.csv")) as f:
+                model_files.append(f.read())
+            if name == "simulated":
+                assert isinstance(result, FisheryModel)
+                model = result
+        assert isinstance(result, CachedRun)
+        assert result.yearly_data == model.yearly_data
+        # Fichiers exportés identiques, à la dernière décimale près
+        assert model_files[0] == model_files[1]
+        # Une autre graine n'est pas servie par le cache
+        result = run_from_config(config_path, seed=22, output_dir=os.path.join(directory, "other"))
+        assert isinstance(result, FisheryModel)
+
+        # Un balayage élargi ne refait que les nouveaux points
+        cache = ResultCache(cache_dir)
+        spec = ExperimentSpec("cache", {"FISH_PRICE": [8.0, 12.0]}, base_config=config_path, root_seed=5)
+        first = run_sweep(spec, os.path.join(directory, "sweep1"), workers=1, verbose=False, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 2)
+        spec = ExperimentSpec("cache", {"FISH_PRICE": [8.0, 12.0, 16.0]}, base_config=config_path, root_seed=5)
+        second = run_sweep(spec, os.path.join(directory, "sweep2"), workers=1, verbose=False, cache=cache)
+        assert (cache.hits, cache.misses) == (2, 3)
+        pd.testing.assert_frame_equal(first.read(), second.read()[second.read().point_id < 2])
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests du cache"""
+    test_run_keys()
+    test_store_and_eviction()
+    test_cached_runs()
+    print("✓ Tous les tests du cache ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
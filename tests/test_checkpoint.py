@@ -0,0 +1,138 @@
+"""
+Tests pour les points de reprise (checkpoints) du modèle
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code import config
+from code.model import FisheryModel
+from code.checkpoint import encode_values, decode_values, encode_records, decode_records, read_archive
+from code.export import StreamingSink, read_table
+
+
+def _model(days, **kwargs):
+    return FisheryModel(end_of_sim=days, num_archipelago=3, num_coastal=3, num_trawler=3,
+                        verbose=False, seed=9, **kwargs)
+
+
+def _assert_same_run(expected, actual):
+    pd.testing.assert_frame_equal(expected.datacollector.get_model_vars_dataframe(),
+                                  actual.datacollector.get_model_vars_dataframe())
+    pd.testing.assert_frame_equal(expected.datacollector.get_agent_vars_dataframe(),
+                                  actual.datacollector.get_agent_vars_dataframe())
+    assert expected.yearly_data == actual.yearly_data
+    assert np.array_equal(expected.patches.fish_stock, actual.patches.fish_stock)
+    for a, b in zip(expected.agents, actual.agents):
+        assert a.memory == b.memory
+        assert a.good_spots_memory == b.good_spots_memory
+        assert a.capital == b.capital and type(a.capital) is type(b.capital)
+
+
+def test_value_encoding():
+    """Test l'encodage des valeurs et des enregistrements"""
+    print("=" * 60)
+    print("TEST 1: Encodage des valeurs")
+    print("=" * 60)
+
+    values = [None, True, 3, 2.5, "A", (7, 3), ["A", "B"], {(1, 2): 0.5}, 2**70, np.float64(1.5)]
+    decoded = decode_values(encode_values(values))
+    assert decoded == [None, True, 3, 2.5, "A", (7, 3), ["A", "B"], {(1, 2): 0.5}, 2**70, 1.5]
+    assert [type(v) for v in decoded[:6]] == [type(None), bool, int, float, str, tuple]
+
+    groups = [
+        [{"location": (7, 3), "catch": 50, "region": "A"},
+         {"location": None, "catch": 0, "region": None, "went_fishing": False}],
+        [],
+        [{"location": (1, 1), "catch": 12.5, "region": "B"}],
+    ]
+    assert decode_records(encode_records(groups)) == groups
+    assert decode_records(encode_records([[], []])) == [[], []]
+    print("✓ Test réussi\n")
+
+
+def test_resume_matches_uninterrupted_run():
+    """Test qu'une reprise donne exactement le même run"""
+    print("=" * 60)
+    print("TEST 2: Reprise identique au run complet")
+    print("=" * 60)
+
+    for kwargs in ({}, {"per_agent_streams": True, "agent_collection": "weekly"}):
+        reference = _model(800, **kwargs)
+        reference.run_model()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.npz")
+            model = _model(800, **kwargs)
+            model.run_model(steps=400)
+            model.save_checkpoint(path)
+
+            # Format binaire sans pickle
+            state = read_archive(path)
+            assert state["clock"]["current_step"] == 400
+
+            resumed = FisheryModel.load_checkpoint(path)
+            assert resumed.current_step == 400
+            assert resumed.steps == 400
+            resumed.run_model()
+
+        assert resumed.current_step == 800
+        _assert_same_run(reference, resumed)
+    print("✓ Test réussi\n")
+
+
+def test_periodic_checkpoints_and_stream():
+    """Test les checkpoints automatiques de run_model avec export en flux"""
+    print("=" * 60)
+    print("TEST 3: Checkpoints périodiques et export en flux")
+    print("=" * 60)
+
+    reference = _model(3 * 365)
+    reference.run_model()
+
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoints = os.path.join(directory, "checkpoints")
+        model = _model(3 * 365)
+        sink = StreamingSink("ck", directory, flush_interval=100, timestamp="run")
+        model.attach_sink(sink)
+        model.run_model(checkpoint_interval=1, checkpoint_dir=checkpoints)
+        # Pas de checkpoint après le dernier jour, les plus anciens sont supprimés
+        assert sorted(os.listdir(checkpoints)) == [
+            f"checkpoint_year{year:03d}.npz" for year in range(3 - config.CHECKPOINT_KEEP, 3)
+        ]
+        model.export_data()
+
+        # Reprise à la fin de l'année 1: les parties suivantes sont réécrites
+        shutil.copytree(os.path.join(directory, "run"), os.path.join(directory, "full"))
+        os.remove(os.path.join(directory, "run", "ck_manifest.json"))
+        resumed = FisheryModel.load_checkpoint(os.path.join(checkpoints, "checkpoint_year001.npz"))
+        assert resumed.sink is not None and resumed.sink.parts["model"]
+        resumed.run_model()
+        resumed.export_data()
+
+        streamed = read_table(os.path.join(directory, "run", "ck_manifest.json"), "model")
+        full = read_table(os.path.join(directory, "full", "ck_manifest.json"), "model")
+        pd.testing.assert_frame_equal(streamed, full)
+        assert list(streamed["current_step"]) == list(range(3 * 365))
+        assert resumed.yearly_data == reference.yearly_data
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests de checkpoint"""
+    test_value_encoding()
+    test_resume_matches_uninterrupted_run()
+    test_periodic_checkpoints_and_stream()
+    print("✓ Tous les tests de checkpoint ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
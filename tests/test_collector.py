@@ -0,0 +1,277 @@
+"""
+Tests pour la collecte de données (rapporteur de modèle fusionné)
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mesa.datacollection import DataCollector
+import pandas as pd
+
+from code.model import FisheryModel
+from code.collector import (
+    MODEL_REPORTER_COLUMNS, FLOW_COLUMNS, compute_model_metrics, AgentHistoryRecorder, cadence_interval
+)
+from code.loader import ConfigLoader
+
+
+# Anciens rapporteurs (un lambda par colonne), pour comparaison
+REFERENCE_REPORTERS = {
+    "stock_A": lambda m: m.get_region_stock("A"),
+    "stock_B": lambda m: m.get_region_stock("B"),
+    "stock_C": lambda m: m.get_region_stock("C"),
+    "stock_D": lambda m: m.get_region_stock("D"),
+    "total_stock": lambda m: m.get_total_stock(),
+    "stock_below_MSY_A": lambda m: 1 if m.get_region_stock("A") < m.MSY_STOCK_A else 0,
+    "stock_below_MSY_B": lambda m: 1 if m.get_region_stock("B") < m.MSY_STOCK_B else 0,
+    "stock_below_MSY_C": lambda m: 1 if m.get_region_stock("C") < m.MSY_STOCK_C else 0,
+    "stock_below_MSY_D": lambda m: 1 if m.get_region_stock("D") < m.MSY_STOCK_D else 0,
+    "num_agents": lambda m: len(list(m.agents)),
+    "num_archipelago": lambda m: sum(1 for a in m.agents if a.fisher_type == "archipelago"),
+    "num_coastal": lambda m: sum(1 for a in m.agents if a.fisher_type == "coastal"),
+    "num_trawler": lambda m: sum(1 for a in m.agents if a.fisher_type == "trawler"),
+    "num_fishing": lambda m: sum(1 for a in m.agents if a.gone_fishing),
+    "num_at_home": lambda m: sum(1 for a in m.agents if a.at_home),
+    "num_bankrupt": lambda m: sum(1 for a in m.agents if a.bankrupt),
+    "total_catch_daily": lambda m: sum(a.accumulated_catch for a in m.agents),
+    "total_catch_cumulative": lambda m: sum(a.total_catch for a in m.agents),
+    "total_catch": lambda m: m.get_total_catch_all_agents(),
+    "avg_catch_per_agent": lambda m: m._safe_mean([a.total_catch for a in m.agents]),
+    "catch_region_A": lambda m: sum(a.accumulated_catch for a in m.agents if a.current_region == "A"),
+    "catch_region_B": lambda m: sum(a.accumulated_catch for a in m.agents if a.current_region == "B"),
+    "catch_region_C": lambda m: sum(a.accumulated_catch for a in m.agents if a.current_region == "C"),
+    "catch_region_D": lambda m: sum(a.accumulated_catch for a in m.agents if a.current_region == "D"),
+    "total_capital": lambda m: sum(a.capital for a in m.agents),
+    "avg_capital": lambda m: m._safe_mean([a.capital for a in m.agents]),
+    "median_capital": lambda m: m._safe_median([a.capital for a in m.agents]),
+    "min_capital": lambda m: min([a.capital for a in m.agents]) if len(list(m.agents)) > 0 else 0,
+    "max_capital": lambda m: max([a.capital for a in m.agents]) if len(list(m.agents)) > 0 else 0,
+    "total_profit": lambda m: sum(a.total_profit for a in m.agents),
+    "avg_profit": lambda m: m._safe_mean([a.total_profit for a in m.agents]),
+    "total_revenue": lambda m: sum(a.total_revenue for a in m.agents),
+    "total_costs": lambda m: sum(a.total_cost for a in m.agents),
+    "gini_capital": lambda m: m.calculate_gini([a.capital for a in m.agents]),
+    "gini_wealth": lambda m: m.calculate_gini([a.wealth for a in m.agents]),
+    "gini_catch": lambda m: m.calculate_gini([a.total_catch for a in m.agents]),
+    "avg_days_at_sea": lambda m: m._safe_mean([a.days_at_sea for a in m.agents]),
+    "total_trips": lambda m: sum(a.profitable_trip + a.unprofitable_trip for a in m.agents),
+    "avg_success_rate": lambda m: m._safe_mean([
+        a.profitable_trip / (a.profitable_trip + a.unprofitable_trip)
+        if (a.profitable_trip + a.unprofitable_trip) > 0 else 0
+        for a in m.agents
+    ]),
+    "avg_growth_perception": lambda m: m._safe_mean([a.growth_perception for a in m.agents]),
+    "num_perceive_scarcity": lambda m: sum(1 for a in m.agents if getattr(a, 'perceive_scarcity', False)),
+    "avg_memory_size": lambda m: m._safe_mean([len(a.memory) for a in m.agents]),
+    "bad_weather": lambda m: 1 if m.bad_weather else 0,
+    "current_step": lambda m: m.current_step,
+    "current_year": lambda m: m.current_step // m.YEAR,
+    "current_day_of_year": lambda m: m.current_step % m.YEAR,
+}
+
+
+def _assert_same_metrics(model):
+    metrics = compute_model_metrics(model)
+    for name, reporter in REFERENCE_REPORTERS.items():
+        expected = reporter(model)
+        assert metrics[name] == expected, (name, metrics[name], expected)
+        assert type(metrics[name]) is type(expected), name
+
+
+def test_columns_unchanged():
+    """Test que les colonnes du dataframe de modèle sont inchangées"""
+    print("=" * 60)
+    print("TEST 1: Colonnes du dataframe de modèle")
+    print("=" * 60)
+
+    model = FisheryModel(end_of_sim=5, num_archipelago=2, num_coastal=2, num_trawler=2, verbose=False)
+    model.run_model()
+
+    df = model.datacollector.get_model_vars_dataframe()
+    assert tuple(df.columns) == MODEL_REPORTER_COLUMNS
+    assert tuple(REFERENCE_REPORTERS) == MODEL_REPORTER_COLUMNS
+    assert len(df) == 5
+    print("✓ Test réussi\n")
+
+
+def test_fused_metrics_match_reference():
+    """Test que le passage unique donne exactement les valeurs des anciens lambdas"""
+    print("=" * 60)
+    print("TEST 2: Métriques fusionnées vs rapporteurs individuels")
+    print("=" * 60)
+
+    # Modèle vide (toutes les moyennes et Gini valent 0)
+    empty = FisheryModel(end_of_sim=5, num_archipelago=0, num_coastal=0, num_trawler=0, verbose=False)
+    _assert_same_metrics(empty)
+
+    model = FisheryModel(end_of_sim=400, num_archipelago=8, num_coastal=7, num_trawler=6, verbose=False)
+    for day in range(400):
+        model.step()
+        if day % 20 == 0:
+            _assert_same_metrics(model)
+
+    # Capitaux négatifs et régions renseignées
+    agents = list(model.agents)
+    agents[0].capital = -500
+    agents[1].capital = -0.5
+    agents[2].current_region = "B"
+    agents[2].accumulated_catch = 12.5
+    _assert_same_metrics(model)
+    print("✓ Test réussi\n")
+
+
+def test_agent_history_matches_mesa():
+    """Test que l'historique en colonnes donne le même dataframe que Mesa"""
+    print("=" * 60)
+    print("TEST 3: Historique des agents en colonnes vs DataCollector Mesa")
+    print("=" * 60)
+
+    model = FisheryModel(end_of_sim=120, num_archipelago=4, num_coastal=4, num_trawler=4, verbose=False)
+    reference = DataCollector(agent_reporters=dict(model.datacollector.agent_reporters))
+    for _ in range(120):
+        model.step()
+        reference.collect(model)
+
+    expected = reference.get_agent_vars_dataframe()
+    df = model.datacollector.get_agent_vars_dataframe()
+    pd.testing.assert_frame_equal(df, expected, check_exact=True)
+
+    # Les chaînes sont stockées en codes de catégories
+    history = model.datacollector.agent_history
+    assert history.columns["fisher_type"].kind == "category"
+    assert history.columns["fisher_type"].buffer.dtype.itemsize == 2
+    categorical = model.datacollector.get_agent_vars_dataframe(as_categorical=True)
+    assert isinstance(categorical["fisher_type"].dtype, pd.CategoricalDtype)
+    assert (categorical["fisher_type"].astype(str) == expected["fisher_type"]).all()
+    print(f"  {len(history)} lignes, {history.memory_usage() / 1024:.0f} KiB")
+    print("✓ Test réussi\n")
+
+
+class _Record:
+    def __init__(self, unique_id, **values):
+        self.unique_id = unique_id
+        self.__dict__.update(values)
+
+
+def test_agent_history_widening():
+    """Test l'élargissement des types et la croissance des tampons"""
+    print("=" * 60)
+    print("TEST 4: Types mixtes et population variable")
+    print("=" * 60)
+
+    fields = ["count", "flag", "label", "payload"]
+    reporters = {name: (lambda a, name=name: getattr(a, name)) for name in fields}
+    reference = []
+
+    recorder = AgentHistoryRecorder(fields, expected_steps=1, expected_agents=1)
+    steps = [
+        [_Record(0, count=1, flag=True, label="A", payload=None)],
+        [_Record(0, count=2.5, flag=False, label=None, payload=3),
+         _Record(7, count=4, flag=True, label="B", payload=[1, 2])],
+        [_Record(7, count=5, flag=1, label=3, payload="x")],
+        [],
+        [_Record(9, count=-1, flag=False, label="A", payload=None),
+         _Record(0, count=0, flag=True, label="C", payload=None)],
+    ]
+    for step, agents in enumerate(steps):
+        recorder.record(float(step), agents, reporters)
+        for agent in agents:
+            reference.append((float(step), agent.unique_id) + tuple(getattr(agent, f) for f in fields))
+
+    expected = pd.DataFrame.from_records(
+        reference, columns=["Step", "AgentID", *fields], index=["Step", "AgentID"]
+    )
+    df = recorder.to_dataframe()
+    pd.testing.assert_frame_equal(df, expected, check_exact=True)
+    assert recorder.columns["count"].kind == "float"
+    assert recorder.columns["flag"].kind == "object"
+    assert recorder.columns["label"].kind == "object"
+    print("✓ Test réussi\n")
+
+
+def _run_seeded(days, **collection):
+    model = FisheryModel(end_of_sim=days, num_archipelago=4, num_coastal=4, num_trawler=4,
+                         verbose=False, seed=3, **collection)
+    model.run_model()
+    return model
+
+
+def test_collection_cadence():
+    """Test les cadences de collecte (modèle mensuel, agents annuels)"""
+    print("=" * 60)
+    print("TEST 5: Cadences de collecte et agrégation des flux")
+    print("=" * 60)
+
+    days = 400
+    daily = _run_seeded(days)
+    sparse = _run_seeded(days, model_collection="monthly", agent_collection="yearly")
+
+    daily_df = daily.datacollector.get_model_vars_dataframe()
+    sparse_df = sparse.datacollector.get_model_vars_dataframe()
+
+    # Fin de chaque mois de 28 jours, plus le dernier jour de la simulation
+    collected = [d for d in range(days) if (d + 1) % 28 == 0 or d == days - 1]
+    assert list(sparse_df["current_step"]) == collected
+
+    # Les stocks sont échantillonnés, les flux sont sommés sur l'intervalle
+    start = 0
+    for row, day in enumerate(collected):
+        for name in MODEL_REPORTER_COLUMNS:
+            if name in FLOW_COLUMNS:
+                expected = daily_df[name].iloc[start]
+                for d in range(start + 1, day + 1):
+                    expected += daily_df[name].iloc[d]
+            else:
+                expected = daily_df[name].iloc[day]
+            assert sparse_df[name].iloc[row] == expected, (name, day)
+        start = day + 1
+    assert sparse_df["total_catch_daily"].sum() == daily_df["total_catch_daily"].sum()
+
+    # Données agents: fin d'année et dernier jour
+    daily_agents = daily.datacollector.get_agent_vars_dataframe()
+    sparse_agents = sparse.datacollector.get_agent_vars_dataframe()
+    steps = sorted(set(sparse_agents.index.get_level_values("Step")))
+    assert len(steps) == 2
+    pd.testing.assert_frame_equal(sparse_agents, daily_agents.loc[steps], check_exact=True)
+
+    try:
+        cadence_interval("hourly")
+        assert False, "Cadence inconnue acceptée"
+    except ValueError:
+        pass
+    assert cadence_interval(14) == 14
+    print("✓ Test réussi\n")
+
+
+def test_collection_cadence_from_config():
+    """Test la résolution des cadences depuis la section output"""
+    print("=" * 60)
+    print("TEST 6: Cadences depuis la configuration")
+    print("=" * 60)
+
+    loader = ConfigLoader()
+    assert loader._collection_cadences({"export_yearly_only": False}) == (None, None)
+    assert loader._collection_cadences({"export_yearly_only": True}) == ("yearly", "yearly")
+    assert loader._collection_cadences({"export_interval_years": 2}) == (None, 730)
+    assert loader._collection_cadences({
+        "export_yearly_only": True, "agent_collection": "monthly"
+    }) == ("yearly", "monthly")
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests de collecte"""
+    test_columns_unchanged()
+    test_fused_metrics_match_reference()
+    test_agent_history_matches_mesa()
+    test_agent_history_widening()
+    test_collection_cadence()
+    test_collection_cadence_from_config()
+    print("✓ Tous les tests de collecte ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,109 @@
+"""
+Tests pour les répétitions en parallèle et le résumé d'ensemble
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import pandas as pd
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.ensemble import spawn_seeds, combine_yearly_data, summarize_ensemble
+from scripts.run_simulation import run_from_config, run_repetitions
+
+
+def _write_config(directory, **output):
+    config = {
+        "metadata": {"name": "test ensemble"},
+        "simulation": {"duration_years": 1, "verbose": False, "random_seed": 7},
+        "agents": {"num_archipelago": 2, "num_coastal": 2, "num_trawler": 2},
+        "output": dict({"export_data": False, "filename_prefix": "ens"}, **output),
+    }
+    path = os.path.join(directory, "config.json")
+    with open(path, 'w') as f:
+        json.dump(config, f)
+    return path
+
+
+def test_spawn_seeds():
+    """Test que les graines sont reproductibles et distinctes"""
+    print("=" * 60)
+    print("TEST 1: Graines des répétitions")
+    print("=" * 60)
+
+    entropy, seeds = spawn_seeds(10, 42)
+    assert entropy == 42
+    assert len(set(seeds)) == 10
+    assert spawn_seeds(10, 42)[1] == seeds
+    assert all(0 <= seed < 2**63 for seed in seeds)
+
+    # Sans graine racine, l'entropie retournée permet de rejouer l'ensemble
+    entropy, seeds = spawn_seeds(3)
+    assert spawn_seeds(3, entropy)[1] == seeds
+    print("✓ Test réussi\n")
+
+
+def test_ensemble_summary():
+    """Test le résumé par année sur plusieurs répétitions"""
+    print("=" * 60)
+    print("TEST 2: Résumé d'ensemble")
+    print("=" * 60)
+
+    runs = [
+        {"run_id": 1, "seed": 11, "yearly_data": [{"year": 1, "step": 365, "total_stock": 10.0},
+                                                  {"year": 2, "step": 730, "total_stock": 8.0}]},
+        {"run_id": 2, "seed": 12, "yearly_data": [{"year": 1, "step": 365, "total_stock": 14.0},
+                                                  {"year": 2, "step": 730, "total_stock": 6.0}]},
+    ]
+    combined = combine_yearly_data(runs)
+    assert list(combined.columns[:2]) == ["run_id", "seed"]
+    assert len(combined) == 4
+
+    summary = summarize_ensemble(combined).set_index("year")
+    assert summary.loc[1, "num_runs"] == 2
+    assert summary.loc[1, "total_stock_mean"] == 12.0
+    assert summary.loc[2, "total_stock_min"] == 6.0
+    assert summary.loc[2, "total_stock_max"] == 8.0
+    assert "step_mean" not in summary.columns
+    print("✓ Test réussi\n")
+
+
+def test_repetitions_over_process_pool():
+    """Test les répétitions sur un pool de processus"""
+    print("=" * 60)
+    print("TEST 3: Répétitions en parallèle")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = _write_config(directory)
+        ensemble_dir, summary = run_repetitions(config_path, 3, workers=2, output_dir=directory)
+
+        with open(os.path.join(ensemble_dir, "ens_ensemble.json")) as f:
+            ensemble = json.load(f)
+        assert ensemble["root_seed_entropy"] == 7
+        assert [run["run_id"] for run in ensemble["runs"]] == [1, 2, 3]
+        assert summary["num_runs"].tolist() == [3]
+
+        # Chaque répétition est reproductible à partir de sa graine
+        runs = pd.read_csv(os.path.join(ensemble_dir, "ens_ensemble_runs.csv"), float_precision="round_trip")
+        first = ensemble["runs"][0]
+        model = run_from_config(config_path, run_id=1, seed=first["seed"])
+        assert model.yearly_data[0]["total_catch_all"] == runs.loc[0, "total_catch_all"]
+        assert runs.loc[0, "total_stock"] == model.yearly_data[0]["total_stock"]
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests d'ensemble"""
+    test_spawn_seeds()
+    test_ensemble_summary()
+    test_repetitions_over_process_pool()
+    print("✓ Tous les tests d'ensemble ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,127 @@
+"""
+Tests pour l'index spatial des pêcheurs
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.model import FisheryModel
+
+
+def _model(**kwargs):
+    params = {"end_of_sim": 200, "num_archipelago": 8, "num_coastal": 8, "num_trawler": 8,
+              "verbose": False, "seed": 2}
+    params.update(kwargs)
+    return FisheryModel(**params)
+
+
+# Parcours de tous les agents (comportement d'origine)
+
+def _scan_expert(model, me, region):
+    fishing = [a for a in model.agents if a != me and a.gone_fishing and a.current_region == region]
+    return max(fishing, key=lambda a: a.total_catch) if fishing else None
+
+
+def _scan_most_fishers(model, me, region):
+    counts = {}
+    for a in model.agents:
+        if a != me and a.gone_fishing and a.current_region == region and a.pos:
+            counts[a.pos] = counts.get(a.pos, 0) + 1
+    return max(counts, key=counts.get) if counts else None
+
+
+def _scan_neighbors(model, me, pos, radius):
+    return [a for a in model.agents
+            if a != me and a.pos and me.calculate_distance(pos, a.pos) <= radius]
+
+
+def _scatter(model, rng):
+    """Place des pêcheurs au hasard, en mer ou au port"""
+    for agent in model.agents:
+        if rng.random() < 0.6:
+            agent.move_to(rng.randrange(6), rng.randrange(6))
+            agent.current_region = rng.choice(["A", "B", None])
+            agent.gone_fishing = rng.random() < 0.8
+            agent.total_catch = rng.choice([0, 10, 20])
+            model.fleet_index.update(agent)
+        else:
+            agent.return_home()
+
+
+def _check_queries(model, rng):
+    for me in model.agents:
+        for region in ("A", "B", "C"):
+            assert me.model.fleet_index.best_fisher(region, exclude=me) is _scan_expert(model, me, region)
+            assert me.fishspot_with_most_fishers(region) == _scan_most_fishers(model, me, region)
+        pos = (rng.randrange(8), rng.randrange(8))
+        radius = rng.choice([0, 1, 1.5, 3, 30])
+        assert me.get_neighbors_in_radius(pos, radius) == _scan_neighbors(model, me, pos, radius)
+
+
+def test_queries_match_scan():
+    """Test que les requêtes de l'index donnent le même résultat qu'un parcours des agents"""
+    print("=" * 60)
+    print("TEST 1: Requêtes identiques au parcours")
+    print("=" * 60)
+
+    model = _model()
+    rng = random.Random(5)
+    for _ in range(15):
+        _scatter(model, rng)
+        _check_queries(model, rng)
+
+    # Stratégies sociales: suivre l'expert ou la majorité
+    me = next(iter(model.agents))
+    expert = _scan_expert(model, me, "A")
+    if expert is not None and expert.pos:
+        assert me.get_fishSpot_expertise("A") == expert.pos
+    if _scan_most_fishers(model, me, "A") is not None:
+        assert me.get_fishSpot_descriptive_norm("A") == _scan_most_fishers(model, me, "A")
+    print("✓ Test réussi\n")
+
+
+def test_index_follows_fleet_changes():
+    """Test l'index après une simulation, un changement de flotte et une reprise"""
+    print("=" * 60)
+    print("TEST 2: Suivi de la flotte")
+    print("=" * 60)
+
+    model = _model()
+    model.run_model(steps=100)
+    rng = random.Random(7)
+    _scatter(model, rng)
+    _check_queries(model, rng)
+
+    # Pêcheurs retirés et ajoutés
+    model.set_fleet_size("coastal", 3)
+    model.set_fleet_size("trawler", 12)
+    assert len(model.fleet_index._rank) == len(model.agents)
+    _scatter(model, rng)
+    _check_queries(model, rng)
+
+    # Reprise depuis un point de sauvegarde
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "state.npz")
+        model.save_checkpoint(path)
+        restored = FisheryModel.load_checkpoint(path, verbose=False)
+    assert len(restored.fleet_index._rank) == len(restored.agents)
+    _check_queries(restored, rng)
+    _scatter(restored, rng)
+    _check_queries(restored, rng)
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests de l'index spatial"""
+    test_queries_match_scan()
+    test_index_follows_fleet_changes()
+    print("✓ Tous les tests de l'index spatial ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
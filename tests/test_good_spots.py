@@ -0,0 +1,152 @@
+"""
+Tests pour l'index des bons spots de pêche
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.memory import SpotMemory
+from code.model import FisheryModel
+from code.params import FibeParams
+
+
+def _scan_good_spots(model, spots, region=None, min_visits=1):
+    """Parcours de toute la mémoire (comportement d'origine)"""
+    good_spots = []
+    for location, memory in spots.items():
+        if memory['visits'] < min_visits:
+            continue
+        if not memory.get('is_good', False):
+            continue
+        if region:
+            patch = model.get_patch_info(location[0], location[1])
+            if patch and patch['region'] != region:
+                continue
+        good_spots.append((location, memory))
+    good_spots.sort(key=lambda x: x[1]['avg_catch'], reverse=True)
+    return good_spots
+
+
+def _check(model, agent):
+    for region in (None, "A", "B", "C", "D"):
+        for min_visits in (1, 2, 3):
+            expected = _scan_good_spots(model, agent.good_spots_memory, region, min_visits)
+            assert agent.get_good_spots(region, min_visits) == expected
+
+
+def test_ranking_matches_scan():
+    """Test le classement face au tri de toute la mémoire"""
+    print("=" * 60)
+    print("TEST 1: Classement identique au tri")
+    print("=" * 60)
+
+    model = FisheryModel(end_of_sim=10, num_archipelago=1, num_coastal=1, num_trawler=1,
+                         verbose=False, seed=4)
+    agent = next(iter(model.agents))
+    rng = random.Random(11)
+    width, height = model.grid.width, model.grid.height
+    for tick in range(600):
+        # Quelques spots hors de la grille comptent pour toutes les régions
+        location = (rng.randrange(-2, width + 2), rng.randrange(height))
+        catch = rng.choice([0, 5, 10, 20, rng.uniform(0, 20)])
+        agent.good_spots_memory.visit(location, catch, rng.uniform(0, 2), tick,
+                                      agent.good_spots_threshold)
+        if tick % 50 == 49:
+            # Oubli puis nouvelle visite: le spot repasse en fin d'ordre
+            model.current_step = tick
+            agent.forget_old_spots(30)
+        _check(model, agent)
+    assert any(agent.good_spots_memory.region(loc) is None for loc in agent.good_spots_memory)
+
+    # Remplacement direct d'un spot
+    location = next(iter(agent.good_spots_memory))
+    agent.good_spots_memory[location] = {'avg_catch': 1e6, 'visits': 5, 'last_visit': 0,
+                                         'efficiency': 2.0, 'is_good': True}
+    assert agent.get_good_spots()[0][0] == location
+    assert list(agent.good_spots_memory)[0] == location
+    _check(model, agent)
+
+    spots = SpotMemory(model.get_patch_region)
+    assert spots.good_spots() == [] and spots == {}
+    print("✓ Test réussi\n")
+
+
+def test_simulation_and_checkpoint():
+    """Test l'index après une simulation et une reprise"""
+    print("=" * 60)
+    print("TEST 2: Simulation et reprise")
+    print("=" * 60)
+
+    model = FisheryModel(end_of_sim=200, num_archipelago=6, num_coastal=6, num_trawler=6,
+                         verbose=False, seed=8)
+    model.run_model(steps=150)
+    for agent in model.agents:
+        _check(model, agent)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "state.npz")
+        model.save_checkpoint(path)
+        restored = FisheryModel.load_checkpoint(path, verbose=False)
+    for a, b in zip(model.agents, restored.agents):
+        assert a.good_spots_memory == b.good_spots_memory
+        assert list(a.good_spots_memory) == list(b.good_spots_memory)
+        for region in (None, "A", "B"):
+            assert a.get_good_spots(region) == b.get_good_spots(region)
+    print("✓ Test réussi\n")
+
+
+def test_forgetting_matches_scan():
+    """Test l'oubli des vieux spots face au parcours de toute la mémoire"""
+    print("=" * 60)
+    print("TEST 3: Oubli des vieux spots")
+    print("=" * 60)
+
+    spots = SpotMemory(lambda location: "A")
+    reference = {}
+    rng = random.Random(2)
+    for tick in range(2000):
+        location = (rng.randrange(30), rng.randrange(30))
+        spots.visit(location, rng.uniform(0, 20), rng.uniform(0, 2), tick, 0.7)
+        reference[location] = tick
+        if rng.random() < 0.05:
+            # Spot remplacé directement
+            location = rng.choice(list(spots))
+            spots[location] = dict(spots[location], last_visit=tick - rng.randrange(200))
+            reference[location] = spots[location]['last_visit']
+        max_age = rng.choice([5, 50, 150])
+        expired = [loc for loc, last_visit in reference.items() if tick - last_visit > max_age]
+        forgotten = spots.forget_before(tick - max_age)
+        assert sorted(forgotten) == sorted(expired)
+        for location in expired:
+            del reference[location]
+        assert list(spots) == list(reference)
+        # Les entrées périmées du tas restent bornées
+        assert len(spots._expiry) <= 2 * len(spots) + 33
+
+    # Oubli quotidien pendant une simulation
+    params = FibeParams.from_config(SPATIAL_MEMORY_FORGETTING=True, SPATIAL_MEMORY_MAX_AGE=20)
+    model = FisheryModel(end_of_sim=200, num_archipelago=5, num_coastal=5, num_trawler=5,
+                         verbose=False, seed=3, params=params)
+    model.run_model(steps=150)
+    for agent in model.agents:
+        assert all(model.current_step - 1 - spot['last_visit'] <= 20
+                   for spot in agent.good_spots_memory.values())
+        _check(model, agent)
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests de l'index des bons spots"""
+    test_ranking_matches_scan()
+    test_simulation_and_checkpoint()
+    test_forgetting_matches_scan()
+    print("✓ Tous les tests des bons spots ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,191 @@
+"""
+Tests pour le paysage statique précalculé (régions, densités, capacités)
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.model import FisheryModel
+from code.params import FibeParams
+from code import config
+from code import landscape as landscape_module
+from code.patches import REGION_NAMES, DENSITY_LEVELS
+
+
+def _make_model():
+    return FisheryModel(
+        end_of_sim=365,
+        num_archipelago=0,
+        num_coastal=0,
+        num_trawler=0,
+        verbose=False
+    )
+
+
+def _landscape_inputs():
+    regions = {
+        "A": config.REGION_A,
+        "B": config.REGION_B,
+        "C": config.REGION_C,
+        "D": config.REGION_D,
+        "LAND": config.LAND,
+    }
+    hotspots = {
+        "A": config.HOTSPOTS_A,
+        "B": config.HOTSPOTS_B,
+        "C": config.HOTSPOTS_C,
+        "D": config.HOTSPOTS_D,
+    }
+    capacities = {
+        config.LOW: config.LOW_CARRYING_CAPACITY,
+        config.MEDIUM: config.MEDIUM_CARRYING_CAPACITY,
+        config.HIGH: config.HIGH_CARRYING_CAPACITY,
+    }
+    return regions, hotspots, capacities
+
+
+def test_landscape_matches_cell_rules():
+    """Test que le raster correspond aux règles cellule par cellule"""
+    print("=" * 60)
+    print("TEST 1: Raster vs get_region/get_density/get_carrying_capacity")
+    print("=" * 60)
+
+    model = _make_model()
+    raster = model.landscape
+
+    for x in range(model.grid.width):
+        for y in range(model.grid.height):
+            i = model.patches.index(x, y)
+            region = model.get_region(x, y)
+            density = model.get_density(x, y, region)
+            assert REGION_NAMES[raster.region_id[i]] == region, (x, y)
+            assert DENSITY_LEVELS[raster.density_id[i]] == density, (x, y)
+            assert raster.carrying_capacity[i] == model.get_carrying_capacity(region, density), (x, y)
+            assert model.patches[(x, y)]['fish_stock'] == model.get_initial_fish_stock(x, y, region, density)
+    print("✓ Test réussi\n")
+
+
+def test_landscape_shared_between_models():
+    """Test que le raster est calculé une fois et partagé en lecture seule"""
+    print("=" * 60)
+    print("TEST 2: Mémoïsation et immutabilité")
+    print("=" * 60)
+
+    model_1 = _make_model()
+    model_2 = _make_model()
+
+    assert model_1.landscape is model_2.landscape
+    assert model_1.patches.region_id is model_2.patches.region_id
+
+    # Les stocks restent propres à chaque modèle
+    model_1.reduce_stock(7, 3, 100)
+    assert model_2.patches[(7, 3)]['fish_stock'] == model_1.patches[(7, 3)]['fish_stock'] + 100
+
+    try:
+        model_1.landscape.carrying_capacity[0] = 1
+        assert False, "Le raster devrait être en lecture seule"
+    except ValueError:
+        pass
+    print("✓ Test réussi\n")
+
+
+def test_landscape_disk_cache():
+    """Test le cache disque indexé par le hash des entrées"""
+    print("=" * 60)
+    print("TEST 3: Cache disque")
+    print("=" * 60)
+
+    regions, hotspots, capacities = _landscape_inputs()
+    width, height = config.GRID_WIDTH, config.GRID_HEIGHT
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        landscape_module.clear_landscape_cache()
+        built = landscape_module.get_landscape(width, height, regions, hotspots, capacities, cache_dir=cache_dir)
+        cache_file = os.path.join(cache_dir, f"landscape_{built.key}.npz")
+        assert os.path.exists(cache_file)
+
+        landscape_module.clear_landscape_cache()
+        loaded = landscape_module.get_landscape(width, height, regions, hotspots, capacities, cache_dir=cache_dir)
+        assert loaded is not built
+        assert (loaded.region_id == built.region_id).all()
+        assert (loaded.density_id == built.density_id).all()
+        assert (loaded.carrying_capacity == built.carrying_capacity).all()
+        assert not loaded.carrying_capacity.flags.writeable
+
+    # Des entrées différentes donnent une autre clé
+    moved = dict(hotspots, A=[[8, 3]] + hotspots["A"][1:])
+    assert landscape_module.landscape_key(width, height, regions, moved, capacities) != built.key
+    landscape_module.clear_landscape_cache()
+    print("✓ Test réussi\n")
+
+
+def test_vectorized_density_matches_first_match_rule():
+    """Test la classification vectorisée (KD-tree) contre la règle cellule par cellule"""
+    print("=" * 60)
+    print("TEST 4: Densité vectorisée et ordre de priorité des hotspots")
+    print("=" * 60)
+
+    # Cas où l'ordre compte: le premier hotspot (moyen) l'emporte sur un
+    # second hotspot plus proche, sauf sur le centre du second
+    hotspots = [[10, 10], [12, 10]]
+    xs = np.array([11, 12, 13, 10, 20])
+    ys = np.array([10, 10, 10, 13, 20])
+    codes = landscape_module.classify_density(xs, ys, hotspots)
+    expected = [landscape_module.classify_cell_density(int(x), int(y), hotspots) for x, y in zip(xs, ys)]
+    assert [DENSITY_LEVELS[c] for c in codes] == expected
+    assert expected == [config.HIGH, config.HIGH, config.MEDIUM, config.MEDIUM, config.LOW]
+
+    # Grilles aléatoires avec de nombreux hotspots qui se chevauchent
+    rng = np.random.default_rng(42)
+    for n_hotspots in [0, 1, 2, 15, 120]:
+        hotspots = rng.integers(0, 40, size=(n_hotspots, 2)).tolist()
+        xs, ys = np.meshgrid(np.arange(40), np.arange(40), indexing="ij")
+        xs, ys = xs.ravel(), ys.ravel()
+        codes = landscape_module.classify_density(xs, ys, hotspots)
+        for x, y, code in zip(xs, ys, codes):
+            assert DENSITY_LEVELS[code] == landscape_module.classify_cell_density(int(x), int(y), hotspots), (x, y)
+        print(f"  {n_hotspots:>3} hotspots: identique")
+    print("✓ Test réussi\n")
+
+
+def test_tuple_hotspots():
+    """Test les hotspots en tuples (FibeParams) proches les uns des autres"""
+    print("=" * 60)
+    print("TEST 5: Hotspots en tuples rapprochés")
+    print("=" * 60)
+
+    # Le centre du second hotspot reste à haute densité
+    assert landscape_module.classify_cell_density(2, 0, ((0, 0), (2, 0))) == config.HIGH
+    assert landscape_module.classify_cell_density(2, 0, [[0, 0], [2, 0]]) == config.HIGH
+
+    params = FibeParams.from_config(HOTSPOTS_A=[[5, 3], [7, 3], [9, 4], [16, 3]])
+    assert params.HOTSPOTS_A == ((5, 3), (7, 3), (9, 4), (16, 3))
+    model = FisheryModel(end_of_sim=365, num_archipelago=0, num_coastal=0, num_trawler=0,
+                         verbose=False, params=params)
+    for x in range(model.grid.width):
+        for y in range(model.grid.height):
+            region = model.get_region(x, y)
+            if region == "A":
+                i = model.patches.index(x, y)
+                assert DENSITY_LEVELS[model.landscape.density_id[i]] == model.get_density(x, y, region), (x, y)
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests du paysage statique"""
+    test_landscape_matches_cell_rules()
+    test_landscape_shared_between_models()
+    test_landscape_disk_cache()
+    test_vectorized_density_matches_first_match_rule()
+    test_tuple_hotspots()
+    print("✓ Tous les tests du paysage ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
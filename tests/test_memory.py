@@ -0,0 +1,145 @@
+"""
+Tests pour la mémoire des sorties en tampon circulaire
+"""
+
+import sys
+import os
+import math
+import random
+import statistics
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.memory import TripMemory
+from code.patches import REGION_CODES
+from code.model import FisheryModel
+from code.params import FibeParams
+
+
+def _random_trip(rng, tick):
+    went_fishing = rng.random() < 0.7
+    catch = rng.choice([0, 20, rng.uniform(0, 20), rng.uniform(0, 1e-3)]) if went_fishing else 0
+    cost = rng.uniform(1, 50)
+    return {
+        "catch": catch,
+        "cost": cost,
+        "profit": catch * 10.0 - cost,
+        "region": rng.choice(["A", "B", "C", "D"]) if went_fishing else None,
+        "tick": tick,
+        "went_fishing": went_fishing,
+    }
+
+
+def test_windows_match_lists():
+    """Test les sommes glissantes face au calcul sur une liste"""
+    print("=" * 60)
+    print("TEST 1: Fenêtres glissantes")
+    print("=" * 60)
+
+    rng = random.Random(3)
+    for capacity in (1, 5, 10, 30):
+        memory = TripMemory(capacity, windows=(5, 7, 10, 14))
+        trips = []
+        for tick in range(200):
+            trip = _random_trip(rng, tick)
+            memory.append_record(trip)
+            trips = (trips + [trip])[-capacity:]
+
+            assert list(memory) == trips
+            assert memory[-1] == trips[-1] and memory[0] == trips[0]
+            # Fenêtres suivies (7, 14) et calculées à la demande (3)
+            for n in (3, 7, 14):
+                window = trips[-n:]
+                assert memory.count(n) == len(window)
+                assert memory.catch_sum(n) == math.fsum(t["catch"] for t in window)
+                assert memory.catch_mean(n) == statistics.mean(t["catch"] for t in window)
+                assert memory.profit_mean(n) == statistics.mean(t["profit"] for t in window)
+                fishing = [t["catch"] for t in window if t["went_fishing"]]
+                assert memory.fishing_catch_mean(n) == (statistics.mean(fishing) if fishing else None)
+                assert memory.fishing_count(n) == len(fishing)
+                assert memory.profit_count(n) == sum(1 for t in window if t["profit"] != 0)
+            # Fenêtre décalée: les 7 sorties avant les 7 dernières
+            older = trips[-14:-7]
+            assert memory.count(14, skip=7) == len(older)
+            if older:
+                assert memory.profit_mean(14, skip=7) == statistics.mean(t["profit"] for t in older)
+            for region in ("A", "D"):
+                region_catches = [t["catch"] for t in trips if t["region"] == region][-4:]
+                expected = statistics.mean(region_catches) if region_catches else None
+                assert memory.region_catch_mean(region, 4) == expected
+
+    memory.resize(3)
+    assert list(memory) == trips[-3:]
+    assert memory.catch_mean(7) == statistics.mean(t["catch"] for t in trips[-3:])
+    memory.clear()
+    assert len(memory) == 0 and memory.catch_sum(7) == 0
+    print("✓ Test réussi\n")
+
+
+def test_long_memory_run():
+    """Test une simulation avec une mémoire d'un an"""
+    print("=" * 60)
+    print("TEST 2: Mémoire de 365 jours")
+    print("=" * 60)
+
+    params = FibeParams.from_config(DEFAULT_MEMORY_SIZE=365)
+    model = FisheryModel(end_of_sim=400, num_archipelago=3, num_coastal=3, num_trawler=3,
+                         verbose=False, seed=6, params=params)
+    model.run_model()
+    for agent in model.agents:
+        assert len(agent.memory) == 365
+        assert [t["tick"] for t in agent.memory] == list(range(35, 400))
+        # Les sommes glissantes restent exactes après un an de remplacements
+        trips = list(agent.memory)
+        assert agent.memory.catch_mean(14) == statistics.mean(t["catch"] for t in trips[-14:])
+    print("✓ Test réussi\n")
+
+
+def test_region_means_cache():
+    """Test les moyennes par région mises en cache face au parcours de la mémoire"""
+    print("=" * 60)
+    print("TEST 3: Estimations de capture par région")
+    print("=" * 60)
+
+    rng = random.Random(9)
+    memory = TripMemory(12, windows=(5, 7))
+    trips = []
+    for tick in range(1500):
+        trip = _random_trip(rng, tick)
+        memory.append_record(trip)
+        trips = (trips + [trip])[-memory.capacity:]
+        if tick % 300 == 299:
+            capacity = rng.choice([3, 10, 30])
+            memory.resize(capacity)
+            trips = trips[-capacity:]
+        # Les estimations des décisions (10 sorties, 30 jours) et d'autres fenêtres
+        for region in ("A", "B", "C", "D"):
+            for n in (1, 4, 10, 30):
+                region_catches = [t["catch"] for t in trips if t["region"] == region][-n:]
+                expected = statistics.mean(region_catches) if region_catches else None
+                assert memory.region_catch_mean(region, n) == expected
+
+    # Décisions des chalutiers identiques au calcul sans cache
+    model = FisheryModel(end_of_sim=200, num_archipelago=0, num_coastal=4, num_trawler=8,
+                         verbose=False, seed=4)
+    for _ in range(200):
+        model.step()
+        for agent in model.agents:
+            for region in agent.accessible_regions:
+                code = REGION_CODES[region]
+                expected = agent.memory._scan_region_catch_mean(code, 10)
+                assert agent.memory.region_catch_mean(region, 10) == expected
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests de la mémoire des sorties"""
+    test_windows_match_lists()
+    test_long_memory_run()
+    test_region_means_cache()
+    print("✓ Tous les tests de la mémoire ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,153 @@
+"""
+Tests pour le jeu de paramètres compilé (FibeParams)
+"""
+
+import sys
+import os
+import json
+import dataclasses
+import tempfile
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code import config
+from code.model import FisheryModel
+from code.params import FibeParams, PARAMETER_NAMES, split_overrides
+from code.loader import ConfigLoader
+
+
+def _model(params=None, days=200):
+    return FisheryModel(end_of_sim=days, num_archipelago=2, num_coastal=2, num_trawler=2,
+                        verbose=False, seed=4, params=params)
+
+
+def test_params_object():
+    """Test la construction et l'immutabilité des paramètres"""
+    print("=" * 60)
+    print("TEST 1: Objet de paramètres")
+    print("=" * 60)
+
+    params = FibeParams.from_config()
+    assert params.FISH_PRICE == config.FISH_PRICE
+    assert params.HOTSPOTS_A == tuple(tuple(h) for h in config.HOTSPOTS_A)
+    assert not hasattr(params, "__dict__")
+
+    try:
+        params.FISH_PRICE = 1.0
+        assert False, "Paramètres modifiables"
+    except dataclasses.FrozenInstanceError:
+        pass
+    for build in (lambda: FibeParams.from_config(NO_SUCH_PARAMETER=1),
+                  lambda: params.replace(NO_SUCH_PARAMETER=1)):
+        try:
+            build()
+            assert False, "Paramètre inconnu accepté"
+        except ValueError:
+            pass
+
+    cheaper = params.replace(FISH_PRICE=5.0)
+    assert cheaper.FISH_PRICE == 5.0 and params.FISH_PRICE == config.FISH_PRICE
+    # Aller-retour JSON (les tuples deviennent des listes)
+    assert FibeParams.from_dict(json.loads(json.dumps(cheaper.to_dict()))) == cheaper
+
+    assert split_overrides({"FISH_PRICE": 1.0, "STOCK_CHECK_INTERVAL": 5}) == (
+        {"FISH_PRICE": 1.0}, {"STOCK_CHECK_INTERVAL": 5})
+    assert "RNG_PER_AGENT_STREAMS" not in PARAMETER_NAMES
+    print("✓ Test réussi\n")
+
+
+def test_models_with_different_params():
+    """Test plusieurs modèles aux paramètres différents dans un même processus"""
+    print("=" * 60)
+    print("TEST 2: Modèles aux paramètres différents")
+    print("=" * 60)
+
+    short = _model(FibeParams.from_config(DEFAULT_MEMORY_SIZE=3, FISH_PRICE=12.0))
+    default = _model()
+    assert all(agent.memory_size == 3 for agent in short.agents)
+    assert all(agent.memory_size == config.DEFAULT_MEMORY_SIZE for agent in default.agents)
+    assert short.FISH_PRICE == 12.0 and default.FISH_PRICE == config.FISH_PRICE
+
+    # Régions et bons coins par type lus dans les paramètres
+    wider = _model(FibeParams.from_config(ARCHIPELAGO_ACCESSIBLE_REGIONS=("A", "B"), TRAWLER_MAX_GOOD_SPOTS=4))
+    for agent in wider.agents:
+        if agent.fisher_type == "archipelago":
+            assert agent.accessible_regions == ["A", "B"]
+        if agent.fisher_type == "trawler":
+            assert agent.max_good_spots == 4
+
+    # Modifier un attribut remplace les paramètres du modèle seulement
+    shared = FibeParams.from_config()
+    first, second = _model(shared), _model(shared)
+    first.bad_weather_probability = 0.5
+    assert first.params.BAD_WEATHER_PROBABILITY == 0.5
+    assert second.params is shared and shared.BAD_WEATHER_PROBABILITY == config.BAD_WEATHER_PROBABILITY
+
+    # Même run avec les paramètres à la construction ou modifiés ensuite
+    built = _model(FibeParams.from_config(FISH_PRICE=12.0, GROWTH_RATE=0.2))
+    changed = _model()
+    changed.FISH_PRICE = 12.0
+    changed.GROWTH_RATE = 0.2
+    built.run_model()
+    changed.run_model()
+    assert built.yearly_data == changed.yearly_data
+    assert built.datacollector.get_model_vars_dataframe().equals(changed.datacollector.get_model_vars_dataframe())
+    print("✓ Test réussi\n")
+
+
+def test_loader_and_checkpoint():
+    """Test les paramètres d'une configuration JSON et leur sauvegarde"""
+    print("=" * 60)
+    print("TEST 3: Configuration JSON et checkpoint")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "params.json")
+        with open(path, 'w') as f:
+            json.dump({
+                "metadata": {"name": "params"},
+                "simulation": {"duration_years": 1},
+                "agents": {"num_archipelago": 2, "num_coastal": 2, "num_trawler": 2},
+                "output": {"export_data": False},
+                "parameters": {
+                    "economics": {"fish_price": 15.0},
+                    "weather": {"bad_weather_probability": 0.2},
+                    "constants": {"DEFAULT_MEMORY_SIZE": 20},
+                },
+            }, f)
+        loader = ConfigLoader()
+        loader.load(path)
+        params = loader.get_params()
+        assert (params.FISH_PRICE, params.BAD_WEATHER_PROBABILITY, params.DEFAULT_MEMORY_SIZE) == (15.0, 0.2, 20)
+
+        model = _model(params)
+        model.run_model(steps=100)
+        checkpoint = os.path.join(directory, "params.npz")
+        model.save_checkpoint(checkpoint)
+        resumed = FisheryModel.load_checkpoint(checkpoint)
+        assert resumed.params == params
+        model.run_model()
+        resumed.run_model()
+        assert resumed.yearly_data == model.yearly_data
+
+        # Nom de paramètre inconnu
+        loader.loaded_config["parameters"]["constants"] = {"NO_SUCH_PARAMETER": 1}
+        try:
+            loader.get_params()
+            assert False, "Paramètre inconnu accepté"
+        except ValueError:
+            pass
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests des paramètres"""
+    test_params_object()
+    test_models_with_different_params()
+    test_loader_and_checkpoint()
+    print("✓ Tous les tests des paramètres ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
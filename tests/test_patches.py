@@ -0,0 +1,302 @@
+"""
+Tests pour le stockage en colonnes des patches (PatchField)
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.model import FisheryModel
+from code.patches import PatchField, REGION_NAMES
+
+
+def _make_model():
+    return FisheryModel(
+        end_of_sim=365,
+        num_archipelago=0,
+        num_coastal=0,
+        num_trawler=0,
+        verbose=False
+    )
+
+
+def test_patch_field_layout():
+    """Test la taille et l'ordre des colonnes"""
+    print("=" * 60)
+    print("TEST 1: Disposition du PatchField")
+    print("=" * 60)
+
+    model = _make_model()
+    patches = model.patches
+
+    assert isinstance(patches, PatchField)
+    assert len(patches) == model.grid.width * model.grid.height
+    assert patches.fish_stock.shape == (len(patches),)
+
+    # L'ordre d'itération est x-major, comme l'ancien dictionnaire
+    positions = list(patches)
+    assert positions[0] == (0, 0)
+    assert positions[1] == (0, 1)
+    assert positions[model.grid.height] == (1, 0)
+
+    assert (7, 3) in patches
+    assert (-1, 3) not in patches
+    assert (model.grid.width, 0) not in patches
+    print("✓ Test réussi\n")
+
+
+def test_compatibility_view():
+    """Test la vue dict-like d'un patch"""
+    print("=" * 60)
+    print("TEST 2: Vue de compatibilité")
+    print("=" * 60)
+
+    model = _make_model()
+
+    hotspot = model.get_patch_info(7, 3)
+    assert hotspot['region'] == 'A'
+    assert hotspot['density'] == model.HIGH
+    assert hotspot['carrying_capacity'] == model.HIGH_CARRYING_CAPACITY
+    assert hotspot['fish_stock'] == round(model.HIGH_CARRYING_CAPACITY / 2)
+    assert hotspot['patch_stock_after_regrowth'] == hotspot['fish_stock']
+    assert set(hotspot.keys()) == {
+        'region', 'density', 'fish_stock', 'carrying_capacity',
+        'growth_rate', 'regen_amount', 'patch_stock_after_regrowth'
+    }
+
+    land = model.get_patch_info(30, 5)
+    assert land['region'] == 'LAND'
+    assert land['density'] is None
+    assert land['fish_stock'] == 0
+
+    assert model.get_patch_info(100, 100) is None
+
+    # Les écritures passent par les colonnes
+    hotspot['fish_stock'] = 42
+    assert model.patches.fish_stock[model.patches.index(7, 3)] == 42
+    print("✓ Test réussi\n")
+
+
+def test_reduce_stock_columns():
+    """Test reduce_stock sur les colonnes"""
+    print("=" * 60)
+    print("TEST 3: reduce_stock")
+    print("=" * 60)
+
+    model = _make_model()
+    initial = model.patches[(7, 3)]['fish_stock']
+
+    assert model.reduce_stock(7, 3, 100) == 100
+    assert model.patches[(7, 3)]['fish_stock'] == initial - 100
+
+    # Impossible de pêcher plus que le stock disponible
+    low_stock = model.patches[(0, 0)]['fish_stock']
+    assert model.reduce_stock(0, 0, low_stock + 10) == low_stock
+    assert model.patches[(0, 0)]['fish_stock'] == 0
+
+    # Hors grille
+    assert model.reduce_stock(-1, -1, 10) == 0
+    print("✓ Test réussi\n")
+
+
+def test_region_totals_match_patch_walk():
+    """Test que les totaux régionaux correspondent à un parcours patch par patch"""
+    print("=" * 60)
+    print("TEST 4: Totaux régionaux")
+    print("=" * 60)
+
+    model = _make_model()
+    model.reduce_stock(7, 3, 1234)
+    model.update_fish_stock()
+
+    for region in ["A", "B", "C", "D"]:
+        expected = 0
+        for pos, patch in model.patches.items():
+            if patch['region'] == region:
+                expected += patch['fish_stock']
+        assert model.get_region_stock(region) == expected
+        print(f"  Region {region}: {expected:,.2f}")
+
+    expected_total = sum(patch['fish_stock'] for patch in model.patches.values()
+                         if patch['region'] not in ["LAND", "NULL"])
+    # Le total est sommé dans l'ordre des patches, comme le parcours
+    assert model.get_total_stock() == expected_total
+    assert len(model.patches.region_totals()) == len(REGION_NAMES)
+    print("✓ Test réussi\n")
+
+
+def _reference_regrowth(model, time_step_days=1):
+    """Ancienne mise à jour patch par patch (dict-of-dicts), pour comparaison"""
+    effective_rate = model.GROWTH_RATE * (time_step_days / model.YEAR)
+    density_factor = {model.HIGH: 2.0, model.MEDIUM: 1.25, model.LOW: 1.0}
+    patches = {pos: dict(patch) for pos, patch in model.patches.items()}
+    growth_by_region = {"A": 0, "B": 0, "C": 0, "D": 0}
+
+    for pos, patch in patches.items():
+        region = patch['region']
+        if region not in ["LAND", "NULL"]:
+            current_stock = patch['fish_stock']
+            factor = density_factor.get(patch['density'], 1.0)
+            regen_amount = current_stock * effective_rate * factor * (1 - current_stock / patch['carrying_capacity'])
+            patch['regen_amount'] = regen_amount
+            growth_by_region[region] += regen_amount
+
+    for region in ["A", "B", "C", "D"]:
+        current_regional_stock = 0
+        for patch in patches.values():
+            if patch['region'] == region:
+                current_regional_stock += patch['fish_stock']
+        regional_capacity = model.get_region_carrying_capacity(region)
+
+        if current_regional_stock + growth_by_region[region] > regional_capacity:
+            if growth_by_region[region] > 0:
+                scale_factor = (regional_capacity - current_regional_stock) / growth_by_region[region]
+                scale_factor = max(0, min(1, scale_factor))
+            else:
+                scale_factor = 0
+            for patch in patches.values():
+                if patch['region'] == region:
+                    patch['regen_amount'] = round(patch['regen_amount'] * scale_factor)
+                    patch['fish_stock'] = patch['fish_stock'] + patch['regen_amount']
+        else:
+            for patch in patches.values():
+                if patch['region'] == region:
+                    patch['fish_stock'] = patch['fish_stock'] + patch['regen_amount']
+    return patches
+
+
+def _assert_same_stocks(model, reference):
+    for pos, patch in reference.items():
+        assert model.patches[pos]['fish_stock'] == patch['fish_stock'], pos
+        assert model.patches[pos]['regen_amount'] == patch['regen_amount'], pos
+
+
+def test_regrowth_kernel_matches_reference():
+    """Test que le noyau vectorisé reproduit exactement l'ancienne mise à jour"""
+    print("=" * 60)
+    print("TEST 5: Noyau de régénération vectorisé")
+    print("=" * 60)
+
+    model = _make_model()
+
+    # Pêche irrégulière pour désynchroniser les patches
+    for i, (x, y) in enumerate([(7, 3), (16, 3), (3, 19), (12, 36), (30, 51), (0, 0)]):
+        model.reduce_stock(x, y, 1000 * (i + 1) + 0.5)
+
+    for day in range(5):
+        reference = _reference_regrowth(model)
+        model.update_fish_stock()
+        _assert_same_stocks(model, reference)
+    print("✓ Chemin non contraint identique")
+
+    # Forcer la contrainte régionale (chemin avec arrondi)
+    model.CARRYING_CAPACITY_A = model.get_region_stock("A") + 10
+    model.CARRYING_CAPACITY_B = model.get_region_stock("B") - 10
+    reference = _reference_regrowth(model)
+    model.update_fish_stock()
+    _assert_same_stocks(model, reference)
+    assert model.get_region_stock("A") <= model.CARRYING_CAPACITY_A + 1
+    print("✓ Chemin contraint (arrondi) identique\n")
+
+
+def test_stock_accumulators():
+    """Test les accumulateurs de stock régionaux et total"""
+    print("=" * 60)
+    print("TEST 6: Accumulateurs de stock")
+    print("=" * 60)
+
+    model = FisheryModel(
+        end_of_sim=60,
+        num_archipelago=5,
+        num_coastal=5,
+        num_trawler=5,
+        verbose=False,
+        stock_check_interval=1
+    )
+
+    # Le contrôle de debug s'exécute à chaque pas sans lever d'erreur
+    model.run_model()
+    assert model.patches.stock_totals_drift() == []
+
+    # La pêche met à jour les totaux en O(1)
+    stock_a = model.get_region_stock("A")
+    total = model.get_total_stock()
+    caught = model.reduce_stock(7, 3, 500)
+    assert model.get_region_stock("A") == stock_a - caught
+    assert model.get_total_stock() == total - caught
+
+    # Les écritures via la vue de compatibilité aussi
+    model.patches[(12, 36)]['fish_stock'] = 0
+    assert model.patches.stock_totals_drift() == []
+
+    # Une écriture directe dans la colonne est détectée par le contrôle
+    model.patches.fish_stock[model.patches.index(3, 19)] += 1e6
+    try:
+        model.check_stock_accumulators()
+        assert False, "Le contrôle aurait dû détecter la dérive"
+    except RuntimeError as e:
+        print(f"  Dérive détectée: {e}")
+
+    model.patches.resync_stock_totals()
+    model.check_stock_accumulators()
+    print("✓ Test réussi\n")
+
+
+def test_collected_stocks_match_patch_walk():
+    """Test que les stocks collectés sont exactement ceux d'un parcours des patches"""
+    print("=" * 60)
+    print("TEST 7: Stocks collectés après la pêche")
+    print("=" * 60)
+
+    model = FisheryModel(end_of_sim=2 * 365, num_archipelago=10, num_coastal=10, num_trawler=10,
+                         verbose=False, seed=1)
+    get_region_stock, get_total_stock = model.get_region_stock, model.get_total_stock
+
+    def walk(region=None):
+        if region is None:
+            return sum(patch['fish_stock'] for patch in model.patches.values()
+                       if patch['region'] not in ["LAND", "NULL"])
+        total = 0
+        for patch in model.patches.values():
+            if patch['region'] == region:
+                total += patch['fish_stock']
+        return total
+
+    reads = []
+
+    def region_stock(region):
+        value = get_region_stock(region)
+        reads.append((value, walk(region)))
+        return value
+
+    def total_stock():
+        value = get_total_stock()
+        reads.append((value, walk()))
+        return value
+
+    # Relevés pendant la collecte (après la pêche du jour) et le bilan annuel
+    model.get_region_stock, model.get_total_stock = region_stock, total_stock
+    model.run_model()
+    assert len(reads) >= 5 * 2 * 365
+    mismatches = [(value, expected) for value, expected in reads if value != expected]
+    assert mismatches == [], mismatches[:5]
+    print(f"  {len(reads)} relevés identiques")
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests du PatchField"""
+    test_patch_field_layout()
+    test_compatibility_view()
+    test_reduce_stock_columns()
+    test_region_totals_match_patch_walk()
+    test_regrowth_kernel_matches_reference()
+    test_stock_accumulators()
+    test_collected_stocks_match_patch_walk()
+    print("✓ Tous les tests PatchField ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,119 @@
+"""
+Tests pour le profileur des phases du pas de temps
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import pandas as pd
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.model import FisheryModel
+from code.profiler import PHASES, PROFILE_COLUMNS, StepProfiler
+from scripts.run_simulation import run_from_config
+
+
+def _params():
+    return {"end_of_sim": 400, "num_archipelago": 3, "num_coastal": 2, "num_trawler": 1,
+            "verbose": False, "seed": 4}
+
+
+def test_profiled_run_identical():
+    """Test qu'un run profilé donne les mêmes résultats"""
+    print("=" * 60)
+    print("TEST 1: Run profilé identique")
+    print("=" * 60)
+
+    plain = FisheryModel(**_params())
+    plain.run_model()
+    profiled = FisheryModel(**_params())
+    profiled.attach_profiler(StepProfiler())
+    profiled.run_model()
+
+    assert profiled.yearly_data == plain.yearly_data
+    pd.testing.assert_frame_equal(profiled.datacollector.get_model_vars_dataframe(),
+                                  plain.datacollector.get_model_vars_dataframe())
+    print("✓ Test réussi\n")
+
+
+def test_timing_table():
+    """Test le tableau des temps par année et par phase"""
+    print("=" * 60)
+    print("TEST 2: Tableau des temps")
+    print("=" * 60)
+
+    model = FisheryModel(**_params())
+    profiler = StepProfiler()
+    model.attach_profiler(profiler)
+    model.run_model()
+
+    df = profiler.to_dataframe()
+    assert list(df.columns) == list(PROFILE_COLUMNS)
+    # Une année complète puis une année partielle (35 jours)
+    assert sorted(df.year.unique()) == [1, 2]
+    for year, days in ((1, 365), (2, 35)):
+        rows = df[df.year == year].set_index("phase")
+        assert set(PHASES) <= set(rows.index)
+        assert (rows.loc[list(PHASES), "calls"] == days).all()
+        # Un pas d'agent par pêcheur et par jour
+        assert rows.loc["agents.archipelago", "calls"] == 3 * days
+        assert rows.loc["agents.coastal", "calls"] == 2 * days
+        assert rows.loc["agents.trawler", "calls"] == days
+        assert abs(rows.loc[list(PHASES), "wall_share"].sum() - 1) < 1e-9
+        assert (rows.wall_time_s >= 0).all() and (rows.cpu_time_s >= 0).all()
+        # Les types d'agents se partagent la boucle des agents
+        assert rows.loc[[p for p in rows.index if p.startswith("agents.")], "wall_time_s"].sum() \
+            <= rows.loc["agents", "wall_time_s"]
+
+    summary = profiler.summary()
+    assert summary.set_index("phase").loc["weather", "calls"] == 400
+    print("✓ Test réussi\n")
+
+
+def test_profile_export():
+    """Test l'export du profil avec les données"""
+    print("=" * 60)
+    print("TEST 3: Export du profil")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = os.path.join(directory, "profiled.json")
+        with open(config_path, 'w') as f:
+            json.dump({
+                "metadata": {"name": "profile"},
+                "simulation": {"duration_years": 1, "verbose": False, "random_seed": 8},
+                "agents": {"num_archipelago": 2, "num_coastal": 2, "num_trawler": 2},
+                "output": {"export_data": True, "profile": True},
+            }, f)
+
+        for stream in (False, True):
+            output_dir = os.path.join(directory, f"stream_{stream}")
+            model = run_from_config(config_path, stream=stream, output_dir=output_dir)
+            run = os.listdir(output_dir)[0]
+            profile = pd.read_csv(os.path.join(output_dir, run, f"fibe_output_profile_{run}.csv"))
+            pd.testing.assert_frame_equal(profile, model.profiler.to_dataframe(), check_dtype=False)
+            assert set(profile.year) == {1}
+
+        # Sans l'option, pas de profil
+        output_dir = os.path.join(directory, "plain")
+        model = run_from_config(config_path, output_dir=output_dir, profile=False)
+        assert model.profiler is None
+        run = os.listdir(output_dir)[0]
+        assert not any("profile" in name for name in os.listdir(os.path.join(output_dir, run)))
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests du profileur"""
+    test_profiled_run_identical()
+    test_timing_table()
+    test_profile_export()
+    print("✓ Tous les tests du profileur ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
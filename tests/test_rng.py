@@ -0,0 +1,117 @@
+"""
+Tests pour les flux aléatoires par modèle (reproductibilité)
+"""
+
+import sys
+import os
+import random
+
+import pandas as pd
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.model import FisheryModel
+from code.rng import RandomStreams
+
+
+def _make_model(seed, days=200, **kwargs):
+    return FisheryModel(end_of_sim=days, num_archipelago=4, num_coastal=4, num_trawler=4,
+                        verbose=False, seed=seed, **kwargs)
+
+
+def _frames(model):
+    return (model.datacollector.get_model_vars_dataframe(),
+            model.datacollector.get_agent_vars_dataframe())
+
+
+def _assert_same_run(model_1, model_2):
+    for df_1, df_2 in zip(_frames(model_1), _frames(model_2)):
+        pd.testing.assert_frame_equal(df_1, df_2, check_exact=True)
+
+
+def test_same_seed_same_run():
+    """Test qu'une même graine reproduit la simulation à l'identique"""
+    print("=" * 60)
+    print("TEST 1: Même graine, même simulation")
+    print("=" * 60)
+
+    model_1 = _make_model(123)
+    model_1.run_model()
+
+    # Le module random global n'a aucune influence
+    random.seed(999)
+    model_2 = _make_model(123)
+    model_2.run_model()
+    _assert_same_run(model_1, model_2)
+
+    model_3 = _make_model(124)
+    model_3.run_model()
+    assert [a.age for a in model_1.agents] != [a.age for a in model_3.agents]
+
+    # Sans graine, l'entropie enregistrée permet de rejouer la simulation
+    model_4 = _make_model(None)
+    model_4.run_model()
+    replay = _make_model(model_4.seed)
+    replay.run_model()
+    _assert_same_run(model_4, replay)
+    print("✓ Test réussi\n")
+
+
+def test_interleaved_models_are_independent():
+    """Test que deux modèles exécutés en alternance restent reproductibles"""
+    print("=" * 60)
+    print("TEST 2: Modèles entrelacés dans un même processus")
+    print("=" * 60)
+
+    solo_a = _make_model(1)
+    solo_a.run_model()
+    solo_b = _make_model(2)
+    solo_b.run_model()
+
+    model_a = _make_model(1)
+    model_b = _make_model(2)
+    for _ in range(200):
+        model_a.step()
+        random.random()
+        model_b.step()
+
+    _assert_same_run(model_a, solo_a)
+    _assert_same_run(model_b, solo_b)
+    print("✓ Test réussi\n")
+
+
+def test_per_agent_streams():
+    """Test les flux de décision par agent"""
+    print("=" * 60)
+    print("TEST 3: Flux par agent")
+    print("=" * 60)
+
+    streams = RandomStreams(5, per_agent=True)
+    other = RandomStreams(5, per_agent=True)
+    draws = [streams.agent_stream(uid).random() for uid in range(5)]
+    assert len(set(draws)) == 5
+    # Le flux d'un agent ne dépend que de la graine et de son identifiant
+    assert other.agent_stream(3).random() == draws[3]
+
+    shared = RandomStreams(5)
+    assert shared.agent_stream(0) is shared.agent_stream(1) is shared.decisions
+
+    model_1 = _make_model(9, per_agent_streams=True)
+    model_1.run_model()
+    model_2 = _make_model(9, per_agent_streams=True)
+    model_2.run_model()
+    _assert_same_run(model_1, model_2)
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests des flux aléatoires"""
+    test_same_seed_same_run()
+    test_interleaved_models_are_independent()
+    test_per_agent_streams()
+    print("✓ Tous les tests des flux aléatoires ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
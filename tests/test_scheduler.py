@@ -0,0 +1,128 @@
+"""
+Tests pour l'ordonnanceur des pêcheurs en retrait
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.model import FisheryModel
+from code.params import FibeParams
+
+_SKIPPED_FIELDS = {"model", "memory", "good_spots_memory", "decision_rng", "can_lay_low"}
+
+
+def _model(params, reference, **kwargs):
+    model = FisheryModel(end_of_sim=730, num_archipelago=10, num_coastal=10, num_trawler=10,
+                         verbose=False, seed=5, params=params, **kwargs)
+    if reference:
+        # Référence: tous les pêcheurs jouent chaque jour
+        for agent in model.agents:
+            agent.can_lay_low = lambda: False
+    return model
+
+
+def _assert_same(model_a, model_b):
+    collector_a, collector_b = model_a.datacollector, model_b.datacollector
+    assert collector_a.get_model_vars_dataframe().equals(collector_b.get_model_vars_dataframe())
+    assert collector_a.get_agent_vars_dataframe().equals(collector_b.get_agent_vars_dataframe())
+    assert model_a.yearly_data == model_b.yearly_data
+    for a, b in zip(model_a.agents, model_b.agents):
+        fields_a = {k: v for k, v in vars(a).items() if k not in _SKIPPED_FIELDS}
+        fields_b = {k: v for k, v in vars(b).items() if k not in _SKIPPED_FIELDS}
+        assert fields_a == fields_b
+        assert list(a.memory) == list(b.memory)
+        assert a.good_spots_memory == b.good_spots_memory
+
+
+def _send_to_lay_low(model, rng):
+    """Met en retrait une partie des pêcheurs (capital négatif, compteur aléatoire)"""
+    for agent in model.agents:
+        if rng.random() < 0.4:
+            agent.capital = min(agent.capital, 0) - rng.choice([1, 50, 1000])
+            agent.lay_low = True
+            agent.lay_low_counter = rng.randrange(1, 40)
+
+
+def test_collapse_identical():
+    """Test un effondrement de la flotte face à une simulation sans mise en retrait"""
+    print("=" * 60)
+    print("TEST 1: Effondrement identique")
+    print("=" * 60)
+
+    params = FibeParams.from_config(FISH_PRICE=1.0, INITIAL_CAPITAL=0,
+                                    SPATIAL_MEMORY_FORGETTING=True, SPATIAL_MEMORY_MAX_AGE=40)
+    for cadence in ("daily", "monthly"):
+        model = _model(params, False, model_collection=cadence, agent_collection=cadence)
+        reference = _model(params, True, model_collection=cadence, agent_collection=cadence)
+        model.run_model()
+        reference.run_model()
+        _assert_same(model, reference)
+        assert any(a.bankrupt for a in model.agents)
+        assert len(model.scheduler) == 0
+    print("✓ Test réussi\n")
+
+
+def test_wake_up_and_checkpoint():
+    """Test les réveils en fin de retrait et la reprise depuis un point de sauvegarde"""
+    print("=" * 60)
+    print("TEST 2: Réveils et reprise")
+    print("=" * 60)
+
+    params = FibeParams.from_config(FISH_PRICE=3.0, INITIAL_CAPITAL=100)
+    model = _model(params, False, model_collection="weekly", agent_collection="monthly",
+                   per_agent_streams=True)
+    reference = _model(params, True, model_collection="weekly", agent_collection="monthly",
+                       per_agent_streams=True)
+    rng_a, rng_b = random.Random(1), random.Random(1)
+    parked = 0
+    for _ in range(8):
+        _send_to_lay_low(model, rng_a)
+        _send_to_lay_low(reference, rng_b)
+        # Un jour isolé, puis une période où les pêcheurs en retrait sont mis de côté
+        model.step()
+        reference.step()
+        model._lazy_agents = True
+        for _ in range(40):
+            model.step()
+            parked = max(parked, len(model.scheduler))
+        model._lazy_agents = False
+        model.scheduler.wake_all()
+        reference.run_model(steps=40)
+        _assert_same(model, reference)
+    assert parked > 0
+
+    # Point de sauvegarde au milieu d'une période de retrait
+    _send_to_lay_low(model, rng_a)
+    _send_to_lay_low(reference, rng_b)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "state.npz")
+        model.run_model(steps=10, checkpoint_interval=0)
+        model._lazy_agents = True
+        for _ in range(5):
+            model.step()
+        model.save_checkpoint(path)
+        model._lazy_agents = False
+        restored = FisheryModel.load_checkpoint(path, verbose=False)
+    model.scheduler.wake_all()
+    reference.run_model(steps=15)
+    _assert_same(model, reference)
+    restored.run_model(steps=100)
+    model.run_model(steps=100)
+    _assert_same(model, restored)
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests de l'ordonnanceur"""
+    test_collapse_identical()
+    test_wake_up_and_checkpoint()
+    print("✓ Tous les tests de l'ordonnanceur ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
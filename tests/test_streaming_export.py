@@ -0,0 +1,117 @@
+"""
+Tests pour l'export en flux (StreamingSink)
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import pandas as pd
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code.model import FisheryModel
+from code.export import StreamingSink, read_table, resolve_export_format
+
+
+def _run(days, sink=None):
+    model = FisheryModel(end_of_sim=days, num_archipelago=3, num_coastal=3, num_trawler=3, verbose=False, seed=5)
+    if sink is not None:
+        model.attach_sink(sink)
+    model.run_model()
+    return model
+
+
+def _as_objects(df):
+    df = df.copy()
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object).where(df[column].notna(), None)
+    return df
+
+
+def test_streamed_parts_match_in_memory_export():
+    """Test que les parties écrites reconstituent les données en mémoire"""
+    print("=" * 60)
+    print("TEST 1: Export en flux vs dataframes en mémoire")
+    print("=" * 60)
+
+    days = 800
+    reference = _run(days)
+    expected_model = reference.datacollector.get_model_vars_dataframe()
+    expected_agents = reference.datacollector.get_agent_vars_dataframe().reset_index()
+
+    with tempfile.TemporaryDirectory() as directory:
+        sink = StreamingSink("test_run001", directory, flush_interval=100)
+        model = _run(days, sink)
+
+        # Les lignes écrites sont libérées du DataCollector
+        assert len(model.datacollector.model_vars["stock_A"]) == 0
+
+        timestamp = model.export_data()
+        assert timestamp == sink.timestamp
+        manifest_path = os.path.join(directory, timestamp, "test_run001_manifest.json")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+        assert manifest["complete"]
+        assert manifest["format"] == resolve_export_format("auto")
+        assert len(manifest["tables"]["model"]["parts"]) == 8
+        assert manifest["tables"]["model"]["rows"] == days
+        assert manifest["tables"]["agent"]["rows"] == days * 9
+        assert manifest["tables"]["model"]["parts"][1]["first_step"] == 100
+
+        model_df = read_table(manifest_path, "model")
+        pd.testing.assert_frame_equal(model_df, expected_model, check_dtype=False)
+
+        agent_df = read_table(manifest_path, "agent")
+        if manifest["format"] == "parquet":
+            pd.testing.assert_frame_equal(_as_objects(agent_df), expected_agents, check_dtype=False)
+        else:
+            # Le CSV ne distingue pas None des valeurs manquantes
+            assert list(agent_df.columns) == list(expected_agents.columns)
+            assert (agent_df["capital"] == expected_agents["capital"]).all()
+
+        yearly_df = read_table(manifest_path, "yearly")
+        assert len(yearly_df) == len(reference.yearly_data) == 2
+    print("✓ Test réussi\n")
+
+
+def test_csv_parts_and_retained_rows():
+    """Test l'export CSV en morceaux en gardant les lignes en mémoire"""
+    print("=" * 60)
+    print("TEST 2: CSV en morceaux, lignes conservées")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        sink = StreamingSink("csv", directory, flush_interval=28, export_format="csv", release_rows=False)
+        model = _run(100, sink)
+        model.export_data()
+
+        # Les lignes restent disponibles en mémoire
+        assert len(model.datacollector.get_model_vars_dataframe()) == 100
+
+        parts = sorted(os.listdir(os.path.join(sink.directory, "csv_model")))
+        assert parts == [f"part-{i:05d}.csv" for i in range(4)]
+        model_df = read_table(os.path.join(sink.directory, "csv_manifest.json"), "model")
+        assert list(model_df["current_step"]) == list(range(100))
+
+    try:
+        StreamingSink("bad", export_format="xlsx")
+        assert False, "Format inconnu accepté"
+    except ValueError:
+        pass
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests d'export en flux"""
+    test_streamed_parts_match_in_memory_export()
+    test_csv_parts_and_retained_rows()
+    print("✓ Tous les tests d'export en flux ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,168 @@
+"""
+Tests pour les balayages de paramètres (grille, LHS, Sobol)
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add parent directory to path to import model
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from code import config
+from code.sweep import ExperimentSpec, SweepStore, parameter_target, override_config, run_point, run_sweep, _run_task
+
+
+def _write_config(directory):
+    base = {
+        "metadata": {"name": "test sweep"},
+        "simulation": {"duration_years": 1, "verbose": False},
+        "agents": {"num_archipelago": 2, "num_coastal": 2, "num_trawler": 2},
+        "output": {"export_data": False},
+        "parameters": {"economics": {"fish_price": 10.0}},
+    }
+    path = os.path.join(directory, "base.json")
+    with open(path, 'w') as f:
+        json.dump(base, f)
+    return path
+
+
+def test_designs():
+    """Test les plans grille, LHS et Sobol"""
+    print("=" * 60)
+    print("TEST 1: Plans d'expérience")
+    print("=" * 60)
+
+    grid = ExperimentSpec("grid", {
+        "FISH_PRICE": {"low": 5.0, "high": 15.0, "levels": 3},
+        "num_trawler": [1, 2],
+    })
+    points = grid.points()
+    assert len(points) == 6
+    assert points[0] == {"FISH_PRICE": 5.0, "num_trawler": 1}
+    assert points[-1] == {"FISH_PRICE": 15.0, "num_trawler": 2}
+
+    lhs = ExperimentSpec("lhs", {
+        "GROWTH_RATE": {"low": 0.05, "high": 0.3},
+        "DEFAULT_MEMORY_SIZE": {"low": 30, "high": 365, "integer": True},
+    }, design="lhs", samples=10, root_seed=1)
+    points = lhs.points()
+    assert len(points) == 10
+    # Une valeur par strate
+    strata = sorted(int((p["GROWTH_RATE"] - 0.05) / 0.025) for p in points)
+    assert strata == list(range(10))
+    assert all(isinstance(p["DEFAULT_MEMORY_SIZE"], int) for p in points)
+
+    # Même graine racine, mêmes points
+    again = ExperimentSpec.from_dict(lhs.to_dict())
+    assert again.points() == points
+    assert again.replicate_seeds == lhs.replicate_seeds
+
+    sobol = ExperimentSpec("sobol", {"FISH_PRICE": {"low": 0.0, "high": 1.0}, "GROWTH_RATE": [0.1, 0.2]},
+                           design="sobol", samples=8, root_seed=2)
+    points = sobol.points()
+    assert len(points) == 8
+    assert all(0.0 <= p["FISH_PRICE"] < 1.0 for p in points)
+    assert {p["GROWTH_RATE"] for p in points} == {0.1, 0.2}
+
+    for bad in ({"design": "random"}, {"design": "lhs"}, {"replicates": 0}):
+        try:
+            ExperimentSpec("bad", {"FISH_PRICE": [1.0]}, **bad)
+            assert False, f"Spec invalide acceptée: {bad}"
+        except ValueError:
+            pass
+    print("✓ Test réussi\n")
+
+
+def test_parameter_targets():
+    """Test la résolution et l'application des paramètres"""
+    print("=" * 60)
+    print("TEST 2: Cibles des paramètres")
+    print("=" * 60)
+
+    assert parameter_target("num_coastal") == ("argument", "num_coastal")
+    assert parameter_target("DEFAULT_MEMORY_SIZE") == ("config", "DEFAULT_MEMORY_SIZE")
+    assert parameter_target("model.FISH_PRICE") == ("model", "FISH_PRICE")
+    assert parameter_target("bad_weather_probability") == ("model", "bad_weather_probability")
+
+    # Les constantes sont restaurées après le run
+    memory_size = config.DEFAULT_MEMORY_SIZE
+    with override_config({"DEFAULT_MEMORY_SIZE": 7}):
+        assert config.DEFAULT_MEMORY_SIZE == 7
+    assert config.DEFAULT_MEMORY_SIZE == memory_size
+
+    with tempfile.TemporaryDirectory() as directory:
+        spec = ExperimentSpec("targets", {
+            "BAD_WEATHER_PROBABILITY": [0.5],
+            "FISH_PRICE": [12.0],
+            "num_trawler": [0],
+        }, base_config=_write_config(directory), root_seed=3)
+        task = spec.tasks()[0]
+        assert task["model_params"]["num_trawler"] == 0
+        assert task["config_overrides"] == {"BAD_WEATHER_PROBABILITY": 0.5, "FISH_PRICE": 12.0}
+        # Le prix du fichier de base ne masque pas la valeur balayée
+        assert "FISH_PRICE" not in task["model_overrides"]
+
+        model = run_point(dict(task["model_params"], end_of_sim=5),
+                          task["model_overrides"], task["config_overrides"], task["seed"])
+        assert model.FISH_PRICE == 12.0
+        assert model.bad_weather_probability == 0.5
+        assert len(list(model.agents)) == 4
+        assert config.FISH_PRICE != 12.0
+    print("✓ Test réussi\n")
+
+
+def test_sweep_store_and_resume():
+    """Test le stockage des résultats et la reprise d'un balayage"""
+    print("=" * 60)
+    print("TEST 3: Stockage et reprise")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        spec = ExperimentSpec("store", {"FISH_PRICE": [8.0, 12.0]}, replicates=2,
+                              base_config=_write_config(directory), root_seed=4)
+        store_dir = os.path.join(directory, "store")
+
+        # Un premier passage interrompu après deux runs
+        store = SweepStore(store_dir, spec, export_format="csv")
+        tasks = spec.tasks()
+        store.append([_run_task(task) for task in tasks[:2]])
+
+        store = run_sweep(spec, store_dir, workers=2, verbose=False)
+        assert len(store.completed) == 4
+        assert len(store.parts) == 2
+
+        df = store.read()
+        assert list(df.columns[:4]) == ["point_id", "replicate", "seed", "FISH_PRICE"]
+        assert len(df) == 4
+        assert df.groupby("point_id")["FISH_PRICE"].first().tolist() == [8.0, 12.0]
+        # Nombres aléatoires communs: même graine pour le réplicat r de chaque point
+        assert df[df.replicate == 0]["seed"].nunique() == 1
+
+        # Résultat identique à un run isolé
+        model = run_point(tasks[3]["model_params"], tasks[3]["model_overrides"],
+                          tasks[3]["config_overrides"], tasks[3]["seed"])
+        row = df[(df.point_id == 1) & (df.replicate == 1)].iloc[0]
+        assert row["total_catch_all"] == model.yearly_data[0]["total_catch_all"]
+
+        # Rien à refaire, et un autre spec est refusé
+        assert len(run_sweep(spec, store_dir, verbose=False).parts) == 2
+        try:
+            SweepStore(store_dir, ExperimentSpec("store", {"FISH_PRICE": [9.0]}, root_seed=4))
+            assert False, "Spec différent accepté"
+        except ValueError:
+            pass
+    print("✓ Test réussi\n")
+
+
+def run_all_tests():
+    """Exécute tous les tests de balayage"""
+    test_designs()
+    test_parameter_targets()
+    test_sweep_store_and_resume()
+    print("✓ Tous les tests de balayage ont réussi")
+
+
+if __name__ == "__main__":
+    run_all_tests()